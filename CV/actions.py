@@ -0,0 +1,138 @@
+# ══════════════════════════════════════════════════════════════
+#  actions.py  –  runs what a tap / gesture maps to, off the input path
+#  main.py looks an event up in its map and hands the Action to
+#  ActionExecutor.run(), which returns at once; the action itself
+#  runs on a small worker pool (ACTION_WORKERS), so a slow capture
+#  or I2C write can never hold up the next input.
+#
+#  Rules, per trigger:
+#    cooldown  – a trigger less than the action's cooldown after the
+#                last accepted one is dropped
+#    lanes     – actions sharing a lane run one at a time, in order
+#                (e.g. everything that sets the LED colour)
+#    coalesce  – a trigger for the action waiting in its lane, or for
+#                the one running with nothing waiting behind it, joins
+#                that one instead of queueing again
+#    supersede – a lane holds at most one waiting action; a newer
+#                trigger replaces (cancels) it. A running action is
+#                never interrupted – its replacement runs right after.
+# ══════════════════════════════════════════════════════════════
+
+import threading
+from collections import Counter, namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import clock
+import metrics
+from config import ACTION_WORKERS
+
+# fn       = called with no arguments on a worker thread
+# name     = for logs, stats and the action.<name> latency span
+# cooldown = seconds after one accepted trigger before the next counts
+# lane     = actions with the same lane never run at the same time
+Action = namedtuple("Action", "fn name cooldown lane")
+
+
+def action(fn, name=None, cooldown=0.0, lane=None):
+    """An Action for fn; name defaults to fn's name and lane to name."""
+    name = name or fn.__name__
+    return Action(fn, name, cooldown, lane or name)
+
+
+class _Lane:
+    __slots__ = ("running", "pending")
+
+    def __init__(self):
+        self.running = None  # (Action, Future) on a worker now
+        self.pending = None  # (Action, Future) next in line
+
+
+class ActionExecutor:
+    def __init__(self, workers=ACTION_WORKERS):
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="action")
+        self._lock = threading.Lock()
+        self._lanes = {}  # lane -> _Lane
+        self._last = {}   # action name -> time of the last accepted trigger
+        self._stats = {}  # action name -> Counter
+        self._closed = False
+
+    def run(self, act, at=None):
+        """
+        Trigger act (an Action, or a plain function) as of time at
+        (default now). Never blocks. Returns a Future for the run that
+        will handle this trigger, or None if the trigger was dropped.
+        """
+        if not isinstance(act, Action):
+            act = action(act)
+        now = clock.monotonic() if at is None else at
+        with self._lock:
+            if self._closed:
+                return None
+            last = self._last.get(act.name)
+            if last is not None and now - last < act.cooldown:
+                self._count(act.name, "cooldown")
+                return None
+            lane = self._lanes.setdefault(act.lane, _Lane())
+            # Joining the running one behind a different waiting action
+            # would run them in the wrong order: on, off, on ends off.
+            slot = lane.pending if lane.pending is not None else lane.running
+            if slot is not None and slot[0].name == act.name:
+                self._count(act.name, "coalesced")
+                return slot[1]
+            self._last[act.name] = now
+            self._count(act.name, "triggered")
+            future = Future()
+            if lane.running is None:
+                self._start(lane, act, future)
+            else:
+                if lane.pending is not None:
+                    old, old_future = lane.pending
+                    old_future.cancel()
+                    self._count(old.name, "superseded")
+                lane.pending = (act, future)
+            return future
+
+    def _count(self, name, what):
+        self._stats.setdefault(name, Counter())[what] += 1
+
+    def _start(self, lane, act, future):
+        """Call with _lock held."""
+        if not future.set_running_or_notify_cancel():
+            return  # the caller cancelled it while it waited
+        lane.running = (act, future)
+        self._pool.submit(self._call, lane, act, future)
+
+    def _call(self, lane, act, future):
+        try:
+            with metrics.span(f"action.{act.name}"):
+                result = act.fn()
+        except Exception as e:
+            print(f"[ACTION] {act.name} failed: {e}")
+            with self._lock:
+                self._count(act.name, "failed")
+            future.set_exception(e)
+        else:
+            with self._lock:
+                self._count(act.name, "done")
+            future.set_result(result)
+        finally:
+            with self._lock:
+                lane.running = None
+                if lane.pending is not None and not self._closed:
+                    (act, future), lane.pending = lane.pending, None
+                    self._start(lane, act, future)
+
+    def stats(self):
+        """Per action: triggered / done / failed / cooldown / coalesced / superseded counts."""
+        with self._lock:
+            return {name: dict(counts) for name, counts in self._stats.items()}
+
+    def shutdown(self, wait=True):
+        """Drop waiting actions and stop; with wait, let running ones finish."""
+        with self._lock:
+            self._closed = True
+            for lane in self._lanes.values():
+                if lane.pending is not None:
+                    lane.pending[1].cancel()
+                    lane.pending = None
+        self._pool.shutdown(wait=wait)
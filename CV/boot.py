@@ -0,0 +1,145 @@
+# ══════════════════════════════════════════════════════════════
+#  boot.py  –  startup profile and lazy subsystem loading
+#  main.py imports this first. Small input modules are loaded with
+#  load() so their import time is measured; heavy ones (PIL and the
+#  OLED stack, gpiozero, numpy, mediapipe) are wrapped in lazy()
+#  and imported by preload() on a background thread once the inputs
+#  are live:
+#      oled = boot.lazy("oled")      # nothing imported yet
+#      ...wire up IR / touch...
+#      boot.ready()                  # "[BOOT] Input-ready after ..."
+#      boot.preload("led", "oled")   # imports them in the background
+#
+#  Using a lazy module before preload() got to it just imports it on
+#  the spot (or waits for the background import to finish). Once
+#  preload() is done it prints the profile: time from process start
+#  to input-ready, and the import / init time of every step.
+# ══════════════════════════════════════════════════════════════
+
+import importlib
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+
+def _process_start():
+    """time.monotonic() at which this process started (Linux), else now."""
+    try:
+        with open("/proc/self/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        started = int(fields[19]) / os.sysconf("SC_CLK_TCK")  # field 22: start time since boot
+        return time.monotonic() - (time.clock_gettime(time.CLOCK_BOOTTIME) - started)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return time.monotonic()
+
+
+_t0       = _process_start()
+_imported = time.monotonic()  # when main.py got as far as importing boot
+_steps    = []    # (name, start since _t0, seconds, thread name)
+_lock     = threading.Lock()
+_ready_at = None  # seconds since _t0, set by ready()
+
+
+@contextmanager
+def step(name):
+    """Time the body into the profile as name."""
+    start = time.monotonic()
+    try:
+        yield
+    finally:
+        end = time.monotonic()
+        with _lock:
+            _steps.append((name, start - _t0, end - start, threading.current_thread().name))
+
+
+def load(name):
+    """Import module name (timed, the first time) and return it."""
+    if name in sys.modules:
+        # may still be half-imported by another thread – this waits for it
+        return importlib.import_module(name)
+    with step(f"import {name}"):
+        return importlib.import_module(name)
+
+
+def loaded(name):
+    return name in sys.modules
+
+
+class _Lazy:
+    """Stands in for a module until something actually uses it."""
+
+    __slots__ = ("_name",)
+
+    def __init__(self, name):
+        self._name = name
+
+    def __getattr__(self, attr):
+        return getattr(load(self._name), attr)
+
+    def __repr__(self):
+        state = "loaded" if loaded(self._name) else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+def lazy(name):
+    """A placeholder for module name that imports it on first attribute access."""
+    return _Lazy(name)
+
+
+def ready(what="Input"):
+    """Mark the point the device responds to input."""
+    global _ready_at
+    _ready_at = time.monotonic() - _t0
+    print(f"[BOOT] {what}-ready after {_ready_at * 1000:.0f} ms")
+
+
+def preload(*names, then=None):
+    """
+    Import names one after another on a background thread, then run
+    then() if given, then print the profile. Returns the thread. A
+    module that fails to import is reported and skipped; whoever uses
+    it later gets the error.
+    """
+    def run():
+        for name in names:
+            try:
+                load(name)
+            except Exception as e:
+                print(f"[BOOT] Could not load {name}: {e}")
+        if then is not None:
+            try:
+                then()
+            except Exception as e:
+                print(f"[BOOT] Background init failed: {e}")
+        print(report())
+
+    thread = threading.Thread(target=run, name="boot-preload", daemon=True)
+    thread.start()
+    return thread
+
+
+def profile():
+    """The profile so far, as a dict (times in ms since process start)."""
+    with _lock:
+        steps = list(_steps)
+    return {
+        "python_ms": round((_imported - _t0) * 1000, 1),
+        "ready_ms": None if _ready_at is None else round(_ready_at * 1000, 1),
+        "steps": [
+            {"name": name, "at_ms": round(at * 1000, 1), "ms": round(seconds * 1000, 1), "thread": thread}
+            for name, at, seconds, thread in steps
+        ],
+    }
+
+
+def report():
+    """The profile as a small text table."""
+    p = profile()
+    lines = [f"[BOOT] Startup profile (python itself: {p['python_ms']:.0f} ms, "
+             f"input-ready: {p['ready_ms']} ms)"]
+    lines.append(f"  {'step':28} {'at':>8} {'took':>8}  thread")
+    for s in p["steps"]:
+        lines.append(f"  {s['name']:28} {s['at_ms']:>8.0f} {s['ms']:>8.1f}  {s['thread']}")
+    return "\n".join(lines)
@@ -1,37 +1,135 @@
-from picamera2 import Picamera2
-from config import CAMERA_WIDTH, CAMERA_HEIGHT, JPG_QUALITY
-import time
+from hal import Picamera2
+from config import (
+    CAMERA_WIDTH,
+    CAMERA_HEIGHT,
+    JPG_QUALITY,
+    CAMERA_SETTLE,
+    CAMERA_SETTINGS_FILE,
+    CAMERA_LOCK_EXPOSURE,
+)
+import clock
+import json
 import numpy as np
+import os
 import sys
 
 
+# Exposure / white balance the sensor settled on last time. Starting
+# from these gives usable frames straight away instead of waiting
+# CAMERA_SETTLE seconds for auto-exposure to converge from scratch.
+_SETTINGS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), CAMERA_SETTINGS_FILE)
+_SETTINGS_KEYS = ("ExposureTime", "AnalogueGain", "ColourGains")
+
+
+def _load_settings():
+    try:
+        with open(_SETTINGS_PATH) as f:
+            saved = json.load(f)
+        settings = {key: saved[key] for key in _SETTINGS_KEYS}
+    except (OSError, ValueError, KeyError, TypeError):
+        return None  # first run, or a file we can't trust
+    settings["ColourGains"] = tuple(settings["ColourGains"])
+    return settings
+
+
+def _locked(settings):
+    return {"AeEnable": False, "AwbEnable": False, **settings}
+
+
 class Camera:
     def start(self):
         cam = Picamera2()
+        cached = _load_settings()
+        controls = {}
+        if cached is not None:
+            controls = _locked(cached)
         config = cam.create_preview_configuration(
-            main={"format": "RGB888", "size": (CAMERA_WIDTH, CAMERA_HEIGHT)}
+            main={"format": "RGB888", "size": (CAMERA_WIDTH, CAMERA_HEIGHT)},
+            controls=controls,
         )
         cam.options["quality"] = JPG_QUALITY
         cam.configure(config)
         cam.start()
-        time.sleep(0.5)  # let sensor stabilize
+        if cached is None:
+            clock.sleep(CAMERA_SETTLE)  # let sensor stabilize
+        elif not CAMERA_LOCK_EXPOSURE:
+            # carry on adapting, from where it left off last time
+            cam.set_controls({"AeEnable": True, "AwbEnable": True})
+        self.warm_start = cached is not None
+        self.suspended = False
         return cam
 
     def __init__(self):
         self.cam = self.start()
+        if not self.warm_start:
+            self.save_settings()
         self.counter = 0
 
     def capture_frame(self):
+        self.resume()
         return self.cam.capture_array()
 
-    def capture_picture(self):
-        image_name = f"image_{self.counter}.jpg"
-        self.cam.capture_file(image_name)
+    def capture_picture(self, path=None):
+        self.resume()
+        if path is None:
+            path = f"image_{self.counter}.jpg"
+        self.cam.capture_file(path)
         self.counter += 1
+        return path
+
+    def save_settings(self):
+        """Remember the current exposure / white balance for the next start."""
+        metadata = self.cam.capture_metadata()
+        try:
+            settings = {key: metadata[key] for key in _SETTINGS_KEYS}
+        except KeyError:
+            return  # sensor without these controls
+        tmp = _SETTINGS_PATH + ".tmp"
+        try:
+            with open(tmp, "w") as f:
+                json.dump(settings, f)
+            os.replace(tmp, _SETTINGS_PATH)
+        except OSError as e:
+            print(f"[CAM] Could not save camera settings: {e}")
+
+    def suspend(self):
+        """Stop the sensor streaming (low power); the next capture resumes it."""
+        if self.suspended:
+            return
+        self.save_settings()
+        self.cam.stop()
+        self.suspended = True
+
+    def resume(self):
+        """Stream again, from the exposure it had when suspended – no settle wait."""
+        if not self.suspended:
+            return
+        cached = _load_settings()
+        if cached is not None:
+            self.cam.set_controls(_locked(cached))
+        self.cam.start()
+        if cached is not None and not CAMERA_LOCK_EXPOSURE:
+            self.cam.set_controls({"AeEnable": True, "AwbEnable": True})
+        self.suspended = False
 
     def stop(self):
+        if self.suspended:
+            return  # settings were saved on suspend
+        self.save_settings()  # whatever the light is like now
         self.cam.stop()
 
+
+def save_jpeg(frame, dest):
+    """
+    Encode a capture_frame() array as a JPEG into dest (a path or an
+    open binary file). Picamera2's "RGB888" is stored B, G, R in
+    memory, so flip it the way capture_file() would.
+    """
+    from PIL import Image  # only the camera server encodes
+    image = Image.fromarray(np.ascontiguousarray(frame[..., ::-1]))
+    image.save(dest, format="JPEG", quality=JPG_QUALITY)
+    return dest
+
 if __name__ == "__main__":
     cam = Camera()
     frame = cam.capture_frame()
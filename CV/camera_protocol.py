@@ -0,0 +1,80 @@
+# ══════════════════════════════════════════════════════════════
+#  camera_protocol.py  –  wire format shared by camera_server.py
+#  and its clients. Pure stdlib so it loads in both the system
+#  python (server) and the venv (clients).
+#
+#  Every message, in both directions, is:
+#      1-byte code + 4-byte big-endian payload length + payload
+#
+#  Request codes:
+#      F  frame   → reply payload = 3 x int32 shape + raw RGB bytes
+#      P  still   → request payload = utf-8 file name ("" = timestamped)
+#                   reply payload   = utf-8 saved path
+#      S  status  → reply payload   = utf-8 JSON
+#      B  burst   → request payload = JSON {"count", "interval"}
+#                   reply payload   = JSON list of saved paths
+#      I  interval→ request payload = JSON {"interval"};
+#                   interval null stops it. Reply = JSON state or null
+#      L  list    → reply payload   = JSON list of stored photos
+#      Z  suspend → stop the sensor streaming until the next capture
+#                   (ignored while interval mode runs);
+#                   reply payload   = JSON true if it is suspended
+#      R  resume  → start streaming again now, ahead of a capture
+#  Photos always go to the server's photo store (photo_store.py).
+#  Reply codes:
+#      OK / ERR   → ERR payload is a utf-8 error message
+# ══════════════════════════════════════════════════════════════
+
+import struct
+
+FRAME    = b"F"
+PICTURE  = b"P"
+STATUS   = b"S"
+BURST    = b"B"
+INTERVAL = b"I"
+LIST     = b"L"
+SUSPEND  = b"Z"
+RESUME   = b"R"
+
+OK  = b"\x00"
+ERR = b"\x01"
+
+_HEADER = struct.Struct(">cI")
+SHAPE   = struct.Struct("=3i")  # same layout camera.py writes to stdout
+
+
+def _recv_exact(sock, n):
+    """Read exactly n bytes or raise ConnectionError if the peer hangs up."""
+    buf = bytearray(n)
+    view = memoryview(buf)
+    got = 0
+    while got < n:
+        chunk = sock.recv_into(view[got:], n - got)
+        if chunk == 0:
+            raise ConnectionError("camera socket closed")
+        got += chunk
+    return buf
+
+
+def send_msg(sock, code, *parts):
+    """
+    Send one message whose payload is the concatenation of parts.
+    Parts may be any C-contiguous buffer (bytes, memoryview, ndarray),
+    so a frame goes out without first being copied into a bytes object.
+    """
+    parts  = [memoryview(p).cast("B") for p in parts]  # byte lengths, even for ndarrays
+    length = sum(p.nbytes for p in parts)
+    header = _HEADER.pack(code, length)
+    if length <= 4096:
+        sock.sendall(header + b"".join(parts))
+    else:
+        sock.sendall(header)
+        for p in parts:
+            sock.sendall(p)
+
+
+def recv_msg(sock):
+    """Return (code, payload) for the next message on the socket."""
+    code, length = _HEADER.unpack(_recv_exact(sock, _HEADER.size))
+    payload = _recv_exact(sock, length) if length else bytearray()
+    return code, payload
@@ -0,0 +1,179 @@
+# ══════════════════════════════════════════════════════════════
+#  classic_vision.py  –  finger counting without MediaPipe, NumPy only
+#  To test standalone: python classic_vision.py [image or .npy ...]
+#
+#  GESTURE_ENGINE = "classic" makes vision.py use this instead of
+#  MediaPipe. Per frame:
+#    1. skin mask   – downsample, convert to YCrCb, keep pixels whose
+#                     Cr / Cb fall in CLASSIC_CR_RANGE / CLASSIC_CB_RANGE
+#    2. hand        – the largest 8-connected blob (run-length
+#                     labelling), if it covers CLASSIC_MIN_AREA
+#    3. palm        – erode the blob until one more step would clear
+#                     it: what's left marks the centre of the widest
+#                     part (the palm), the step count its radius
+#    4. fingers     – walk a circle _RING x the palm radius around the
+#                     centre; every narrow stretch of skin it crosses
+#                     is a finger. The wrist / forearm crosses it too,
+#                     but wider, so it doesn't count.
+#
+#  Much cheaper than MediaPipe but much pickier: it wants even light,
+#  a background that isn't skin-coloured and the hand facing the
+#  camera with the fingers spread. There is no handedness.
+# ══════════════════════════════════════════════════════════════
+
+import numpy as np
+from config import CLASSIC_CR_RANGE, CLASSIC_CB_RANGE, CLASSIC_DOWNSAMPLE, CLASSIC_MIN_AREA
+from vision import Hand
+
+# Picamera2's "RGB888" frames are B, G, R in memory (see camera.save_jpeg)
+_B, _G, _R = 0, 1, 2
+
+_RING = 1.7          # circle radius, in palm radii
+_RING_POINTS = 360
+_FINGER_MIN = 0.12   # a finger's width on the circle, in palm radii
+_FINGER_MAX = 0.9    # anything wider is the wrist / forearm
+
+
+# ── Skin mask ─────────────────────────────────────────────────
+def skin_mask(frame):
+    """Boolean mask of skin-coloured pixels, downsampled by CLASSIC_DOWNSAMPLE."""
+    small = frame[::CLASSIC_DOWNSAMPLE, ::CLASSIC_DOWNSAMPLE].astype(np.int32)
+    b, g, r = small[..., _B], small[..., _G], small[..., _R]
+    y = (77 * r + 150 * g + 29 * b) >> 8
+    cr = (((r - y) * 183) >> 8) + 128  # 0.713 (R − Y) + 128
+    cb = (((b - y) * 144) >> 8) + 128  # 0.564 (B − Y) + 128
+    return (
+        (cr >= CLASSIC_CR_RANGE[0]) & (cr <= CLASSIC_CR_RANGE[1])
+        & (cb >= CLASSIC_CB_RANGE[0]) & (cb <= CLASSIC_CB_RANGE[1])
+    )
+
+
+def _erode(mask):
+    """One step of erosion with a 3x3 cross; outside the mask counts as empty."""
+    out = mask.copy()
+    out[1:] &= mask[:-1]
+    out[:-1] &= mask[1:]
+    out[:, 1:] &= mask[:, :-1]
+    out[:, :-1] &= mask[:, 1:]
+    out[0] = out[-1] = False
+    out[:, 0] = out[:, -1] = False
+    return out
+
+
+def _dilate(mask):
+    out = mask.copy()
+    out[1:] |= mask[:-1]
+    out[:-1] |= mask[1:]
+    out[:, 1:] |= mask[:, :-1]
+    out[:, :-1] |= mask[:, 1:]
+    return out
+
+
+# ── Largest blob ──────────────────────────────────────────────
+def largest_component(mask):
+    """(mask of the largest 8-connected blob, its area), or (None, 0) if mask is empty."""
+    height, width = mask.shape
+    padded = np.zeros((height, width + 2), dtype=np.int8)
+    padded[:, 1:-1] = mask
+    edges = np.diff(padded, axis=1)
+    rows, starts = np.nonzero(edges == 1)
+    ends = np.nonzero(edges == -1)[1]  # exclusive; same order as starts
+    if not len(rows):
+        return None, 0
+
+    # Union-find over runs: a run joins every run in the row above it
+    # that it overlaps or touches diagonally.
+    parent = list(range(len(rows)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    first = np.searchsorted(rows, np.arange(height + 1))  # first run of each row
+    for row in range(1, height):
+        a, a_end = first[row - 1], first[row]
+        b, b_end = first[row], first[row + 1]
+        while a < a_end and b < b_end:
+            if starts[a] <= ends[b] and starts[b] <= ends[a]:
+                root_a, root_b = find(a), find(b)
+                if root_a != root_b:
+                    parent[root_b] = root_a
+            if ends[a] < ends[b]:
+                a += 1
+            else:
+                b += 1
+
+    roots = np.array([find(i) for i in range(len(rows))])
+    areas = np.bincount(roots, weights=ends - starts)
+    best = int(areas.argmax())
+    keep = roots == best
+    # Rebuild the blob from its runs: +1 at each start, −1 at each end, summed along the row
+    marks = np.zeros((height, width + 1), dtype=np.int16)
+    np.add.at(marks, (rows[keep], starts[keep]), 1)
+    np.add.at(marks, (rows[keep], ends[keep]), -1)
+    return marks.cumsum(axis=1)[:, :width] > 0, int(areas[best])
+
+
+# ── Fingers ───────────────────────────────────────────────────
+def palm(blob):
+    """(centre y, centre x, radius) of the widest part of blob."""
+    core, radius = blob, 0
+    while True:
+        smaller = _erode(core)
+        if not smaller.any():
+            break
+        core, radius = smaller, radius + 1
+    ys, xs = np.nonzero(core)
+    return float(ys.mean()), float(xs.mean()), radius + 1
+
+
+def count_fingers(blob):
+    """Extended fingers (0–5) of the hand in blob."""
+    cy, cx, radius = palm(blob)
+    ring = _RING * radius
+    angles = np.linspace(0.0, 2 * np.pi, _RING_POINTS, endpoint=False)
+    ys = np.rint(cy + ring * np.sin(angles)).astype(int)
+    xs = np.rint(cx + ring * np.cos(angles)).astype(int)
+    inside = (ys >= 0) & (ys < blob.shape[0]) & (xs >= 0) & (xs < blob.shape[1])
+    on = np.zeros(_RING_POINTS, dtype=bool)
+    on[inside] = blob[ys[inside], xs[inside]]
+    if on.all() or not on.any():
+        return 0
+    on = np.roll(on, -int(np.argmin(on)))  # start off the hand, so no stretch wraps around
+    edges = np.diff(np.concatenate(([0], on.astype(np.int8), [0])))
+    widths = (np.nonzero(edges == -1)[0] - np.nonzero(edges == 1)[0]) * (2 * np.pi / _RING_POINTS) * ring
+    fingers = (widths >= _FINGER_MIN * radius) & (widths <= _FINGER_MAX * radius)
+    return min(5, int(fingers.sum()))
+
+
+def detect(frame):
+    """[Hand(fingers, None)] for the largest skin blob in frame, or [] if there is none."""
+    mask = _dilate(_erode(skin_mask(frame)))  # opening: drops speckle
+    blob, area = largest_component(mask)
+    if blob is None or area < CLASSIC_MIN_AREA * mask.size:
+        return []
+    return [Hand(count_fingers(blob), None)]
+
+
+def get_gesture(frame):
+    """Finger count of the hand in frame, or None – like vision.get_gesture()."""
+    hands = detect(frame)
+    return hands[0].fingers if hands else None
+
+
+# ── Standalone test ───────────────────────────────────────────
+if __name__ == "__main__":
+    import sys
+    import time
+    from PIL import Image
+    for path in sys.argv[1:]:
+        if path.endswith(".npy"):
+            frame = np.load(path)
+        else:
+            with Image.open(path) as im:
+                frame = np.asarray(im.convert("RGB"))[..., ::-1].copy()  # to B, G, R
+        start = time.perf_counter()
+        fingers = get_gesture(frame)
+        print(f"{path}: {fingers} finger(s) in {1000 * (time.perf_counter() - start):.1f} ms")
@@ -0,0 +1,104 @@
+# ══════════════════════════════════════════════════════════════
+#  clock.py  –  the one place modules get the time from
+#  Use clock.monotonic() / clock.time() / clock.sleep() instead of
+#  the time module, and clock.real(seconds) for timeouts handed to
+#  queue.get(), Event.wait(), asyncio.wait_for() and friends.
+#
+#  By default this is the real clock. For off-device runs a
+#  VirtualClock can be installed – from a test with clock.install(),
+#  or by setting BOOTLEG_CLOCK_SPEED (e.g. 50 = fifty times faster
+#  than real time).
+# ══════════════════════════════════════════════════════════════
+
+import os
+import threading
+import time as _time
+
+
+class RealClock:
+    def monotonic(self):
+        return _time.monotonic()
+
+    def time(self):
+        return _time.time()
+
+    def sleep(self, seconds):
+        _time.sleep(seconds)
+
+    def real(self, seconds):
+        """Real seconds to block for `seconds` of this clock's time."""
+        return seconds
+
+
+class VirtualClock:
+    """
+    Time that runs `speed` times faster than the wall clock, so whole
+    programs – threads, queues and asyncio included – can run
+    accelerated. speed=None makes a stepped clock instead: it only
+    moves on sleep() or advance(), which suits single-threaded tests.
+    """
+
+    def __init__(self, speed=None, start=0.0, epoch=1_700_000_000.0):
+        self.speed = speed
+        self._start = start
+        self._epoch = epoch
+        self._real_start = _time.monotonic()
+        self._now = start
+        self._lock = threading.Lock()
+
+    def monotonic(self):
+        if self.speed is None:
+            return self._now
+        return self._start + (_time.monotonic() - self._real_start) * self.speed
+
+    def time(self):
+        return self._epoch + self.monotonic()
+
+    def sleep(self, seconds):
+        if self.speed is None:
+            self.advance(seconds)
+        elif seconds > 0:
+            _time.sleep(seconds / self.speed)
+
+    def advance(self, seconds):
+        """Step a speed=None clock forward."""
+        with self._lock:
+            self._now += max(0.0, seconds)
+
+    def real(self, seconds):
+        if seconds is None:
+            return None
+        if self.speed is None:
+            return 0.0  # a stepped clock never waits in real time
+        return seconds / self.speed
+
+
+_clock = RealClock()
+if os.environ.get("BOOTLEG_CLOCK_SPEED"):
+    _clock = VirtualClock(speed=float(os.environ["BOOTLEG_CLOCK_SPEED"]))
+
+
+def install(clock):
+    """Swap the clock for every module at once (tests, benchmarks)."""
+    global _clock
+    _clock = clock
+
+
+def current():
+    return _clock
+
+
+def monotonic():
+    return _clock.monotonic()
+
+
+def time():
+    return _clock.time()
+
+
+def sleep(seconds):
+    _clock.sleep(seconds)
+
+
+def real(seconds):
+    return _clock.real(seconds)
@@ -12,16 +12,125 @@ PWM_FREQ = 1000
 # the IR sensor last detected something
 IR_COOLDOWN = 2.0
 
-# Number of consecutive frames a gesture must be held
-# before it fires
-DEBOUNCE_FRAMES = 8
+# Idle governor (idle.py): quiet seconds before the device steps down
+# to "idle" (slower IR polling) and "sleep" (camera stream stopped too)
+IDLE_AFTER = 30.0
+SLEEP_AFTER = 300.0
+# Seconds between IR checks per state while no hand is around. An IR
+# edge wakes the loop at once; the longest tick bounds the wake
+# latency should an edge be missed.
+IDLE_TICKS = {"active": 0.05, "idle": 0.2, "sleep": 0.5}
+
+# How long (seconds) a gesture must be held before it fires,
+# independent of the frame rate
+DEBOUNCE_HOLD = 0.5
+# Hysteresis over the last DEBOUNCE_WINDOW seconds of frames: a gesture
+# takes over at ON_RATIO of them and is released below OFF_RATIO, so a
+# dropped frame or two doesn't reset the hold
+DEBOUNCE_WINDOW = 0.4
+DEBOUNCE_ON_RATIO = 0.75
+DEBOUNCE_OFF_RATIO = 0.4
+# Fire again every N seconds while the gesture is held (None = once)
+DEBOUNCE_REPEAT = None
+
+# Gesture engine: "mediapipe", or "classic" – skin colour and a
+# finger count around the palm in NumPy alone (classic_vision.py).
+# Classic is far cheaper but wants even light, a plain background
+# and spread fingers; replay.py --engine compares the two on a trace.
+GESTURE_ENGINE = "mediapipe"
+# classic: skin range in YCrCb (Cr, Cb), analysis at 1/N resolution,
+# and the smallest hand as a fraction of the frame
+CLASSIC_CR_RANGE = (133, 173)
+CLASSIC_CB_RANGE = (77, 127)
+CLASSIC_DOWNSAMPLE = 2
+CLASSIC_MIN_AREA = 0.02
+
+# Hands MediaPipe looks for per frame (2 enables two-handed gestures)
+MAX_HANDS = 2
+
+# After a hand is found, crop later frames to a padded box around it
+ROI_TRACKING = True
+ROI_PADDING = 0.3  # padding on each side, as a fraction of the hand's size
+ROI_MIN_SIZE = 96  # pixels – smaller crops make MediaPipe unreliable
+
+# Skip MediaPipe on static frames (compared on a small grayscale copy)
+MOTION_GATE = True
+MOTION_DOWNSAMPLE = 4  # compare every 4th pixel in each direction
+MOTION_MIN_DIFF = 2.0  # lowest threshold (mean abs luma difference, 0–255)
+MOTION_NOISE_FACTOR = 3.0  # motion = difference above this many times the noise level
+MOTION_MAX_SKIP = 30  # re-check with MediaPipe at least this often anyway
 
 # Camera resolution – lower = faster processing on Pi Zero 2 W
 CAMERA_WIDTH = 320
 CAMERA_HEIGHT = 240
 JPG_QUALITY = 50
+# Seconds auto-exposure gets to settle on a first-ever start. Later
+# starts begin from the exposure / white balance saved in
+# CAMERA_SETTINGS_FILE (next to camera.py) and skip the wait.
+CAMERA_SETTLE = 0.5
+CAMERA_SETTINGS_FILE = "camera_settings.json"
+CAMERA_LOCK_EXPOSURE = False  # True = keep the saved values instead of adapting
+
+# Photos per capture gesture (1 = a single shot) and the gap between them
+BURST_COUNT = 1
+BURST_INTERVAL = 0.2
+BURST_MAX = 10  # the camera server takes at most this many per burst
+# Also take a photo every N seconds while running (None = off)
+PHOTO_INTERVAL = None
+# Where photos go (relative = next to camera_server.py)
+PHOTO_SAVE_DIR = "photos"
+# Oldest photos are deleted beyond either limit
+PHOTO_MAX_BYTES = 512 * 1024 * 1024
+PHOTO_MAX_COUNT = 2000
+# fsync new photos once this many are waiting or this many seconds passed
+PHOTO_FSYNC_BATCH = 8
+PHOTO_FSYNC_INTERVAL = 2.0
+# Thumbnails (PHOTO_SAVE_DIR/thumbs) fit in this box
+THUMB_SIZE = (80, 60)
+# Threads encoding JPEGs in camera_server.py
+JPEG_WORKERS = 2
+
+# Actions (actions.py / gesture_map.py): worker threads, and the
+# seconds after a photo before a held gesture can take another
+ACTION_WORKERS = 2
+PHOTO_COOLDOWN = 2.0
+
+# LED pins – BCM numbers, as gpiozero wants (header pins 36, 38, 40;
+# header pin 37 is BCM 26, the IR sensor)
+LED_RED = 16
+LED_GREEN = 20
+LED_BLUE = 21
+# Effects in led.py step their tables this often (50 Hz)
+LED_TICK = 0.02
+
+# Persistent camera server (camera_server.py) – clients talk to it here
+CAMERA_SOCKET = "/tmp/bootleg_camera.sock"
+# Seconds to wait for a freshly spawned camera server to start listening
+CAMERA_SERVER_TIMEOUT = 10.0
+
+# Shared-memory frame ring filled by camera_server.py and read by vision.py
+FRAME_RING_ENABLED = True
+FRAME_RING_NAME = "bootleg_frames"
+FRAME_RING_SLOTS = 4  # at least 3: newest + reader's + one being written
+FRAME_RING_FPS = 15  # producer rate cap
+FRAME_RING_IDLE = 2.0  # stop producing after this many seconds without a reader
+FRAME_RING_TIMEOUT = 1.0  # how long vision waits for a fresh frame
+
+# Capture → inference → decision pipeline (pipeline.py) queue sizes.
+# Small on purpose: when a stage falls behind, old items are dropped.
+PIPELINE_FRAME_QUEUE = 2
+PIPELINE_RESULT_QUEUE = 4
+
+# Run MediaPipe in this many worker processes (vision_workers.py), off
+# main.py's GIL; 0 = on a thread in main.py. Worker i is pinned to
+# core VISION_CORES[i % len]; core 0 is left to main.py and the
+# camera server. Each worker holds its own model (RAM!); try 1–3 with
+# `python vision_workers.py 1 2 3` to see how throughput scales.
+VISION_WORKERS = 1
+VISION_CORES = (1, 2, 3)
 
-# LED pins
-LED_RED = 37
-LED_GREEN = 38
-LED_BLUE = 40
+# Per-stage latency histograms (metrics.py), written next to main.py /
+# main.log every METRICS_INTERVAL seconds. Off = close to zero overhead.
+METRICS_ENABLED = False
+METRICS_FILE = "metrics.json"
+METRICS_INTERVAL = 60.0
@@ -2,41 +2,45 @@
 #  debouncer.py  –  prevents accidental gesture triggers
 # ══════════════════════════════════════════════════════════════
 
-from config import DEBOUNCE_FRAMES
+from state_machine import StateMachine, PRESS, REPEAT
+from config import (
+    DEBOUNCE_HOLD,
+    DEBOUNCE_WINDOW,
+    DEBOUNCE_ON_RATIO,
+    DEBOUNCE_OFF_RATIO,
+    DEBOUNCE_REPEAT,
+)
 
 
 class GestureDebouncer:
     """
-    Requires the same gesture to appear in N consecutive frames
-    before it fires. Also prevents the same gesture from firing
-    repeatedly while held.
+    Requires the same gesture to dominate the recent frames for
+    DEBOUNCE_HOLD seconds before it fires, whatever the frame rate.
+    Fires once per hold (plus every DEBOUNCE_REPEAT seconds if set);
+    the gesture has to be released before it can fire again.
     """
 
     def __init__(self):
-        self.buffer = []
-        self.last_fired = None
-
-    def update(self, gesture):
+        self.machine = StateMachine(
+            hold=DEBOUNCE_HOLD,
+            window=DEBOUNCE_WINDOW,
+            on_ratio=DEBOUNCE_ON_RATIO,
+            off_ratio=DEBOUNCE_OFF_RATIO,
+            repeat=DEBOUNCE_REPEAT,
+            idle=None,
+        )
+
+    def update(self, gesture, now=None):
         """
-        Pass in the latest detected gesture (or None).
-        Returns the confirmed gesture if it just became stable,
-        otherwise returns None.
+        Pass in the latest detected gesture (or None) and, if known,
+        the time its frame was captured.
+        Returns the confirmed gesture if it just became stable (or is
+        repeating while held), otherwise returns None.
         """
-        self.buffer.append(gesture)
-        if len(self.buffer) > DEBOUNCE_FRAMES:
-            self.buffer.pop(0)
-
-        if (
-            len(self.buffer) == DEBOUNCE_FRAMES
-            and self.buffer.count(gesture) == DEBOUNCE_FRAMES
-            and gesture != self.last_fired
-        ):
-            self.last_fired = gesture
-            # note - depeending on action structure may need to change this allow repeats
-            return gesture
-
+        for event in self.machine.update(gesture, now):
+            if event.kind in (PRESS, REPEAT):
+                return event.value
         return None
 
     def clear(self):
-        self.buffer.clear()
-        self.last_fired = None
+        self.machine.reset()
@@ -0,0 +1,189 @@
+# ══════════════════════════════════════════════════════════════
+#  frame_ring.py  –  shared-memory ring of camera frames
+#  camera_server.py writes, vision.py reads, no bytes are copied
+#  on the reading side.
+#
+#  Layout of the shared block:
+#    header  9 x int64   magic, slots, height, width, channels,
+#                        latest slot, reader's claimed slot,
+#                        last read (monotonic ns), owner pid
+#    meta    slots x (uint64 seq, float64 capture timestamp)
+#    frames  slots x height x width x channels uint8
+#
+#  One writer, one reader. The writer never waits: it overwrites
+#  the oldest slot that is neither the newest frame nor the one
+#  the reader has claimed, so under backpressure stale frames are
+#  dropped instead of queued. The reader always takes the newest
+#  frame and gets a NumPy view straight into shared memory, which
+#  stays valid until its next call to latest().
+# ══════════════════════════════════════════════════════════════
+
+import os
+import time
+import numpy as np
+from multiprocessing import shared_memory, resource_tracker
+
+_MAGIC = 0x46524E47  # "FRNG"
+
+# header field indices
+_H_MAGIC, _H_SLOTS, _H_HEIGHT, _H_WIDTH, _H_CHANNELS, _H_LATEST, _H_CLAIM, _H_READ, _H_OWNER = range(9)
+_HEADER_FIELDS = 9
+_HEADER_BYTES = _HEADER_FIELDS * 8
+
+_META_DTYPE = np.dtype([("seq", "<u8"), ("ts", "<f8")])
+
+
+def _alive(pid):
+    if pid <= 0 or pid == os.getpid():
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass  # someone else's process, but it exists
+    return True
+
+
+def _owner(shm):
+    """pid recorded in an existing segment, or 0 if it isn't a frame ring."""
+    if shm.size < _HEADER_BYTES:
+        return 0
+    hdr = np.ndarray((_HEADER_FIELDS,), dtype="<i8", buffer=shm.buf)
+    owner = int(hdr[_H_OWNER]) if int(hdr[_H_MAGIC]) == _MAGIC else 0
+    del hdr  # no views left, or close() refuses
+    return owner
+
+
+def _size(slots, shape):
+    return _HEADER_BYTES + slots * _META_DTYPE.itemsize + slots * int(np.prod(shape))
+
+
+class FrameRing:
+    """Create with FrameRing.create() in the camera process, FrameRing.attach() elsewhere."""
+
+    def __init__(self, shm, owner):
+        self._shm = shm
+        self._owner = owner
+        self._hdr = np.ndarray((_HEADER_FIELDS,), dtype="<i8", buffer=shm.buf)
+        slots = int(self._hdr[_H_SLOTS])
+        shape = tuple(int(v) for v in self._hdr[_H_HEIGHT:_H_CHANNELS + 1])
+        self.slots = slots
+        self.shape = shape
+        self._meta = np.ndarray((slots,), dtype=_META_DTYPE, buffer=shm.buf, offset=_HEADER_BYTES)
+        self._frames = np.ndarray(
+            (slots,) + shape,
+            dtype=np.uint8,
+            buffer=shm.buf,
+            offset=_HEADER_BYTES + slots * _META_DTYPE.itemsize,
+        )
+        self._seq = 0  # writer: last sequence number written
+        self.last_seq = 0  # reader: last sequence number handed out
+        self.dropped = 0  # reader: frames overwritten before we got to them
+
+    # ── Writer side ───────────────────────────────────────────
+    @classmethod
+    def create(cls, name, slots, shape):
+        """
+        Allocate the ring. A segment left over from a crashed run is
+        replaced; one whose owner is still running raises RuntimeError.
+        """
+        try:
+            stale = shared_memory.SharedMemory(name=name)
+        except FileNotFoundError:
+            pass
+        else:
+            owner = _owner(stale)
+            stale.close()
+            if _alive(owner):
+                raise RuntimeError(f"frame ring {name!r} is in use by pid {owner}")
+            stale.unlink()
+        shm = shared_memory.SharedMemory(name=name, create=True, size=_size(slots, shape))
+        hdr = np.ndarray((_HEADER_FIELDS,), dtype="<i8", buffer=shm.buf)
+        hdr[:] = [_MAGIC, slots, *shape, -1, -1, 0, os.getpid()]
+        np.ndarray((slots,), dtype=_META_DTYPE, buffer=shm.buf, offset=_HEADER_BYTES)[:] = 0
+        return cls(shm, owner=True)
+
+    def write(self, frame, timestamp=None):
+        """Copy one frame into the oldest free slot and publish it."""
+        latest = int(self._hdr[_H_LATEST])
+        slot = latest
+        for _ in range(self.slots):
+            slot = (slot + 1) % self.slots
+            if slot == latest:
+                continue
+            # Mark the slot as being written *before* looking at the
+            # reader's claim; the reader claims *before* re-checking seq.
+            # Whichever goes second sees the other, so a frame is never
+            # handed out while it is being overwritten.
+            seq = self._meta["seq"][slot]
+            self._meta["seq"][slot] = 0
+            if int(self._hdr[_H_CLAIM]) != slot:
+                break
+            self._meta["seq"][slot] = seq
+        else:
+            return False  # every slot busy – only possible with slots < 3
+        np.copyto(self._frames[slot], frame)
+        self._seq += 1
+        self._meta["ts"][slot] = time.monotonic() if timestamp is None else timestamp
+        self._meta["seq"][slot] = self._seq
+        self._hdr[_H_LATEST] = slot
+        return True
+
+    def reader_idle_for(self):
+        """Seconds since the reader last asked for a frame (inf if never)."""
+        last = int(self._hdr[_H_READ])
+        if last == 0:
+            return float("inf")
+        return (time.monotonic_ns() - last) / 1e9
+
+    # ── Reader side ───────────────────────────────────────────
+    @classmethod
+    def attach(cls, name):
+        shm = shared_memory.SharedMemory(name=name)
+        # Before 3.13 the resource tracker unlinks segments it sees a
+        # process *attach* to when that process exits, which would pull
+        # the ring out from under the camera server.
+        try:
+            resource_tracker.unregister(shm._name, "shared_memory")
+        except Exception:
+            pass
+        ring = cls(shm, owner=False)
+        if int(ring._hdr[_H_MAGIC]) != _MAGIC:
+            ring.close()
+            raise ValueError(f"shared memory {name!r} is not a frame ring")
+        return ring
+
+    def latest(self, after_seq=None, timeout=1.0):
+        """
+        Return (frame_view, seq, timestamp) for the newest frame newer
+        than after_seq (defaults to the last one returned), waiting up
+        to timeout seconds. Returns None on timeout.
+        """
+        if after_seq is None:
+            after_seq = self.last_seq
+        deadline = time.monotonic() + timeout
+        self._hdr[_H_READ] = time.monotonic_ns()
+        while True:
+            slot = int(self._hdr[_H_LATEST])
+            if slot >= 0:
+                seq = int(self._meta["seq"][slot])
+                if seq > after_seq:
+                    self._hdr[_H_CLAIM] = slot
+                    if int(self._meta["seq"][slot]) == seq:
+                        break
+            if time.monotonic() > deadline:
+                return None
+            time.sleep(0.002)
+        if self.last_seq and seq > self.last_seq + 1:
+            self.dropped += seq - self.last_seq - 1
+        self.last_seq = seq
+        return self._frames[slot], seq, float(self._meta["ts"][slot])
+
+    # ── Both ──────────────────────────────────────────────────
+    def close(self):
+        # drop our views first or SharedMemory.close() refuses
+        self._hdr = self._meta = self._frames = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
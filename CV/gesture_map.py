@@ -1,17 +1,34 @@
 # ══════════════════════════════════════════════════════════════
 #  gesture_map.py  –  links finger counts to actions
 #  To add a new feature: import its module and add a line here.
+#  main.py hands the confirmed gesture's action to actions.py, which
+#  runs it on a worker with the cooldown / lane given here.
 # ══════════════════════════════════════════════════════════════
 
 import led
+import camera_workaround
+from actions import action
+from config import PHOTO_COOLDOWN
 
-# ── Map finger count → action function ───────────────────────
+
+def take_photo():
+    """Orange while the burst is being taken."""
+    led.orange()
+    try:
+        camera_workaround.capture_burst()
+    finally:
+        led.off()
+
+
+# ── Map finger count → action ────────────────────────────────
 #  Key   = number of fingers detected
-#  Value = function to call (no arguments)
+#  Value = action(function, ...) – the function takes no arguments
+#  Everything that sets the LED shares the "led" lane, so colours
+#  are applied in the order the gestures were made.
 GESTURE_MAP = {
-    0: led.off,
-    1: led.on,
-    # 2: camera.take_photo,     # uncomment when camera.py is added
-    # 3: music.play_pause,      # uncomment when music.py is added
-    # 4: leds.rainbow,          # uncomment when leds.py is added
+    0: action(led.off, lane="led"),
+    1: action(led.on, lane="led"),
+    2: action(take_photo, name="photo", cooldown=PHOTO_COOLDOWN, lane="led"),
+    # 3: action(music.play_pause),      # uncomment when music.py is added
+    # 4: action(leds.rainbow),          # uncomment when leds.py is added
 }
@@ -0,0 +1,42 @@
+# ══════════════════════════════════════════════════════════════
+#  hal.py  –  hardware access point
+#  Modules import their hardware from here instead of directly:
+#      from hal import GPIO                      # RPi.GPIO
+#      from hal import RGBLED                    # gpiozero.RGBLED
+#      from hal import board, busio, adafruit_ssd1306
+#      from hal import Picamera2
+#
+#  BOOTLEG_HAL=sim swaps every one of them for the fakes in
+#  sim_hw.py, so the code runs on a normal Linux box. Each backend
+#  is only imported when first asked for.
+# ══════════════════════════════════════════════════════════════
+
+import importlib
+import os
+
+SIMULATED = os.environ.get("BOOTLEG_HAL", "pi").lower() == "sim"
+
+# name -> (real module, attribute or None for the module itself)
+_REAL = {
+    "GPIO":             ("RPi.GPIO", None),
+    "RGBLED":           ("gpiozero", "RGBLED"),
+    "board":            ("board", None),
+    "busio":            ("busio", None),
+    "adafruit_ssd1306": ("adafruit_ssd1306", None),
+    "Picamera2":        ("picamera2", "Picamera2"),
+}
+
+
+def __getattr__(name):
+    if name not in _REAL:
+        raise AttributeError(f"module 'hal' has no attribute {name!r}")
+    if SIMULATED:
+        import sim_hw
+        value = getattr(sim_hw, name)
+    else:
+        module, attr = _REAL[name]
+        value = importlib.import_module(module)
+        if attr is not None:
+            value = getattr(value, attr)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
@@ -0,0 +1,55 @@
+# ══════════════════════════════════════════════════════════════
+#  ir_sensor.py  –  IR sensor wake trigger
+#  To test standalone: python ir_sensor.py
+# ══════════════════════════════════════════════════════════════
+
+from hal import GPIO
+import input_trace
+from config import IR_SENSOR_PIN
+
+GPIO.setmode(GPIO.BCM)
+GPIO.setup(IR_SENSOR_PIN, GPIO.IN)
+
+_last_level = None  # for recording transitions only
+
+def detected():
+    """
+    Returns True if the IR sensor is detecting something nearby.
+    Most IR obstacle sensors output LOW when triggered, HIGH when clear.
+    Flip to GPIO.HIGH if yours behaves the opposite way.
+    """
+    global _last_level
+    level = GPIO.input(IR_SENSOR_PIN)
+    if level != _last_level:
+        _last_level = level
+        input_trace.edge(IR_SENSOR_PIN, level)
+    return level == GPIO.LOW
+
+def on_edge(callback):
+    """
+    Call callback() from the GPIO thread on every IR edge, so a loop
+    sleeping between detected() checks can wake at once. Returns False
+    if edge detection isn't available (the loop then just polls).
+    """
+    try:
+        GPIO.add_event_detect(IR_SENSOR_PIN, GPIO.BOTH, callback=lambda pin: callback())
+    except RuntimeError as e:
+        print(f"[IR] No edge detection ({e}) – polling only.")
+        return False
+    return True
+
+def cleanup():
+    GPIO.cleanup()
+
+# ── Standalone test ───────────────────────────────────────────
+if __name__ == "__main__":
+    import clock
+    print("IR sensor test – wave your hand in front of it. Ctrl+C to stop.")
+    try:
+        while True:
+            state = "DETECTED" if detected() else "clear"
+            print(f"\r IR: {state}          ", end="", flush=True)
+            clock.sleep(0.1)
+    except KeyboardInterrupt:
+        print("\nDone.")
+        cleanup()
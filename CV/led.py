@@ -0,0 +1,218 @@
+# ══════════════════════════════════════════════════════════════
+#  led.py  –  RGB LED effects
+#  To test standalone: python led.py
+#
+#  Every effect, on() and off() included, is a table of (r, g, b)
+#  duty cycles (0–1, as gpiozero wants) with one entry per LED_TICK.
+#  The tables are computed once per set of parameters and cached, so
+#  playing an effect costs no maths. One scheduler thread, started
+#  at import, steps the current table on a fixed tick grid; a solid
+#  colour is written straight away and the thread sleeps until the
+#  next switch.
+#
+#  Switching is atomic: calling an effect swaps in its table under a
+#  lock and wakes the thread – no new thread, no half-finished frame.
+# ══════════════════════════════════════════════════════════════
+
+from hal import RGBLED
+import clock
+import colorsys
+import math
+import threading
+from collections import namedtuple
+from functools import lru_cache
+from config import LED_BLUE, LED_GREEN, LED_RED, LED_TICK
+
+# BCM pin numbers from config.py
+led = RGBLED(red=LED_RED, green=LED_GREEN, blue=LED_BLUE)
+
+# ── Colours ───────────────────────────────────────────────────
+BLACK  = (0, 0, 0)
+WHITE  = (1, 1, 1)
+RED    = (1, 0, 0)
+GREEN  = (0, 1, 0)
+BLUE   = (0, 0, 1)
+ORANGE = (1, 165 / 255, 0)
+
+_GAMMA = 2.2  # fades look even to the eye, not to the PWM
+
+# frames = (r, g, b) per tick
+# loop   = start over after the last frame; otherwise hold the last
+#          frame, or switch to then if it is set
+Effect = namedtuple("Effect", "name frames loop then")
+
+
+def _ticks(seconds):
+    return max(1, round(seconds / LED_TICK))
+
+
+def _scaled(color, level):
+    level = level ** _GAMMA
+    return tuple(round(c * level, 4) for c in color)
+
+
+# ── Tables ────────────────────────────────────────────────────
+@lru_cache(maxsize=32)
+def _solid(color):
+    return Effect("solid", (tuple(color),), False, None)
+
+
+@lru_cache(maxsize=32)
+def _blink(color, period, duty, times):
+    on = _ticks(period * duty)
+    cycle = (tuple(color),) * on + (BLACK,) * max(1, _ticks(period) - on)
+    if times is None:
+        return Effect("blink", cycle, True, None)
+    return Effect("blink", cycle * times, False, None)  # ends dark
+
+
+@lru_cache(maxsize=32)
+def _breathe(color, period):
+    n = _ticks(period)
+    frames = tuple(_scaled(color, (1 - math.cos(2 * math.pi * i / n)) / 2) for i in range(n))
+    return Effect("breathe", frames, True, None)
+
+
+@lru_cache(maxsize=32)
+def _pulse_frames(color, duration):
+    n = _ticks(duration)
+    return tuple(_scaled(color, 1 - i / n) for i in range(n)) + (BLACK,)
+
+
+@lru_cache(maxsize=8)
+def _rainbow(period, brightness):
+    n = _ticks(period)
+    frames = tuple(
+        tuple(round(c * brightness, 4) for c in colorsys.hsv_to_rgb(i / n, 1.0, 1.0))
+        for i in range(n)
+    )
+    return Effect("rainbow", frames, True, None)
+
+
+# ── Scheduler ─────────────────────────────────────────────────
+_cond    = threading.Condition()
+_effect  = _solid(BLACK)
+_started = 0.0   # clock.monotonic() when _effect began
+_shown   = None  # colour last written to the LED
+
+
+def _write(color):
+    """Call with _cond held."""
+    global _shown
+    if color != _shown:
+        led.color = color
+        _shown = color
+
+
+def _play(effect):
+    global _effect, _started
+    with _cond:
+        _effect, _started = effect, clock.monotonic()
+        _write(effect.frames[0])  # first frame from the caller, no thread hop
+        _cond.notify()
+
+
+def _run():
+    global _effect, _started
+    with _cond:
+        while True:
+            effect, frames = _effect, _effect.frames
+            if len(frames) == 1 and effect.then is None:
+                _cond.wait()  # solid colour – already written by _play()
+                continue
+            tick = int((clock.monotonic() - _started) / LED_TICK)
+            if not effect.loop and tick >= len(frames):
+                _write(frames[-1])
+                if effect.then is not None:
+                    _effect, _started = effect.then, clock.monotonic()
+                    _write(_effect.frames[0])
+                else:
+                    _cond.wait()  # finished, holding the last frame
+                continue
+            _write(frames[tick % len(frames)])
+            next_tick = _started + (tick + 1) * LED_TICK  # fixed grid, no drift
+            _cond.wait(clock.real(max(0.0, next_tick - clock.monotonic())))
+
+
+threading.Thread(target=_run, name="led", daemon=True).start()
+
+
+# ── Effects ───────────────────────────────────────────────────
+def solid(color):
+    _play(_solid(tuple(color)))
+
+
+def on():
+    solid(WHITE)
+
+
+def orange():
+    solid(ORANGE)
+
+
+def off():
+    solid(BLACK)
+
+
+def blink(color=WHITE, period=1.0, duty=0.5, times=None):
+    """On for duty of every period seconds; forever, or times blinks then off."""
+    _play(_blink(tuple(color), period, duty, times))
+
+
+def breathe(color=WHITE, period=3.0):
+    """Smooth fade up and down, period seconds per breath."""
+    _play(_breathe(tuple(color), period))
+
+
+def pulse(color=WHITE, duration=0.4, after=None):
+    """
+    One flash fading out over duration, then the solid colour after –
+    or, by default, back to whatever was playing.
+    """
+    with _cond:
+        then = _effect
+        if after is not None:
+            then = _solid(tuple(after))
+        elif not then.loop and then.then is None:
+            then = _solid(then.frames[-1])  # a finished effect resumes as its last frame
+    _play(Effect("pulse", _pulse_frames(tuple(color), duration), False, then))
+
+
+def rainbow(period=5.0, brightness=1.0):
+    """Cycle through every hue once per period seconds."""
+    _play(_rainbow(period, brightness))
+
+
+# ── Status colours ────────────────────────────────────────────
+STATUS = {
+    "off":     off,
+    "warming": lambda: breathe(BLUE, period=2.0),
+    "ready":   lambda: pulse(GREEN, duration=0.6, after=BLACK),
+    "busy":    lambda: solid(ORANGE),
+    "error":   lambda: blink(RED, period=0.5),
+}
+
+
+def status(name):
+    """Show a device state: off, warming, ready, busy or error."""
+    STATUS[name]()
+
+
+def current():
+    """Name of the effect playing now."""
+    return _effect.name
+
+
+# ── Standalone test ───────────────────────────────────────────
+if __name__ == "__main__":
+    demos = [
+        ("on", on), ("blink", blink), ("breathe", breathe),
+        ("rainbow", rainbow), ("pulse over breathe", lambda: (breathe(BLUE), pulse(GREEN))),
+    ] + [(f"status {name}", show) for name, show in STATUS.items()]
+    print("LED test – each effect for 3 seconds...")
+    for name, show in demos:
+        print(f"  {name}")
+        show()
+        clock.sleep(3)
+    off()
+    print("Done.")
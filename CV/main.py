@@ -1,28 +1,97 @@
 # ══════════════════════════════════════════════════════════════
 #  main.py  –  entry point, ties everything together
 #  Run with: python main.py
+#
+#  Boot order (see boot.py): the IR sensor loads and is polled right
+#  away; the LED, camera client and pipeline load on a background
+#  thread meanwhile, which then warms up the camera and the MediaPipe
+#  model (warmup.py) with the LED breathing blue. IR wakes are ignored
+#  until that is done, so the first gesture never pays for it.
+#
+#  A confirmed gesture's action (gesture_map.py) goes to the action
+#  executor (actions.py) and runs on its own worker, so taking a
+#  photo never stalls the IR check or the next inference result.
+#
+#  With no hand around, the idle governor (idle.py) stretches the IR
+#  check from every 50 ms to IDLE_TICKS["idle"] and then, camera
+#  stream stopped, to IDLE_TICKS["sleep"]; an IR edge cuts any of
+#  those waits short, so waking never waits for the tick.
 # ══════════════════════════════════════════════════════════════
 
-import time
-import ir_sensor
-import vision
+import boot  # first, so the startup profile covers every import
+import threading
+
+# Loaded first thing in main(), not here: vision_workers' spawned
+# processes import this file again (as __mp_main__) and must not
+# set up the GPIO.
+clock       = boot.lazy("clock")
+input_trace = boot.lazy("input_trace")
+metrics     = boot.lazy("metrics")
+ir_sensor   = boot.lazy("ir_sensor")
+import hal
 from debouncer import GestureDebouncer
-from gesture_map import GESTURE_MAP
-from config import IR_COOLDOWN
-from camera import Camera
-import RPi.GPIO as GPIO
-import led
+from actions import ActionExecutor
+from idle import IdleGovernor, SLEEP
+from config import IR_COOLDOWN, PHOTO_INTERVAL, GESTURE_ENGINE
 
+# Heavy – imported in the background once the IR sensor is live
+led               = boot.lazy("led")
+gesture_map       = boot.lazy("gesture_map")
+camera_workaround = boot.lazy("camera_workaround")
+warmup            = boot.lazy("warmup")
+BACKGROUND = ("led", "gesture_map", "camera_workaround", "pipeline", "warmup")  # preload order
 
-def main():
-    print("=== Shoulder Companion ===")
+
+def _show_warmup(state):
+    led.status(state)  # "warming" breathes blue, "ready" flashes green
+
+
+def _background_init():
+    """Runs on the preload thread after the imports."""
+    print(f"Gesture engine: {GESTURE_ENGINE}")
     print("Mapped gestures:")
-    for fingers, fn in GESTURE_MAP.items():
-        print(f"  {fingers} finger(s) → {fn.__name__}")
-    print("Waiting for IR trigger...\n")
+    for fingers, act in gesture_map.GESTURE_MAP.items():
+        print(f"  {fingers} finger(s) → {act.name}")
+    warmup.subscribe(_show_warmup)
+    warmup.run()
+    if PHOTO_INTERVAL:
+        camera_workaround.start_interval()
+
+
+def _on_power(old, new):
+    """Idle governor changed state (on the main loop)."""
+    if new == SLEEP and boot.loaded("camera_workaround"):
+        camera_workaround.suspend()  # the first frame after a wake restarts it
+
 
-    cam = Camera()
+def _warm():
+    return boot.loaded("warmup") and warmup.is_ready()
+
+
+def _start_pipeline():
+    """First wake: build the pipeline (everything it needs is loaded by now)."""
+    with boot.step("pipeline.start"):
+        pipeline = boot.load("pipeline").GesturePipeline()
+        pipeline.start()
+    return pipeline
+
+
+def main():
+    for name in ("clock", "input_trace", "metrics", "ir_sensor"):
+        boot.load(name)
+    print("=== Shoulder Companion ===")
+    input_trace.start(source="CV")  # only if BOOTLEG_TRACE is set
+    metrics.start()                 # only if METRICS_ENABLED
     debouncer = GestureDebouncer()
+    actions = ActionExecutor()
+    governor = IdleGovernor()
+    governor.subscribe(_on_power)
+    ir_edge = threading.Event()
+    ir_sensor.on_edge(ir_edge.set)
+    pipeline = None
+    boot.ready()
+    boot.preload(*BACKGROUND, then=_background_init)
+    print("Waiting for IR trigger...\n")
     last_ir_time = 0
     gesture_active = False
     active_label = "None"
@@ -30,44 +99,58 @@ def main():
     try:
         while True:
             # ── IR wake check ──────────────────────────────────
-            if ir_sensor.detected():
-                last_ir_time = time.time()
+            if ir_sensor.detected() and (gesture_active or _warm()):
+                last_ir_time = clock.monotonic()
+                governor.activity(last_ir_time)
+                if not gesture_active:
+                    pipeline = pipeline or _start_pipeline()
+                    pipeline.resume()
                 gesture_active = True
             elif gesture_active:
-                if time.time() - last_ir_time > IR_COOLDOWN:
+                if clock.monotonic() - last_ir_time > IR_COOLDOWN:
                     gesture_active = False
+                    pipeline.pause()
                     debouncer.clear()
                     print("[IR] Hand gone – sleeping.")
+                    print(f"[PIPE] {pipeline.stats()}")
 
             # ── Sleep mode ─────────────────────────────────────
             if not gesture_active:
-                time.sleep(0.05)
+                governor.update()
+                ir_edge.wait(clock.real(governor.tick()))
+                ir_edge.clear()  # the check above runs again next, edge or not
+                continue
+
+            # ── Active mode: decide on the latest inference result ──
+            # (capture and inference run ahead on their own threads)
+            result = pipeline.next_result(timeout=clock.real(0.05))
+            if result is None:
                 continue
+            finger_count = result.hands[0].fingers if result.hands else None
 
-            # ── Active mode: get gesture and trigger action ────
-            finger_count = vision.get_gesture(cam)
-
-            if finger_count is not None:
-                confirmed = debouncer.update(finger_count)
-                if confirmed is not None and confirmed in GESTURE_MAP:
-                    # GESTURE_MAP[confirmed]() $ (Uncomment when fixed)
-                    if confirmed == 0:
-                        led.on()
-                    if confirmed == 1:
-                        led.off()
-                    if confirmed == 2:
-                        led.orange()
-                        cam.capture_picture()
-                        led.off()
-                    print(f"[GESTURE] {confirmed} finger(s)")
-            else:
-                debouncer.clear()
+            # "no hand" frames go through the debouncer too – its
+            # hysteresis rides out a dropped frame or two
+            with metrics.span("debounce"):
+                confirmed = debouncer.update(finger_count, result.captured)
+            if confirmed is not None and confirmed in gesture_map.GESTURE_MAP:
+                actions.run(gesture_map.GESTURE_MAP[confirmed])  # returns at once
+                print(f"[GESTURE] {confirmed} finger(s)")
 
     except KeyboardInterrupt:
         print("\nStopped.")
     finally:
-        GPIO.cleanup()
-        cam.stop()
+        if pipeline is not None:
+            pipeline.stop()
+        if boot.loaded("vision_workers"):
+            boot.load("vision_workers").stop()
+        actions.shutdown()  # a running photo finishes, waiting actions are dropped
+        print(f"[ACTION] {actions.stats()}")
+        print(governor.report())
+        if PHOTO_INTERVAL and boot.loaded("camera_workaround"):
+            camera_workaround.stop_interval()
+        input_trace.stop()
+        metrics.stop()
+        hal.GPIO.cleanup()
         print("Cleaned up. Goodbye!")
 
 
@@ -13,13 +13,13 @@
 #  If your screen doesn't show anything, try 0x3D below.
 # ══════════════════════════════════════════════════════════════
 
-import board
-import busio
-import adafruit_ssd1306
+from hal import board, busio, adafruit_ssd1306
+from oled_display import DiffDisplay
+import metrics
 from PIL import Image, ImageDraw, ImageFont
 import textwrap
 import random
-import time
+import clock
 
 # ── I2C config ────────────────────────────────────────────────
 I2C_ADDRESS = 0x3C   # change to 0x3D if screen doesn't respond
@@ -81,7 +81,7 @@ def init():
         print(f"[OLED] I2C init failed – is I2C enabled? Run: sudo raspi-config")
         print(f"[OLED] Error: {e}")
         return
-    _display = adafruit_ssd1306.SSD1306_I2C(WIDTH, HEIGHT, i2c, addr=I2C_ADDRESS)
+    _display = DiffDisplay(adafruit_ssd1306.SSD1306_I2C(WIDTH, HEIGHT, i2c, addr=I2C_ADDRESS))
     clear()
     print(f"[OLED] Ready on I2C address {hex(I2C_ADDRESS)}.")
 
@@ -114,32 +114,39 @@ def show_message(message=None):
         print("[OLED] Empty message, skipping.")
         return
 
-    font        = _get_font()
-    line_height = _measure_line_height(font)
-
-    # Word-wrap to fit 128px wide (approx 21 chars at default font size)
-    lines = textwrap.wrap(message, width=21)
-    if not lines:
-        print("[OLED] Message produced no lines after wrapping, skipping.")
-        return
-
-    # Build image – exactly WIDTH x HEIGHT to match the display buffer
-    image        = Image.new("1", (WIDTH, HEIGHT))
-    draw         = ImageDraw.Draw(image)
-    total_height = len(lines) * line_height
-    y            = max(0, (HEIGHT - total_height) // 2)
-
-    for line in lines:
-        bbox       = draw.textbbox((0, 0), line, font=font)
-        text_width = bbox[2] - bbox[0]
-        x          = max(0, (WIDTH - text_width) // 2)  # clamp so text never goes off-screen
-        draw.text((x, y), line, font=font, fill=255)
-        y += line_height
-
-    _display.image(image)
+    with metrics.span("oled_render"):
+        font        = _get_font()
+        line_height = _measure_line_height(font)
+
+        # Word-wrap to fit 128px wide (approx 21 chars at default font size)
+        lines = textwrap.wrap(message, width=21)
+        if not lines:
+            print("[OLED] Message produced no lines after wrapping, skipping.")
+            return
+
+        # Build image – exactly WIDTH x HEIGHT to match the display buffer
+        image        = Image.new("1", (WIDTH, HEIGHT))
+        draw         = ImageDraw.Draw(image)
+        total_height = len(lines) * line_height
+        y            = max(0, (HEIGHT - total_height) // 2)
+
+        for line in lines:
+            bbox       = draw.textbbox((0, 0), line, font=font)
+            text_width = bbox[2] - bbox[0]
+            x          = max(0, (WIDTH - text_width) // 2)  # clamp so text never goes off-screen
+            draw.text((x, y), line, font=font, fill=255)
+            y += line_height
+
+        _display.image(image)
     _display.show()
     print(f"[OLED] Showing: \"{message}\"")
 
+def flush_stats():
+    """Bytes sent / time spent pushing frames over I2C (see oled_display.py)."""
+    if _display is None:
+        return None
+    return _display.stats()
+
 def cleanup():
     """Blank the screen on exit."""
     clear()
@@ -150,6 +157,6 @@ if __name__ == "__main__":
     print("Cycling through 3 random messages...")
     for _ in range(3):
         show_message()
-        time.sleep(3)
+        clock.sleep(3)
     cleanup()
     print("Done.")
@@ -0,0 +1,247 @@
+# ══════════════════════════════════════════════════════════════
+#  photo_store.py  –  where camera_server.py puts photos
+#  Every photo is written to a hidden temp file in PHOTO_SAVE_DIR and
+#  renamed into place, so a half-written JPEG never shows up under
+#  its real name. fsync is batched: a flusher thread syncs the new
+#  files and the directory once PHOTO_FSYNC_BATCH photos are waiting
+#  or PHOTO_FSYNC_INTERVAL seconds have passed, instead of stalling
+#  every save on the SD card.
+#
+#  An in-memory index (oldest first) tracks every photo and the total
+#  size, so listing never scans the directory and the quota check is
+#  O(1): beyond PHOTO_MAX_COUNT photos or PHOTO_MAX_BYTES the oldest
+#  are deleted, but never the newest. The directory is scanned once at
+#  startup, which also clears out temp files, empty photos and stray
+#  thumbnails left by a power cut.
+#
+#  Thumbnails go to PHOTO_SAVE_DIR/thumbs from a background thread
+#  running at the lowest CPU priority.
+# ══════════════════════════════════════════════════════════════
+
+import os
+import queue
+import threading
+from collections import OrderedDict
+
+import clock
+from config import (
+    PHOTO_SAVE_DIR,
+    PHOTO_MAX_BYTES,
+    PHOTO_MAX_COUNT,
+    PHOTO_FSYNC_BATCH,
+    PHOTO_FSYNC_INTERVAL,
+    THUMB_SIZE,
+)
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_TMP_PREFIX = ".tmp-"
+
+
+class PhotoStore:
+    def __init__(
+        self,
+        directory=PHOTO_SAVE_DIR,
+        max_bytes=PHOTO_MAX_BYTES,
+        max_count=PHOTO_MAX_COUNT,
+        fsync_batch=PHOTO_FSYNC_BATCH,
+        fsync_interval=PHOTO_FSYNC_INTERVAL,
+        thumb_size=THUMB_SIZE,
+    ):
+        self.directory = os.path.join(_HERE, directory)  # no-op for absolute paths
+        self.thumbs = os.path.join(self.directory, "thumbs")
+        os.makedirs(self.thumbs, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_count = max_count
+        self.fsync_batch = fsync_batch
+        self.fsync_interval = fsync_interval
+        self.thumb_size = tuple(thumb_size)
+
+        self._index = OrderedDict()  # name -> (bytes, time saved), oldest first
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.saved = 0
+        self.evicted = 0
+        self.syncs = 0
+
+        self._pending = []  # paths written but not yet fsynced
+        self._pending_since = 0.0
+        self._closing = False
+        self._flush_cv = threading.Condition()
+        self._thumb_jobs = queue.Queue()
+
+        self._load()
+        self._flusher = threading.Thread(target=self._flush_loop, name="photo-fsync", daemon=True)
+        self._thumbnailer = threading.Thread(target=self._thumb_loop, name="photo-thumbs", daemon=True)
+        self._flusher.start()
+        self._thumbnailer.start()
+
+    # ── Index ─────────────────────────────────────────────────
+    def _load(self):
+        """The one directory scan: rebuild the index and tidy up after a crash."""
+        found = []
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+                st = entry.stat()
+                if entry.name.startswith(_TMP_PREFIX) or st.st_size == 0:
+                    os.unlink(entry.path)  # interrupted write
+                    continue
+                if entry.name.lower().endswith(".jpg"):
+                    found.append((st.st_mtime, entry.name, st.st_size))
+        names = {name for _, name, _ in found}
+        with os.scandir(self.thumbs) as entries:
+            for entry in entries:
+                if entry.is_file() and (entry.name.startswith(_TMP_PREFIX) or entry.name not in names):
+                    os.unlink(entry.path)  # interrupted thumbnail, or its photo is gone
+        for mtime, name, size in sorted(found):
+            self._index[name] = (size, mtime)
+            self._bytes += size
+            if not os.path.exists(os.path.join(self.thumbs, name)):
+                self._thumb_jobs.put(name)
+        self._enforce_quota()
+
+    def _enforce_quota(self):
+        """
+        Delete the oldest photos until both limits hold, keeping the newest
+        even if it breaks them alone. Call with _lock held (or before threads start).
+        """
+        while len(self._index) > 1 and (len(self._index) > self.max_count or self._bytes > self.max_bytes):
+            name, (size, _) = self._index.popitem(last=False)
+            self._bytes -= size
+            self.evicted += 1
+            for path in (os.path.join(self.directory, name), os.path.join(self.thumbs, name)):
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+
+    def photos(self):
+        """[{name, path, bytes, time}] oldest first – straight from the index."""
+        with self._lock:
+            items = list(self._index.items())
+        return [
+            {"name": name, "path": os.path.join(self.directory, name), "bytes": size, "time": saved}
+            for name, (size, saved) in items
+        ]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "dir": self.directory,
+                "photos": len(self._index),
+                "bytes": self._bytes,
+                "saved": self.saved,
+                "evicted": self.evicted,
+                "syncs": self.syncs,
+                "unsynced": len(self._pending),
+                "thumbs_queued": self._thumb_jobs.qsize(),
+            }
+
+    # ── Saving ────────────────────────────────────────────────
+    def save(self, name, write):
+        """
+        Store a photo called name; write(fileobj) produces its bytes.
+        Returns the final path. Safe to call from several threads.
+        """
+        name = os.path.basename(name)
+        path = os.path.join(self.directory, name)
+        tmp = os.path.join(self.directory, f"{_TMP_PREFIX}{threading.get_ident()}-{name}")
+        with open(tmp, "wb") as f:
+            write(f)
+            size = f.tell()
+        os.replace(tmp, path)  # atomic: readers see the old photo or the new one, never half
+
+        with self._lock:
+            old = self._index.pop(name, None)
+            if old is not None:
+                self._bytes -= old[0]  # same name saved again
+            self._index[name] = (size, clock.time())
+            self._bytes += size
+            self.saved += 1
+            self._enforce_quota()
+        with self._flush_cv:
+            if not self._pending:
+                self._pending_since = clock.monotonic()
+            self._pending.append(path)
+            self._flush_cv.notify()
+        self._thumb_jobs.put(name)
+        return path
+
+    # ── Batched fsync ─────────────────────────────────────────
+    def _flush_loop(self):
+        while True:
+            with self._flush_cv:
+                while not self._pending and not self._closing:
+                    self._flush_cv.wait()
+                if not self._pending:
+                    return  # closing and nothing left
+                deadline = self._pending_since + self.fsync_interval
+                while len(self._pending) < self.fsync_batch and not self._closing:
+                    remaining = deadline - clock.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._flush_cv.wait(clock.real(remaining))
+                batch, self._pending = self._pending, []
+            self._sync(batch)
+
+    def _sync(self, paths):
+        for path in paths:
+            try:
+                fd = os.open(path, os.O_RDONLY)
+            except FileNotFoundError:
+                continue  # evicted or replaced before we got to it
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        fd = os.open(self.directory, os.O_RDONLY)  # makes the renames themselves durable
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        with self._lock:
+            self.syncs += 1
+
+    # ── Thumbnails ────────────────────────────────────────────
+    def _thumb_loop(self):
+        try:
+            # Linux applies this to the calling thread only
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+        except (AttributeError, OSError):
+            pass
+        while True:
+            name = self._thumb_jobs.get()
+            if name is None:
+                return
+            try:
+                self._thumbnail(name)
+            except (OSError, ValueError) as e:
+                print(f"[PHOTO] Thumbnail failed for {name}: {e}")
+
+    def _thumbnail(self, name):
+        from PIL import Image
+        with self._lock:
+            if name not in self._index:
+                return  # evicted in the meantime
+        src = os.path.join(self.directory, name)
+        dst = os.path.join(self.thumbs, name)
+        tmp = os.path.join(self.thumbs, _TMP_PREFIX + name)
+        with Image.open(src) as im:
+            im.draft("RGB", self.thumb_size)  # let the JPEG decoder downscale for free
+            im.thumbnail(self.thumb_size)
+            im.save(tmp, format="JPEG", quality=70)
+        with self._lock:  # eviction deletes thumbnails under the lock too
+            if name in self._index:
+                os.replace(tmp, dst)
+                return
+        os.unlink(tmp)  # evicted while we were drawing it
+
+    def close(self):
+        """Sync anything still pending and stop the background threads."""
+        with self._flush_cv:
+            self._closing = True
+            self._flush_cv.notify()
+        self._flusher.join()
+        self._thumb_jobs.put(None)
+        self._thumbnailer.join(timeout=5)
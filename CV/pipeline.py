@@ -0,0 +1,180 @@
+# ══════════════════════════════════════════════════════════════
+#  pipeline.py  –  capture and inference on their own threads
+#  capture thread → frames queue → inference thread → results queue
+#  → the caller (decision + action, on the main thread).
+#
+#  Frame N+1 is captured while frame N is inferred. Queues are
+#  small and bounded; when a stage falls behind, the oldest item is
+#  dropped so the next stage always works on fresh data. Per-stage
+#  depth and drop counters show where the pipeline is limited.
+#
+#  With VISION_WORKERS the inference thread is replaced by a feeder
+#  (newest frame → next idle worker process, vision_workers.py) and a
+#  collector (worker results → results queue). Several frames can be
+#  in flight then, so results are ordered by frame seq: one that
+#  comes back after a newer frame's result is dropped as stale.
+# ══════════════════════════════════════════════════════════════
+
+import queue
+import threading
+from collections import namedtuple
+
+import clock
+import input_trace
+import metrics
+import vision
+import vision_workers
+from config import PIPELINE_FRAME_QUEUE, PIPELINE_RESULT_QUEUE, VISION_WORKERS
+
+# hands     = list of vision.Hand for this frame
+# captured  = clock.monotonic() when the frame was grabbed
+# inferred  = clock.monotonic() when inference finished
+Result = namedtuple("Result", "seq hands captured inferred")
+
+
+class _Stage:
+    """A bounded hand-off queue plus the counters for the stage feeding it."""
+
+    def __init__(self, name, size):
+        self.name = name
+        self.queue = queue.Queue(maxsize=size)
+        self.produced = 0
+        self.dropped = 0
+
+    def put_latest(self, item):
+        """Enqueue without ever blocking the producer; drop the oldest if full."""
+        while True:
+            try:
+                self.queue.put_nowait(item)
+                self.produced += 1
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def get(self, timeout):
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def drain(self):
+        while True:
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                return
+
+    def stats(self):
+        return {"depth": self.queue.qsize(), "produced": self.produced, "dropped": self.dropped}
+
+
+class GesturePipeline:
+    def __init__(self):
+        self._frames = _Stage("capture", PIPELINE_FRAME_QUEUE)
+        self._results = _Stage("inference", PIPELINE_RESULT_QUEUE)
+        self._active = threading.Event()
+        self._running = False
+        self._threads = []
+        self._seq = 0
+        self._workers = vision_workers.start() if VISION_WORKERS else None
+        self._last_seq = 0  # newest seq handed to the results queue
+        self._stale = 0     # results dropped for arriving after a newer one
+
+    # ── Stages ────────────────────────────────────────────────
+    def _capture(self):
+        while self._running:
+            if not self._active.wait(timeout=0.1):
+                continue
+            with metrics.span("capture_stage"):
+                frame = vision.next_frame()
+            if frame is None:
+                continue
+            # A ring frame is a view that the next next_frame() call may
+            # recycle, and we call it again before inference is done.
+            frame = frame.copy()
+            captured = clock.monotonic()
+            input_trace.frame(frame, captured)
+            self._seq += 1
+            self._frames.put_latest((self._seq, captured, frame))
+
+    def _infer(self):
+        while self._running:
+            item = self._frames.get(timeout=0.1)
+            if item is None or not self._active.is_set():
+                continue
+            seq, captured, frame = item
+            hands = vision.gated_detect(frame)
+            self._results.put_latest(Result(seq, hands, captured, clock.monotonic()))
+
+    def _feed(self):
+        while self._running:
+            worker = self._workers.acquire(timeout=0.1)
+            if worker is None:
+                continue
+            item = self._frames.get(timeout=0.1)
+            if item is None or not self._active.is_set():
+                self._workers.release(worker)
+                continue
+            seq, captured, frame = item
+            self._workers.send(worker, seq, captured, frame)
+
+    def _collect(self):
+        while self._running:
+            for seq, hands, captured in self._workers.results(timeout=0.1):
+                if not self._active.is_set():
+                    continue  # in flight when we paused
+                if seq < self._last_seq:
+                    self._stale += 1
+                    continue
+                self._last_seq = seq
+                self._results.put_latest(Result(seq, hands, captured, clock.monotonic()))
+
+    # ── Control ───────────────────────────────────────────────
+    def start(self):
+        self._running = True
+        self._threads = [
+            threading.Thread(target=self._capture, name="capture", daemon=True),
+        ]
+        if self._workers is None:
+            self._threads.append(threading.Thread(target=self._infer, name="inference", daemon=True))
+        else:
+            self._threads += [
+                threading.Thread(target=self._feed, name="vision-feed", daemon=True),
+                threading.Thread(target=self._collect, name="vision-collect", daemon=True),
+            ]
+        for t in self._threads:
+            t.start()
+
+    def resume(self):
+        """Start feeding frames (IR saw something), tracking and gating from scratch."""
+        if self._workers is None:
+            vision.reset()
+        else:
+            self._workers.reset()
+        self._active.set()
+
+    def pause(self):
+        """Stop capturing and throw away anything in flight."""
+        self._active.clear()
+        self._frames.drain()
+        self._results.drain()
+
+    def stop(self):
+        self._running = False
+        self._active.clear()
+        for t in self._threads:
+            t.join(timeout=2)
+
+    def next_result(self, timeout=0.05):
+        """Latest inference Result, or None if nothing arrived within timeout."""
+        return self._results.get(timeout)
+
+    def stats(self):
+        stats = {stage.name: stage.stats() for stage in (self._frames, self._results)}
+        if self._workers is not None:
+            stats["workers"] = dict(self._workers.stats(), stale=self._stale)
+        return stats
@@ -0,0 +1,158 @@
+# ══════════════════════════════════════════════════════════════
+#  replay.py  –  play a recorded trace back through the vision path
+#  Run with: python replay.py TRACE_DIR [--speed 0] [--expect 2,0]
+#                             [--engine classic]
+#
+#  Follows main.py's rules: the recorded IR edges wake and send to
+#  sleep the gesture detection, and while awake the newest recorded
+#  frame goes through vision.get_gesture() and the debouncer. As in
+#  the live pipeline, frames that arrive while a slow inference is
+#  still running are skipped.
+#
+#  --speed 1 replays in real time. --speed 0 doesn't wait through
+#  idle stretches, but still charges each inference its real cost,
+#  so latencies match a 1x run. Other speeds scale the clock.
+#
+#  Reported latencies: IR wake → first result, inference time,
+#  frame age at decision, and first frame showing a gesture →
+#  its confirmation. --expect checks the confirmed gestures and
+#  exits with 1 if they differ. --engine overrides GESTURE_ENGINE, so
+#  the same trace can compare MediaPipe and classic_vision.py on
+#  gestures found and inference time.
+# ══════════════════════════════════════════════════════════════
+
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+
+import numpy as np
+
+os.environ.setdefault("BOOTLEG_HAL", "sim")  # before anything imports hal
+
+import clock
+import config
+import input_trace
+from debouncer import GestureDebouncer
+from config import IR_SENSOR_PIN, IR_COOLDOWN
+
+_NOTHING = object()
+
+
+def replay(trace, speed):
+    """Returns (latencies by name, confirmed gestures in order, frame counters)."""
+    import vision
+
+    vision.warm_up()  # main.py does this before the first wake too (warmup.py)
+    t0 = trace.meta["start"]
+    stepped = not speed
+    clock.install(clock.VirtualClock(speed=speed or None, start=t0))
+
+    def now():
+        return clock.monotonic() - t0
+
+    ir_times, ir_levels = trace.pin_edges(IR_SENSOR_PIN)
+    frame_times = trace.frame_times
+    debouncer = GestureDebouncer()
+
+    latencies = {"wake": [], "inference": [], "frame_age": [], "gesture": []}
+    confirmed = []
+    frames = Counter()
+    detected = awake = False
+    last_ir = wake_edge = None
+    next_edge = 0
+    last_frame = -1
+    streak, streak_start = _NOTHING, 0.0
+
+    while True:
+        t = now()
+        while next_edge < len(ir_times) and ir_times[next_edge] <= t:
+            edge_time, level = ir_times[next_edge], ir_levels[next_edge]
+            if detected:
+                last_ir = edge_time
+            detected = level == 0  # IR sensors pull LOW on detection
+            if detected and not awake and wake_edge is None:
+                wake_edge = edge_time
+            next_edge += 1
+
+        latest = int(np.searchsorted(frame_times, t, side="right")) - 1
+        if detected:
+            last_ir = t
+            if not awake:
+                awake = True
+                last_frame = latest - 1  # the newest frame is fresh to a resumed pipeline
+        elif awake and t - last_ir > IR_COOLDOWN:
+            awake = False
+            wake_edge = None
+            debouncer.clear()
+            streak = _NOTHING
+
+        if awake and latest > last_frame:
+            frames["skipped"] += latest - last_frame - 1
+            frames["processed"] += 1
+            last_frame = latest
+            started = time.perf_counter()
+            gesture = vision.get_gesture(np.asarray(trace.frames[latest]))
+            if stepped:
+                clock.current().advance(time.perf_counter() - started)
+            done = now()
+            captured = float(frame_times[latest])
+
+            latencies["inference"].append(time.perf_counter() - started)
+            latencies["frame_age"].append(done - captured)
+            if wake_edge is not None:
+                latencies["wake"].append(done - wake_edge)
+                wake_edge = None
+            if gesture != streak:
+                streak, streak_start = gesture, captured
+            if debouncer.update(gesture, t0 + captured) is not None:
+                latencies["gesture"].append(done - streak_start)
+                confirmed.append(gesture)
+                print(f"[GESTURE] {gesture} finger(s) at {done:.2f}s")
+            continue
+
+        # Nothing to do – wait for whatever can change things next
+        upcoming = []
+        if next_edge < len(ir_times):
+            upcoming.append(ir_times[next_edge])
+        if awake and latest + 1 < len(frame_times):
+            upcoming.append(frame_times[latest + 1])
+        if awake and not detected:
+            upcoming.append(last_ir + IR_COOLDOWN + 1e-3)
+        if not upcoming:
+            return latencies, confirmed, frames
+        clock.sleep(max(0.0, min(upcoming) - t))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded trace through vision.get_gesture()")
+    parser.add_argument("trace", help="directory written with BOOTLEG_TRACE")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="1 = real time, 0 = skip idle time (latencies stay real)")
+    parser.add_argument("--expect", help="comma-separated finger counts that should be confirmed, in order")
+    parser.add_argument("--engine", choices=("mediapipe", "classic"),
+                        help="gesture engine to use instead of config.GESTURE_ENGINE")
+    args = parser.parse_args()
+    if args.engine:
+        config.GESTURE_ENGINE = args.engine  # before vision is imported
+
+    trace = input_trace.load(args.trace)
+    print(f"[REPLAY] {len(trace.edges)} edges, {len(trace.frames)} frames over {trace.duration:.1f}s, "
+          f"engine {config.GESTURE_ENGINE}")
+    latencies, confirmed, frames = replay(trace, args.speed)
+
+    print(f"\n[REPLAY] frames: {dict(frames)}  gestures: {confirmed}")
+    print("[REPLAY] latency (ms)")
+    for name, values in latencies.items():
+        print(f"  {name:10} {input_trace.summarize(values)}")
+
+    if args.expect is not None:
+        expected = [int(v) for v in args.expect.split(",") if v.strip()]
+        if confirmed != expected:
+            print(f"[REPLAY] expected gestures {expected}, got {confirmed}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# ══════════════════════════════════════════════════════════════
+#  test_actions.py  –  tests for actions.py
+# ══════════════════════════════════════════════════════════════
+
+import threading
+
+import pytest
+
+from actions import ActionExecutor, action
+
+
+@pytest.fixture
+def executor():
+    executor = ActionExecutor(workers=2)
+    yield executor
+    executor.shutdown()
+
+
+def _recorder(log, gate=None):
+    """Actions on one lane that append their name to log, the first waiting for gate."""
+    def make(name, wait=False):
+        def fn():
+            if wait:
+                gate.wait(5)
+            log.append(name)
+        return action(fn, name=name, lane="led")
+    return make
+
+
+def test_on_off_on_ends_on(executor):
+    log, gate = [], threading.Event()
+    make = _recorder(log, gate)
+    executor.run(make("on", wait=True))
+    executor.run(make("off"))
+    last = executor.run(make("on"))  # replaces the waiting off
+    gate.set()
+    last.result(5)
+    assert log == ["on", "on"]
+    assert executor.stats()["off"]["superseded"] == 1
+
+
+def test_same_action_joins_running_one(executor):
+    log, gate = [], threading.Event()
+    make = _recorder(log, gate)
+    first = executor.run(make("on", wait=True))
+    assert executor.run(make("on")) is first
+    gate.set()
+    first.result(5)
+    assert log == ["on"]
+
+
+def test_same_action_joins_waiting_one(executor):
+    log, gate = [], threading.Event()
+    make = _recorder(log, gate)
+    executor.run(make("on", wait=True))
+    waiting = executor.run(make("off"))
+    assert executor.run(make("off")) is waiting
+    gate.set()
+    waiting.result(5)
+    assert log == ["on", "off"]
+
+
+def test_cooldown(executor):
+    act = action(lambda: None, name="photo", cooldown=2.0)
+    executor.run(act, at=10.0).result(5)
+    assert executor.run(act, at=11.0) is None
+    executor.run(act, at=12.5).result(5)
+    assert executor.stats()["photo"] == {"triggered": 2, "done": 2, "cooldown": 1}
@@ -0,0 +1,73 @@
+# ══════════════════════════════════════════════════════════════
+#  test_classic_vision.py  –  tests for classic_vision.py on drawn hands
+# ══════════════════════════════════════════════════════════════
+
+import numpy as np
+import pytest
+
+import classic_vision
+from config import CAMERA_WIDTH, CAMERA_HEIGHT
+
+SKIN = (120, 150, 200)  # B, G, R
+BACKGROUND = (40, 40, 40)
+# finger directions, degrees clockwise from straight up: thumb first
+ANGLES = (-95, -40, -13, 13, 40)
+
+
+def _hand(fingers, scale=1.0, noise=0, seed=0):
+    """A flat hand facing the camera: palm, forearm and `fingers` straight fingers."""
+    ys, xs = np.mgrid[:CAMERA_HEIGHT, :CAMERA_WIDTH]
+    cy, cx = 0.6 * CAMERA_HEIGHT, 0.5 * CAMERA_WIDTH
+    palm = 40 * scale
+    hand = (ys - cy) ** 2 + (xs - cx) ** 2 <= palm ** 2
+    hand |= (ys >= cy) & (np.abs(xs - cx) <= 0.65 * palm)  # forearm, off the bottom edge
+    for angle in np.radians(ANGLES[:fingers]):
+        dy, dx = -np.cos(angle), np.sin(angle)
+        along = (ys - cy) * dy + (xs - cx) * dx
+        across = np.abs((ys - cy) * dx - (xs - cx) * dy)
+        hand |= (along >= 0) & (along <= 2.6 * palm) & (across <= 0.18 * palm)
+    frame = np.empty((CAMERA_HEIGHT, CAMERA_WIDTH, 3), dtype=np.uint8)
+    frame[:] = BACKGROUND
+    frame[hand] = SKIN
+    if noise:
+        rng = np.random.default_rng(seed)
+        frame = np.clip(frame + rng.integers(-noise, noise + 1, frame.shape), 0, 255).astype(np.uint8)
+    return frame
+
+
+def test_no_hand():
+    frame = np.full((CAMERA_HEIGHT, CAMERA_WIDTH, 3), BACKGROUND, dtype=np.uint8)
+    assert classic_vision.detect(frame) == []
+    assert classic_vision.get_gesture(frame) is None
+
+
+def test_skin_mask():
+    mask = classic_vision.skin_mask(_hand(0))
+    assert mask.shape == (CAMERA_HEIGHT // classic_vision.CLASSIC_DOWNSAMPLE,
+                          CAMERA_WIDTH // classic_vision.CLASSIC_DOWNSAMPLE)
+    assert 0 < mask.mean() < 0.5
+
+
+def test_largest_component_keeps_biggest_blob():
+    mask = np.zeros((20, 20), dtype=bool)
+    mask[2:5, 2:5] = True          # 9 px
+    mask[10:16, 10:16] = True      # 36 px
+    mask[16, 16] = True            # touches the big one diagonally
+    blob, area = classic_vision.largest_component(mask)
+    assert area == 37
+    assert blob[16, 16] and not blob[3, 3]
+
+
+@pytest.mark.parametrize("scale", [0.8, 1.0])
+@pytest.mark.parametrize("fingers", range(6))
+def test_counts_fingers(fingers, scale):
+    assert classic_vision.get_gesture(_hand(fingers, scale)) == fingers
+
+
+@pytest.mark.parametrize("fingers", [1, 3, 5])
+def test_counts_through_sensor_noise(fingers):
+    assert classic_vision.get_gesture(_hand(fingers, noise=8, seed=fingers)) == fingers
+
+
+def test_detect_has_no_handedness():
+    assert classic_vision.detect(_hand(2)) == [(2, None)]
@@ -0,0 +1,44 @@
+# ══════════════════════════════════════════════════════════════
+#  test_debouncer.py  –  tests for debouncer.py
+# ══════════════════════════════════════════════════════════════
+
+from config import DEBOUNCE_HOLD
+from debouncer import GestureDebouncer
+
+FPS = 20
+
+
+def _run(debouncer, gestures, start=0.0):
+    """Feed one gesture per frame; returns [(frame, fired gesture)]."""
+    fired = []
+    for i, gesture in enumerate(gestures):
+        value = debouncer.update(gesture, start + i / FPS)
+        if value is not None:
+            fired.append((i, value))
+    return fired
+
+
+def test_fires_once_per_hold():
+    frames = int(2 * DEBOUNCE_HOLD * FPS)
+    fired = _run(GestureDebouncer(), [3] * frames)
+    assert fired == [(round(DEBOUNCE_HOLD * FPS), 3)]
+
+
+def test_short_flash_does_not_fire():
+    frames = int(DEBOUNCE_HOLD * FPS) - 2
+    assert _run(GestureDebouncer(), [None] * 5 + [2] * frames + [None] * 20) == []
+
+
+def test_must_release_before_firing_again():
+    hold = int(2 * DEBOUNCE_HOLD * FPS)
+    debouncer = GestureDebouncer()
+    assert len(_run(debouncer, [1] * hold + [1] * hold)) == 1
+    assert len(_run(debouncer, [None] * hold + [1] * hold, start=2 * hold / FPS)) == 1
+
+
+def test_clear_forgets_progress():
+    debouncer = GestureDebouncer()
+    almost = int(DEBOUNCE_HOLD * FPS) - 1
+    _run(debouncer, [4] * almost)
+    debouncer.clear()
+    assert _run(debouncer, [4] * almost, start=almost / FPS) == []
@@ -0,0 +1,72 @@
+# ══════════════════════════════════════════════════════════════
+#  test_frame_ring.py  –  tests for frame_ring.py
+# ══════════════════════════════════════════════════════════════
+
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+import frame_ring
+from frame_ring import FrameRing
+
+SHAPE = (4, 6, 3)
+
+
+@pytest.fixture
+def name(monkeypatch):
+    # Writer and reader share one process here, so attach() must not
+    # take the segment off the resource tracker the writer put it on.
+    monkeypatch.setattr(frame_ring.resource_tracker, "unregister", lambda *args: None)
+    name = f"test_ring_{os.getpid()}"
+    yield name
+    try:
+        FrameRing.attach(name).close()
+        frame_ring.shared_memory.SharedMemory(name=name).unlink()
+    except (FileNotFoundError, ValueError):
+        pass
+
+
+def _set_owner(name, pid):
+    ring = FrameRing.attach(name)
+    ring._hdr[frame_ring._H_OWNER] = pid
+    ring.close()
+
+
+def test_reader_gets_newest_frame(name):
+    writer = FrameRing.create(name, 3, SHAPE)
+    reader = FrameRing.attach(name)
+    try:
+        for value in (1, 2, 3):
+            writer.write(np.full(SHAPE, value, dtype=np.uint8), timestamp=float(value))
+        frame, seq, ts = reader.latest(timeout=0)
+        assert (seq, ts) == (3, 3.0)
+        assert (frame == 3).all()
+        assert reader.latest(timeout=0) is None  # nothing newer yet
+        writer.write(np.full(SHAPE, 4, dtype=np.uint8))
+        assert reader.latest(timeout=0)[1] == 4
+    finally:
+        reader.close()
+        writer.close()
+
+
+def test_create_replaces_ring_of_dead_owner(name):
+    dead = subprocess.Popen([sys.executable, "-c", "pass"])
+    dead.wait()
+    stale = FrameRing.create(name, 3, SHAPE)
+    stale._owner = False  # "crash": leave the segment behind
+    stale.close()
+    _set_owner(name, dead.pid)
+    ring = FrameRing.create(name, 3, SHAPE)
+    ring.close()
+
+
+def test_create_refuses_ring_of_live_owner(name):
+    stale = FrameRing.create(name, 3, SHAPE)
+    stale._owner = False
+    stale.close()
+    _set_owner(name, os.getppid())  # a process that is certainly running
+    with pytest.raises(RuntimeError):
+        FrameRing.create(name, 3, SHAPE)
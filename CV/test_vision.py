@@ -0,0 +1,112 @@
+# ══════════════════════════════════════════════════════════════
+#  test_vision.py  –  tests for vision.py (no MediaPipe needed)
+# ══════════════════════════════════════════════════════════════
+
+from types import SimpleNamespace
+
+import numpy as np
+
+import vision
+
+
+def _landmarks(fingers):
+    """21 landmarks of a hand with the first `fingers` tips extended."""
+    points = np.zeros((21, 3), dtype=np.float32)
+    points[vision.MID_BASE] = (0.0, 0.1, 0.0)  # hand scale 0.1 from the wrist at 0
+    for tip in vision.FINGER_TIPS[:fingers]:
+        points[tip] = (0.0, 0.2, 0.0)
+    for tip in vision.FINGER_TIPS[fingers:]:
+        points[tip] = (0.0, 0.02, 0.0)
+    return SimpleNamespace(landmark=[SimpleNamespace(x=x, y=y, z=z) for x, y, z in points])
+
+
+def _result(*hands):
+    """A MediaPipe-like result for (fingers, label, score) hands, in that order."""
+    return SimpleNamespace(
+        multi_hand_landmarks=[_landmarks(fingers) for fingers, _, _ in hands],
+        multi_handedness=[
+            SimpleNamespace(classification=[SimpleNamespace(label=label, score=score)])
+            for _, label, score in hands
+        ],
+    )
+
+
+def test_no_hands():
+    assert vision.hands_from_result(SimpleNamespace(multi_hand_landmarks=None)) == []
+
+
+def test_counts_fingers():
+    for fingers in range(6):
+        assert vision.hands_from_result(_result((fingers, "Right", 0.9))) == [(fingers, "Right")]
+
+
+def test_most_confident_hand_first():
+    hands, points, scores = vision._analyse(_result((2, "Left", 0.71), (5, "Right", 0.97)))
+    assert hands == [(5, "Right"), (2, "Left")]
+    assert scores == [0.97, 0.71]
+    assert vision.count_fingers_array(points).tolist() == [5, 2]  # landmarks follow the hands
+
+
+def _frame(value):
+    return np.full((vision.CAMERA_HEIGHT, vision.CAMERA_WIDTH, 3), value, dtype=np.uint8)
+
+
+def test_motion_gate_first_change_counts():
+    vision.reset()
+    assert vision._moved(_frame(100))  # nothing to compare with yet
+    assert vision._moved(_frame(140))  # a big first difference is motion, not noise
+    assert not vision._moved(_frame(140))
+    assert vision._noise < vision.MOTION_MIN_DIFF / vision.MOTION_NOISE_FACTOR
+
+
+def test_reset_forgets_gate_and_roi():
+    vision._moved(_frame(100))
+    vision._roi = (0, 0, 10, 10)
+    vision.reset()
+    assert vision._roi is None
+    assert vision._moved(_frame(100))  # compared with nothing, not with the old scene
+
+
+class _Model:
+    """Stands in for a MediaPipe Hands graph: same answer every time, inputs kept."""
+
+    def __init__(self, result):
+        self.result = result
+        self.seen = []
+
+    def process(self, image):
+        self.seen.append(image.copy())
+        return self.result
+
+
+def test_crops_go_to_the_static_model(monkeypatch):
+    full, crop = _Model(_result((3, "Right", 0.9))), _Model(_result((3, "Right", 0.9)))
+    monkeypatch.setattr(vision, "_hands", full)
+    monkeypatch.setattr(vision, "_crop_hands", crop)
+    vision.reset()
+    frame = _frame(0)
+    assert vision.detect(frame) == [(3, "Right")]
+    assert vision._roi is not None
+    assert vision.detect(frame) == [(3, "Right")]
+    assert (len(full.seen), len(crop.seen)) == (1, 1)
+    assert crop.seen[0].size < frame.size
+    crop.result = SimpleNamespace(multi_hand_landmarks=None)  # lost in the crop:
+    assert vision.detect(frame) == [(3, "Right")]             # same frame, full size
+    assert (len(full.seen), len(crop.seen)) == (2, 2)
+    assert all(image.shape == frame.shape for image in full.seen)
+    vision.reset()
+
+
+def test_mediapipe_gets_rgb(monkeypatch):
+    full, crop = _Model(_result((1, "Left", 0.9))), _Model(_result((1, "Left", 0.9)))
+    monkeypatch.setattr(vision, "_hands", full)
+    monkeypatch.setattr(vision, "_crop_hands", crop)
+    vision.reset()
+    frame = _frame(0)
+    frame[..., 0] = 10  # B, G, R in memory, like Picamera2's "RGB888"
+    frame[..., 2] = 200
+    vision.detect(frame)
+    vision.detect(frame)
+    for image in full.seen + crop.seen:
+        assert image[0, 0].tolist() == [200, 0, 10]
+    vision.reset()
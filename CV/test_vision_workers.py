@@ -0,0 +1,36 @@
+# ══════════════════════════════════════════════════════════════
+#  test_vision_workers.py  –  tests for vision_workers.py's processes
+# ══════════════════════════════════════════════════════════════
+
+import multiprocessing
+import os
+import sys
+import types
+
+_MAIN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+
+
+def _probe(conn):
+    """Runs in the spawned process: what did importing the parent's main module set up?"""
+    hal = sys.modules.get("hal")
+    conn.send({
+        "main": "__mp_main__" in sys.modules,
+        "ir_sensor": "ir_sensor" in sys.modules,
+        "GPIO": hal is not None and "GPIO" in vars(hal),
+    })
+
+
+def test_spawned_worker_sets_up_no_hardware(monkeypatch):
+    # Start the process the way vision_workers does from main.py
+    main = types.ModuleType("__main__")
+    main.__file__ = _MAIN
+    monkeypatch.setitem(sys.modules, "__main__", main)
+    ctx = multiprocessing.get_context("spawn")
+    conn, child = ctx.Pipe()
+    worker = ctx.Process(target=_probe, args=(child,))
+    worker.start()
+    try:
+        assert conn.poll(60), "worker never answered"
+        assert conn.recv() == {"main": True, "ir_sensor": False, "GPIO": False}
+    finally:
+        worker.join(timeout=10)
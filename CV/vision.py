@@ -4,21 +4,73 @@
 # ══════════════════════════════════════════════════════════════
 
 # import cv2 # (i don't think we need this)
-import mediapipe as mp
 import numpy as np
+import threading
 import time
-import subprocess
-import io
-import os
-# ── MediaPipe setup ───────────────────────────────────────────
-_mp_hands = mp.solutions.hands
-_mp_draw = mp.solutions.drawing_utils
-_hands = _mp_hands.Hands(
-    static_image_mode=False,
-    max_num_hands=1,
-    min_detection_confidence=0.7,
-    min_tracking_confidence=0.6,
+from collections import namedtuple
+import camera_workaround
+import metrics
+from camera_workaround import capture_frame  # frames come from camera_server.py
+from config import (
+    CAMERA_WIDTH,
+    CAMERA_HEIGHT,
+    FRAME_RING_ENABLED,
+    FRAME_RING_TIMEOUT,
+    MAX_HANDS,
+    ROI_TRACKING,
+    ROI_PADDING,
+    ROI_MIN_SIZE,
+    MOTION_GATE,
+    MOTION_DOWNSAMPLE,
+    MOTION_MIN_DIFF,
+    MOTION_NOISE_FACTOR,
+    MOTION_MAX_SKIP,
+    GESTURE_ENGINE,
 )
+# ── MediaPipe setup ───────────────────────────────────────────
+# Importing mediapipe and building the model takes seconds on a Pi
+# Zero, so neither happens at import: main.py calls load_model() in
+# the background, and the first detect() does it otherwise.
+# GESTURE_ENGINE = "classic" swaps MediaPipe for classic_vision.py
+# and mediapipe is never imported.
+#
+# Two graphs: _hands only ever sees full frames, so its own tracking
+# between calls stays in one coordinate frame. ROI crops move and
+# resize every frame, so they go to _crop_hands, which treats each
+# one as a new image (static_image_mode).
+_hands = None
+_crop_hands = None
+_model_lock = threading.Lock()
+
+
+def load_model():
+    """Import mediapipe and build the hand model(s), once. Safe from any thread."""
+    global _hands, _crop_hands
+    with _model_lock:
+        if _hands is None:
+            import mediapipe as mp
+            options = dict(
+                max_num_hands=MAX_HANDS,
+                min_detection_confidence=0.7,
+                min_tracking_confidence=0.6,
+            )
+            if ROI_TRACKING:
+                _crop_hands = mp.solutions.hands.Hands(static_image_mode=True, **options)
+            _hands = mp.solutions.hands.Hands(static_image_mode=False, **options)
+    return _hands
+
+
+def warm_up():
+    """Build the model and push one blank frame through it, so the first real frame isn't slow."""
+    blank = np.zeros((CAMERA_HEIGHT, CAMERA_WIDTH, 3), dtype=np.uint8)
+    if GESTURE_ENGINE == "classic":
+        import classic_vision
+        classic_vision.detect(blank)
+        return
+    load_model().process(blank)
+    if _crop_hands is not None:
+        _crop_hands.process(np.ascontiguousarray(blank[:ROI_MIN_SIZE, :ROI_MIN_SIZE]))
+
 
 # ── Finger counting ───────────────────────────────────────────
 FINGER_TIPS = [4, 8, 12, 16, 20]
@@ -37,61 +89,228 @@ FINGER_THRESHOLDS = {
 }
 
 
-def _to_array(lm):
-    return np.array([lm.x, lm.y, lm.z])
+# Landmarks measured from the wrist in one go: hand scale first, then the tips
+_MEASURED = [MID_BASE] + FINGER_TIPS
+_THRESHOLDS = np.array([FINGER_THRESHOLDS[tip_id] for tip_id in FINGER_TIPS])
+
+# fingers    = number of extended fingers (0–5)
+# handedness = "Left" or "Right" as MediaPipe reports it (None from classic_vision.py)
+Hand = namedtuple("Hand", "fingers handedness")
+
+
+def landmarks_array(multi_hand_landmarks):
+    """All detected hands' 21 landmarks as one (hands, 21, 3) array."""
+    return np.array(
+        [[(lm.x, lm.y, lm.z) for lm in hand.landmark] for hand in multi_hand_landmarks],
+        dtype=np.float32,
+    ).reshape(-1, 21, 3)
+
+
+def count_fingers_array(points):
+    """Extended-finger count per hand for a (hands, 21, 3) landmark array."""
+    offsets = points[:, _MEASURED] - points[:, WRIST, None]  # (hands, 6, 3)
+    dist = np.sqrt(np.einsum("hij,hij->hi", offsets, offsets))  # (hands, 6)
+    scale = dist[:, :1]
+    extended = dist[:, 1:] > scale * _THRESHOLDS
+    counts = extended.sum(axis=1)
+    counts[scale[:, 0] < 1e-5] = 0
+    return counts
 
 
 def count_fingers(hand_landmarks):
     """Return number of extended fingers (0–5)."""
-    lm = hand_landmarks.landmark
-    wrist = _to_array(lm[WRIST])
-    hand_scale = np.linalg.norm(_to_array(lm[MID_BASE]) - wrist)
-    if hand_scale < 1e-5:
-        return 0
-    count = 0
-    for tip_id in FINGER_TIPS:
-        threshold = FINGER_THRESHOLDS[tip_id]
-        if np.linalg.norm(_to_array(lm[tip_id]) - wrist) > hand_scale * threshold:
-            count += 1
-    return count
-
-def capture_frame():
-    clean_env = {k: v for k, v in os.environ.items()
-                 if k not in ("PYTHONPATH", "VIRTUAL_ENV", "PATH")}
-    clean_env["PATH"] = "/usr/bin:/bin"
-
-    result = subprocess.run(
-        ["python3", "camera.py"],
-        capture_output=True,
-        env=clean_env
-    )
-    if result.returncode != 0:
-        print("Camera error:", result.stderr.decode())
-        return None
+    return int(count_fingers_array(landmarks_array([hand_landmarks]))[0])
 
-    # first 12 bytes = 3 int32s = shape (height, width, channels)
-    shape = np.frombuffer(result.stdout[:12], dtype=np.int32)
-    frame = np.frombuffer(result.stdout[12:], dtype=np.uint8).reshape(shape)
-    return frame
 
-def get_gesture():
+def hands_from_result(result):
+    """List of Hand tuples for a MediaPipe result, most confident first."""
+    return _analyse(result)[0]
+
+
+def _analyse(result, roi=None, frame_size=None):
     """
-    Capture one frame from the camera and return the detected
-    finger count, or None if no hand is found.
-    Also handles the preview window if not in headless mode.
+    (hands, landmark array, scores) for a MediaPipe result, most
+    confident hand first. If it ran on a crop, pass the ROI and
+    (width, height) so the landmarks come back in frame-normalised
+    coordinates.
+    """
+    if not result.multi_hand_landmarks:
+        return [], None, []
+    best = [h.classification[0] for h in result.multi_handedness]
+    order = sorted(range(len(best)), key=lambda i: -best[i].score)
+    points = landmarks_array(result.multi_hand_landmarks)[order]
+    if roi is not None:
+        points = _to_frame_coords(points, roi, *frame_size)
+    counts = count_fingers_array(points)
+    labels = [best[i].label for i in order]
+    scores = [best[i].score for i in order]
+    return [Hand(int(c), label) for c, label in zip(counts, labels)], points, scores
+
+
+# ── ROI tracking ──────────────────────────────────────────────
+# Once a hand is found, the next frames are cropped to a padded box
+# around it so MediaPipe gets a smaller image. If no hand is found in
+# the crop, the same frame is re-run at full size.
+_roi = None  # (x0, y0, x1, y1) in frame pixels, None = full frame
+stats = {"full": 0, "roi": 0, "roi_lost": 0, "gated": 0, "processed": 0}
+
+
+def _roi_around(points, width, height):
+    """Padded pixel box around all landmarks (frame-normalised coords)."""
+    xs = points[..., 0] * width
+    ys = points[..., 1] * height
+    x0, x1 = float(xs.min()), float(xs.max())
+    y0, y1 = float(ys.min()), float(ys.max())
+    pad = ROI_PADDING * max(x1 - x0, y1 - y0)
+    half = max(ROI_MIN_SIZE / 2, (max(x1 - x0, y1 - y0) + 2 * pad) / 2)
+    cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+    x0 = int(max(0, cx - half))
+    y0 = int(max(0, cy - half))
+    x1 = int(min(width, cx + half))
+    y1 = int(min(height, cy + half))
+    if (x1 - x0) * (y1 - y0) >= width * height * 0.8:
+        return None  # hardly smaller than the frame – not worth the crop
+    return x0, y0, x1, y1
+
+
+def _to_frame_coords(points, roi, width, height):
+    """Map landmarks normalised to the ROI back to frame-normalised coords."""
+    x0, y0, x1, y1 = roi
+    crop_w, crop_h = x1 - x0, y1 - y0
+    points[..., 0] = (x0 + points[..., 0] * crop_w) / width
+    points[..., 1] = (y0 + points[..., 1] * crop_h) / height
+    points[..., 2] *= crop_w / width  # MediaPipe's z uses the same scale as x
+    return points
+
+
+def detect(frame):
     """
-    frame = capture_frame()
-    print("loaded frame")
+    Run MediaPipe on frame, cropped to the tracked ROI when there is one.
+    frame is B, G, R like Picamera2's "RGB888"; MediaPipe gets it as RGB.
+    """
+    global _roi
+    if GESTURE_ENGINE == "classic":
+        import classic_vision  # cached after the first call
+        return classic_vision.detect(frame)
+    hands_model = _hands or load_model()
+    height, width = frame.shape[:2]
+    if _roi is not None:
+        x0, y0, x1, y1 = _roi
+        result = _crop_hands.process(np.ascontiguousarray(frame[y0:y1, x0:x1, ::-1]))
+        hands, points, _ = _analyse(result, _roi, (width, height))
+        if hands:
+            stats["roi"] += 1
+            _roi = _roi_around(points, width, height)
+            return hands
+        stats["roi_lost"] += 1
+        _roi = None
+    stats["full"] += 1
+    hands, points, _ = _analyse(hands_model.process(np.ascontiguousarray(frame[..., ::-1])))
+    if hands and ROI_TRACKING:
+        _roi = _roi_around(points, width, height)
+    return hands
+
+
+# ── Motion gate ───────────────────────────────────────────────
+# A cheap check on a small grayscale copy of each frame. MediaPipe
+# only runs when something moved or a hand is being tracked; a static
+# scene reuses the last answer. The threshold follows the sensor's own
+# noise: an average of the frame-to-frame difference on quiet frames,
+# starting where the threshold is MOTION_MIN_DIFF.
+_NOISE_START = MOTION_MIN_DIFF / MOTION_NOISE_FACTOR
+_prev_gray = None
+_noise = _NOISE_START  # running mean abs difference on frames without motion
+_last_hands = []
+_skipped = 0  # frames gated in a row
+
+
+def _small_gray(frame):
+    """Downsampled integer luma, (h / n, w / n) uint16."""
+    small = frame[::MOTION_DOWNSAMPLE, ::MOTION_DOWNSAMPLE].astype(np.uint16)
+    return (small[..., 0] * 77 + small[..., 1] * 150 + small[..., 2] * 29) >> 8
+
+
+def _moved(frame):
+    """True if frame differs from the previous one by more than the noise floor."""
+    global _prev_gray, _noise
+    gray = _small_gray(frame)
+    prev, _prev_gray = _prev_gray, gray
+    if prev is None or prev.shape != gray.shape:
+        return True
+    diff = float(np.abs(gray.astype(np.int16) - prev.astype(np.int16)).mean())
+    threshold = max(MOTION_MIN_DIFF, _noise * MOTION_NOISE_FACTOR)
+    if diff > threshold:
+        return True
+    _noise = 0.95 * _noise + 0.05 * diff
+    return False
+
+
+def gated_detect(frame):
+    """detect(), skipped for static scenes with no tracked hand."""
+    global _last_hands, _skipped
+    with metrics.span("motion_gate"):
+        moved = _moved(frame)
+    if MOTION_GATE and not moved and _roi is None and _skipped < MOTION_MAX_SKIP:
+        stats["gated"] += 1
+        _skipped += 1
+        return _last_hands
+    stats["processed"] += 1
+    _skipped = 0
+    with metrics.span("inference"):
+        _last_hands = detect(frame)
+    return _last_hands
+
+
+def reset():
+    """Forget the tracked ROI and the motion gate's history: the scene may have changed."""
+    global _roi, _prev_gray, _noise, _last_hands, _skipped
+    _roi = _prev_gray = None
+    _noise = _NOISE_START
+    _last_hands = []
+    _skipped = 0
+
+
+def next_frame():
+    """
+    Newest camera frame. With the shared frame ring this is a zero-copy
+    view into shared memory, valid until the next call; otherwise it
+    falls back to a socket round-trip.
+    """
+    if FRAME_RING_ENABLED:
+        ring = camera_workaround.frame_ring()
+        if ring is not None:
+            got = ring.latest(timeout=FRAME_RING_TIMEOUT)
+            if got is not None:
+                return got[0]
+            camera_workaround.detach_ring()  # stale ring – reattach next time
+    return capture_frame()
+
+
+def get_hands(frame=None):
+    """
+    Capture one frame and return a Hand(fingers, handedness) for every
+    detected hand (up to MAX_HANDS), or an empty list.
+    Pass frame to analyse that instead of capturing (e.g. replay.py).
+    """
+    if frame is None:
+        frame = next_frame()
+    if frame is None:
+        return []
     # frame = cv2.flip(frame, 1) # Don't think this is necessary
-    print("begin processing")
-    result = _hands.process(frame)  # expects RGB
-    print("processend frame")
-    finger_count = None
+    return gated_detect(frame)  # B, G, R as it comes from the camera
 
-    if result.multi_hand_landmarks:
-        for hand_lm in result.multi_hand_landmarks:
-            finger_count = count_fingers(hand_lm)
-    return finger_count
+
+def get_gesture(frame=None):
+    """
+    Capture one frame from the camera and return the detected
+    finger count, or None if no hand is found.
+    With several hands in view this is the first (most confident) one;
+    use get_hands() for two-handed gestures.
+    """
+    hands = get_hands(frame)
+    if not hands:
+        return None
+    return hands[0].fingers
 
 
 # ── Standalone test ───────────────────────────────────────────
@@ -99,8 +318,7 @@ if __name__ == "__main__":
     print("Vision test – hold up fingers. Ctrl+C to stop.")
     try:
         while True:
-            count = get_gesture()
-            if count is not None:
-                print(f"Fingers detected: {count}")
+            for hand in get_hands():
+                print(f"{hand.handedness} hand: {hand.fingers} finger(s)")
     except KeyboardInterrupt:
         print("\nDone.")
@@ -0,0 +1,270 @@
+# ══════════════════════════════════════════════════════════════
+#  vision_workers.py  –  MediaPipe in worker processes, one per core
+#  To benchmark standalone: python vision_workers.py [1 2 3]
+#
+#  With VISION_WORKERS > 0, pipeline.py hands frames to these
+#  processes instead of running MediaPipe on a thread of its own, so
+#  inference never holds main.py's GIL and GPIO / IR handling stays
+#  responsive. Each worker is pinned to one core of VISION_CORES
+#  (os.sched_setaffinity) and builds its own model.
+#
+#  Per worker: a shared-memory slot the frame is copied into, and a
+#  Pipe carrying (seq, captured) in and (seq, hands, captured,
+#  seconds) back – only a few small tuples are pickled per frame.
+#  A worker takes one frame at a time; acquire() hands out an idle
+#  one. Each worker keeps its own ROI / motion-gate state over the
+#  frames it is given; reset() clears it with each worker's next frame.
+#
+#  Workers are spawned, not forked: main.py has threads running (and
+#  maybe a MediaPipe graph) by the time they start, which a fork
+#  would copy mid-flight. A spawned worker imports main.py again (as
+#  __mp_main__), so main.py sets up the hardware in main() only.
+# ══════════════════════════════════════════════════════════════
+
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+import time
+from multiprocessing import connection, shared_memory
+
+import numpy as np
+
+from config import CAMERA_WIDTH, CAMERA_HEIGHT, VISION_WORKERS, VISION_CORES
+
+_FRAME_BYTES = CAMERA_HEIGHT * CAMERA_WIDTH * 3
+
+
+# ── Worker process ────────────────────────────────────────────
+def _serve(index, core, shm_name, conn, gate):
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl+C is for main.py; it stops us
+    if core is not None:
+        try:
+            os.sched_setaffinity(0, {core})
+        except (AttributeError, OSError) as e:
+            print(f"[VISION] Worker {index}: could not pin to core {core}: {e}")
+    import vision
+    vision.warm_up()
+    infer = vision.gated_detect if gate else vision.detect
+    shm = shared_memory.SharedMemory(name=shm_name)
+    conn.send(("ready", os.getpid(), sorted(os.sched_getaffinity(0))))
+    try:
+        while True:
+            try:
+                msg = conn.recv()
+            except EOFError:
+                break  # main.py went away
+            if msg is None:
+                break
+            seq, captured, shape, reset = msg
+            if reset:
+                vision.reset()
+            frame = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+            start = time.perf_counter()
+            hands = infer(frame)
+            del frame
+            conn.send((seq, hands, captured, time.perf_counter() - start))
+    finally:
+        shm.close()
+
+
+# ── Pool ──────────────────────────────────────────────────────
+class _Worker:
+    def __init__(self, index, core, process, conn, shm):
+        self.index = index
+        self.core = core
+        self.process = process
+        self.conn = conn
+        self.shm = shm
+        self.pid = None
+        self.cpus = None      # affinity the worker reported
+        self.ready = False
+        self.alive = True
+        self.frames = 0
+        self.busy = 0.0       # seconds spent in inference
+
+
+class VisionWorkers:
+    def __init__(self, count=VISION_WORKERS, cores=VISION_CORES, gate=True):
+        """gate=False runs MediaPipe on every frame, skipping the motion gate (benchmarks)."""
+        ctx = multiprocessing.get_context("spawn")
+        self._idle = queue.Queue()
+        self._recv_lock = threading.Lock()
+        self._started = None  # time of the first frame sent
+        self._reset = set()   # workers to reset before their next frame
+        self._workers = []
+        for index in range(count):
+            core = cores[index % len(cores)] if cores else None
+            shm = shared_memory.SharedMemory(create=True, size=_FRAME_BYTES)
+            conn, child = ctx.Pipe()
+            process = ctx.Process(
+                target=_serve, args=(index, core, shm.name, child, gate),
+                name=f"vision-{index}", daemon=True,
+            )
+            process.start()
+            child.close()
+            self._workers.append(_Worker(index, core, process, conn, shm))
+        print(f"[VISION] Starting {count} worker(s) on core(s) {[w.core for w in self._workers]}")
+
+    def _receive(self, worker):
+        """Read one message from worker; returns a result tuple or None. Call with _recv_lock held."""
+        try:
+            msg = worker.conn.recv()
+        except (EOFError, OSError):
+            if worker.alive:
+                worker.alive = False
+                print(f"[VISION] Worker {worker.index} exited ({worker.process.exitcode})")
+            return None
+        if msg[0] == "ready":
+            _, worker.pid, worker.cpus = msg
+            worker.ready = True
+            self._idle.put(worker.index)
+            return None
+        seq, hands, captured, seconds = msg
+        worker.frames += 1
+        worker.busy += seconds
+        self._idle.put(worker.index)
+        return seq, hands, captured
+
+    def wait_ready(self, timeout=None):
+        """Block until every worker has built its model (or timeout); returns whether they have."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for worker in self._workers:
+            while worker.alive and not worker.ready:
+                left = None if deadline is None else deadline - time.monotonic()
+                if left is not None and left <= 0:
+                    return False
+                if worker.conn.poll(left):
+                    with self._recv_lock:
+                        self._receive(worker)
+        return all(w.ready for w in self._workers)
+
+    def acquire(self, timeout=None):
+        """Index of an idle worker, waiting up to timeout; None if none came free."""
+        try:
+            return self._idle.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def release(self, index):
+        """Give back an acquired worker without sending it anything."""
+        self._idle.put(index)
+
+    def send(self, index, seq, captured, frame):
+        """Hand frame to an acquired worker; its result comes back from results()."""
+        if frame.nbytes > _FRAME_BYTES:
+            self._idle.put(index)
+            raise ValueError(f"frame {frame.shape} is larger than CAMERA_WIDTH x CAMERA_HEIGHT")
+        worker = self._workers[index]
+        np.copyto(np.ndarray(frame.shape, dtype=np.uint8, buffer=worker.shm.buf), frame)
+        if self._started is None:
+            self._started = time.monotonic()
+        try:
+            self._reset.remove(index)
+            reset = True
+        except KeyError:
+            reset = False
+        worker.conn.send((seq, captured, frame.shape, reset))
+
+    def reset(self):
+        """Have every worker forget its ROI and motion-gate state before its next frame."""
+        self._reset.update(range(len(self._workers)))
+
+    def results(self, timeout=None):
+        """(seq, hands, captured) for every result that arrived within timeout."""
+        live = [w for w in self._workers if w.alive]
+        if not live:
+            time.sleep(timeout or 0)
+            return []
+        ready = connection.wait([w.conn for w in live], timeout)
+        out = []
+        with self._recv_lock:
+            for worker in live:
+                if worker.conn in ready:
+                    result = self._receive(worker)
+                    if result is not None:
+                        out.append(result)
+        return out
+
+    def stats(self):
+        elapsed = time.monotonic() - self._started if self._started else 0.0
+        frames = sum(w.frames for w in self._workers)
+        return {
+            "frames": frames,
+            "fps": round(frames / elapsed, 1) if elapsed else 0.0,
+            "workers": [
+                {
+                    "core": w.core,
+                    "cpus": w.cpus,
+                    "pid": w.pid,
+                    "frames": w.frames,
+                    "infer_ms": round(1000 * w.busy / w.frames, 1) if w.frames else None,
+                    "alive": w.alive,
+                }
+                for w in self._workers
+            ],
+        }
+
+    def stop(self):
+        for worker in self._workers:
+            try:
+                worker.conn.send(None)
+            except OSError:
+                pass
+        for worker in self._workers:
+            worker.process.join(timeout=2)
+            if worker.process.is_alive():
+                worker.process.terminate()
+            worker.conn.close()
+            worker.shm.close()
+            worker.shm.unlink()
+        self._workers = []
+
+
+# ── The pool main.py uses ─────────────────────────────────────
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def start():
+    """The VISION_WORKERS pool, started on first call. Safe from any thread."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = VisionWorkers()
+    return _pool
+
+
+def stop():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.stop()
+            _pool = None
+
+
+# ── Standalone benchmark ──────────────────────────────────────
+if __name__ == "__main__":
+    import sys
+    counts = [int(a) for a in sys.argv[1:]] or [1, 2, 3]
+    rng = np.random.default_rng(0)
+    frames = [rng.integers(0, 256, (CAMERA_HEIGHT, CAMERA_WIDTH, 3), dtype=np.uint8) for _ in range(8)]
+    n = 120
+    print(f"Inference throughput, {n} frames per run:")
+    for count in counts:
+        pool = VisionWorkers(count, gate=False)  # time MediaPipe itself
+        pool.wait_ready()
+        sent = done = 0
+        start_time = time.monotonic()
+        while done < n:
+            while sent < n:
+                index = pool.acquire(timeout=0)
+                if index is None:
+                    break
+                pool.send(index, sent, 0.0, frames[sent % len(frames)])
+                sent += 1
+            done += len(pool.results(timeout=1.0))
+        seconds = time.monotonic() - start_time
+        print(f"  {count} worker(s): {n / seconds:6.1f} fps   {pool.stats()['workers']}")
+        pool.stop()
@@ -0,0 +1,92 @@
+# ══════════════════════════════════════════════════════════════
+#  warmup.py  –  get the camera and hand model hot before the first wake
+#  Started by main.py right after boot. Two jobs run side by side:
+#    camera – start camera_server.py (which opens the sensor, from
+#             the cached exposure if there is one) and pull a frame
+#    model  – build the MediaPipe model and run it on a blank frame,
+#             so its one-off first-inference cost is paid now (in
+#             every vision worker process, with VISION_WORKERS)
+#
+#  The state goes COLD → WARMING → READY; subscribe() to hear about
+#  each change (main.py shows it on the LED). A job that fails is
+#  reported and the state still becomes READY – the first real use
+#  will retry it and report the error properly.
+# ══════════════════════════════════════════════════════════════
+
+import threading
+
+import boot
+import camera_workaround
+import vision
+import vision_workers
+from config import VISION_WORKERS
+
+COLD, WARMING, READY = "cold", "warming", "ready"
+
+state = COLD
+_ready = threading.Event()
+_listeners = []
+_lock = threading.Lock()
+
+
+def subscribe(callback):
+    """callback(state) on every change, from the warm-up thread."""
+    _listeners.append(callback)
+
+
+def _set(new):
+    global state
+    state = new
+    print(f"[WARMUP] {new}")
+    for callback in _listeners:
+        callback(new)
+
+
+def is_ready():
+    return _ready.is_set()
+
+
+def wait(timeout=None):
+    """Block until READY (or timeout); returns whether it is."""
+    return _ready.wait(timeout)
+
+
+def _camera():
+    with boot.step("warmup.camera"):
+        if camera_workaround.capture_frame() is None:
+            raise RuntimeError("no frame from the camera server")
+
+
+def _model():
+    with boot.step("warmup.model"):
+        if VISION_WORKERS:
+            if not vision_workers.start().wait_ready():
+                raise RuntimeError("a vision worker died while loading the model")
+        else:
+            vision.warm_up()
+
+
+def _job(fn, name):
+    try:
+        fn()
+    except Exception as e:
+        print(f"[WARMUP] {name} failed: {e}")
+
+
+def run():
+    """Warm both up, in parallel; returns once READY. Only the first call does anything."""
+    with _lock:
+        if state != COLD:
+            return
+        _set(WARMING)
+    camera = threading.Thread(target=_job, args=(_camera, "camera"), name="warmup-camera", daemon=True)
+    camera.start()
+    _job(_model, "model")
+    camera.join()
+    _ready.set()
+    _set(READY)
+
+
+def start():
+    """run() on a background thread."""
+    threading.Thread(target=run, name="warmup", daemon=True).start()
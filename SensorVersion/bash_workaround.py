@@ -1,12 +1,12 @@
 import subprocess
 import threading
-import time
+import clock
 _capture_thread = None
 _last_capture = 0
 
 def capture_picture():
     global _capture_thread, _last_capture
-    now = time.time()
+    now = clock.time()
     if now - _last_capture < 5:
         return
     if _capture_thread is not None and _capture_thread.is_alive():
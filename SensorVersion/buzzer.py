@@ -1,52 +1,215 @@
 # ══════════════════════════════════════════════════════════════
-#  buzzer.py  –  non-blocking buzzer control
+#  buzzer.py  –  buzzer sequencer: beeps, tones and melodies
 #  To test standalone: python buzzer.py
 #
-#  FIX: beep() now runs in a background thread so it never
-#  blocks the main loop while buzzing.
+#  One worker thread, started at import, owns BUZZER_PIN. Every
+#  sound – a beep, a tone, a melody – is a list of notes put on a
+#  short queue, so callers never block and two sounds never fight
+#  over the pin.
+#
+#  Notes are (frequency, seconds): a frequency in Hz plays a PWM
+#  tone, None drives the pin plainly high (the old on/off beep) and
+#  0 is a rest. Each note ends at a deadline counted from the start
+#  of the sound, so late wake-ups don't add up over a melody.
+#
+#  Rules:
+#    priority – the queue plays highest priority first; a sound of
+#               higher priority than the one playing cuts it off
+#               (it is dropped, not resumed)
+#    overflow – at most BUZZER_QUEUE sounds wait; a new one is
+#               dropped when the queue is full, unless it outranks
+#               a waiting one, which is dropped instead
 # ══════════════════════════════════════════════════════════════
 
 import gpio_manager  # ensures GPIO.setmode is called first
-import RPi.GPIO as GPIO
-import time
+import clock
+import heapq
+import itertools
 import threading
-from config import BUZZER_PIN, BUZZER_DURATION
+from collections import Counter, namedtuple
+from hal import GPIO
+from config import BUZZER_PIN, BUZZER_DURATION, BUZZER_DUTY, BUZZER_QUEUE, BUZZER_TEMPO, PWM_FREQ
 
 GPIO.setup(BUZZER_PIN, GPIO.OUT)
 GPIO.output(BUZZER_PIN, GPIO.LOW)
+_pwm = GPIO.PWM(BUZZER_PIN, PWM_FREQ)  # only one PWM per pin – made once, here
 
-def _do_beep(duration):
-    """Internal: runs in a background thread to avoid blocking."""
-    GPIO.output(BUZZER_PIN, GPIO.HIGH)
-    time.sleep(duration)
-    GPIO.output(BUZZER_PIN, GPIO.LOW)
+LOW, NORMAL, ALERT = 0, 1, 2  # priorities
+
+Sound = namedtuple("Sound", "name notes priority")
+
+# ── Notes ─────────────────────────────────────────────────────
+_SEMITONES = {"C": -9, "D": -7, "E": -5, "F": -4, "G": -2, "A": 0, "B": 2}
+
+
+def note(name):
+    """Frequency of a note name like "A4", "C#5" or "Bb3"; "R" is a rest (0)."""
+    if name.upper() == "R":
+        return 0
+    letter, rest = name[0].upper(), name[1:]
+    shift = 0
+    while rest and rest[0] in "#b":
+        shift += 1 if rest[0] == "#" else -1
+        rest = rest[1:]
+    semis = _SEMITONES[letter] + shift + 12 * (int(rest) - 4)
+    return round(440.0 * 2 ** (semis / 12), 1)
+
+
+# Melodies are (note name, beats) at BUZZER_TEMPO unless told otherwise
+MELODIES = {
+    "startup": (("C5", 0.5), ("E5", 0.5), ("G5", 1)),
+    "ready":   (("G5", 0.5), ("C6", 1)),
+    "shutter": (("E6", 0.25), ("R", 0.125), ("E6", 0.25)),
+    "error":   (("A4", 1), ("R", 0.5), ("F4", 2)),
+}
+
+
+# ── Sequencer ─────────────────────────────────────────────────
+_cond    = threading.Condition()
+_queue   = []     # heap of (-priority, order, Sound)
+_order   = itertools.count()
+_playing = None   # Sound on the pin now
+_cut     = False  # set to end _playing early
+_tone    = 0      # what the pin is doing: frequency, None (high) or 0
+_stats   = Counter()
+
+
+def _sound(freq):
+    """Put the pin into freq (see notes above). Call with _cond held."""
+    global _tone
+    if freq == _tone:
+        return
+    if freq:
+        _pwm.ChangeFrequency(freq)
+        if not _tone:
+            _pwm.start(BUZZER_DUTY)
+    else:
+        if _tone:
+            _pwm.stop()
+        GPIO.output(BUZZER_PIN, GPIO.HIGH if freq is None else GPIO.LOW)
+    _tone = freq
+
+
+def _run():
+    global _playing, _cut
+    with _cond:
+        while True:
+            while not _queue:
+                _cond.wait()
+            _, _, sound = heapq.heappop(_queue)
+            _playing, _cut = sound, False
+            deadline = clock.monotonic()
+            for freq, seconds in sound.notes:
+                _sound(freq)
+                deadline += seconds  # from the start of the sound, not the last wake-up
+                while not _cut:
+                    left = deadline - clock.monotonic()
+                    if left <= 0:
+                        break
+                    _cond.wait(clock.real(left))
+                if _cut:
+                    break
+            _sound(0)
+            _stats["cut" if _cut else "played"] += 1
+            _playing = None
 
-def _do_double_beep():
-    """Internal: two short beeps in a background thread."""
-    _do_beep(0.15)
-    time.sleep(0.1)
-    _do_beep(0.15)
 
-def beep(duration=BUZZER_DURATION):
+threading.Thread(target=_run, name="buzzer", daemon=True).start()
+
+
+def play(notes, priority=NORMAL, name="sound"):
+    """
+    Queue notes – (frequency, seconds) pairs – and return at once.
+    Returns False if the sound was dropped because the queue is full.
+    """
+    global _cut
+    sound = Sound(name, tuple(notes), priority)
+    with _cond:
+        if len(_queue) >= BUZZER_QUEUE:
+            lowest = max(_queue)  # lowest priority, newest of those
+            if -lowest[0] >= priority:
+                _stats["dropped"] += 1
+                print(f"[BUZZER] Queue full, dropped {name}")
+                return False
+            _queue.remove(lowest)
+            heapq.heapify(_queue)
+            _stats["dropped"] += 1
+            print(f"[BUZZER] Queue full, dropped {lowest[2].name}")
+        heapq.heappush(_queue, (-priority, next(_order), sound))
+        if _playing is not None and priority > _playing.priority:
+            _cut = True
+        _cond.notify()
+    return True
+
+
+# ── Sounds ────────────────────────────────────────────────────
+def beep(duration=BUZZER_DURATION, priority=NORMAL):
     """Beep the buzzer without blocking the main loop."""
     print("[BUZZER] Beep!")
-    threading.Thread(target=_do_beep, args=(duration,), daemon=True).start()
+    return play(((None, duration),), priority, "beep")
 
-def double_beep():
+
+def double_beep(priority=NORMAL):
     """Two short beeps without blocking the main loop."""
     print("[BUZZER] Double beep!")
-    threading.Thread(target=_do_double_beep, daemon=True).start()
+    return play(((None, 0.15), (0, 0.1), (None, 0.15)), priority, "double_beep")
+
+
+def tone(freq, duration=BUZZER_DURATION, priority=NORMAL):
+    """One PWM tone at freq Hz (or a note name like "A4")."""
+    if isinstance(freq, str):
+        freq = note(freq)
+    return play(((freq, duration),), priority, f"tone {freq}")
+
+
+def melody(notes, tempo=BUZZER_TEMPO, priority=NORMAL):
+    """
+    Play a melody: a name from MELODIES, or (note, beats) pairs where
+    note is a name like "C5" / "R" or a frequency in Hz.
+    """
+    name = notes if isinstance(notes, str) else "melody"
+    if isinstance(notes, str):
+        notes = MELODIES[notes]
+    beat = 60.0 / tempo
+    return play(
+        [(note(n) if isinstance(n, str) else n, beats * beat) for n, beats in notes],
+        priority, name,
+    )
+
+
+def stop():
+    """Drop everything queued and silence the sound playing now."""
+    global _cut
+    with _cond:
+        _queue.clear()
+        _cut = True
+        _sound(0)
+        _cond.notify()
+
+
+def stats():
+    """played / cut / dropped counts, and how many sounds wait now."""
+    with _cond:
+        return dict(_stats, queued=len(_queue))
+
 
 def cleanup():
     """Ensure buzzer is off on exit. gpio_manager handles GPIO.cleanup()."""
+    stop()
     GPIO.output(BUZZER_PIN, GPIO.LOW)
 
 # ── Standalone test ───────────────────────────────────────────
 if __name__ == "__main__":
-    print("Buzzer test – single beep then double beep.")
+    print("Buzzer test – beep, double beep, melodies, then an alert cutting one off.")
     beep()
-    time.sleep(1)
     double_beep()
-    time.sleep(1)  # wait for threads to finish before cleanup
+    for name in MELODIES:
+        melody(name)
+    clock.sleep(6)
+    melody("startup", tempo=40)
+    clock.sleep(0.5)
+    beep(0.5, priority=ALERT)  # cuts the slow melody short
+    clock.sleep(1)
+    print(f"[BUZZER] {stats()}")
     cleanup()
     gpio_manager.cleanup()
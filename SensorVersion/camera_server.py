@@ -0,0 +1,271 @@
+# ══════════════════════════════════════════════════════════════
+#  camera_server.py  –  long-lived camera process
+#  Keeps one Camera open and serves frames, stills and status over
+#  a Unix socket (see camera_protocol.py), so a capture costs a
+#  socket round-trip instead of a python + Picamera2 cold start.
+#  Every photo it takes goes through photo_store.py.
+#
+#  Must run under the system python where picamera2 is installed.
+#  camera_workaround.py starts it on demand; to run it by hand:
+#      /usr/bin/python3 camera_server.py
+# ══════════════════════════════════════════════════════════════
+
+import json
+import os
+import signal
+import socket
+import socketserver
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import numpy as np
+
+import camera_protocol as proto
+import clock
+from camera import Camera, save_jpeg
+from photo_store import PhotoStore
+from config import CAMERA_SOCKET, JPEG_WORKERS, BURST_MAX
+
+_cam         = None
+_cam_lock    = threading.Lock()  # Picamera2 is not safe to drive from two threads
+_started     = time.time()
+_frames      = 0
+_pictures    = 0
+
+
+def _frame():
+    global _frames
+    with _cam_lock:
+        frame = _cam.capture_frame()
+        _frames += 1
+    frame = np.ascontiguousarray(frame)  # no-op unless the sensor pads rows
+    return proto.SHAPE.pack(*frame.shape), frame
+
+
+def _picture(name):
+    """One still into the photo store; name "" = timestamped."""
+    name = name or datetime.now().strftime("photo_%Y%m%d_%H%M%S_%f.jpg")
+    return _submit(_grab(), name).result().encode()
+
+
+# ── Burst / interval stills ───────────────────────────────────
+# Frames come straight off the open camera at the requested pace and
+# are JPEG-encoded on a small pool, so a burst runs as fast as the
+# sensor delivers rather than waiting on each encode in turn.
+_store         = None  # PhotoStore, opened by serve()
+_encoder       = ThreadPoolExecutor(max_workers=JPEG_WORKERS, thread_name_prefix="jpeg")
+_encoding      = 0     # frames handed to _encoder and not yet written
+_count_lock    = threading.Lock()
+_encoded       = threading.Condition(_count_lock)  # notified as _encoding drops
+_MAX_ENCODING  = 2 * JPEG_WORKERS  # frames waiting for the encoder, at most
+_interval      = None  # {"interval"} while interval mode runs
+_interval_lock = threading.Lock()
+_interval_stop = threading.Event()
+_interval_thread  = None
+_interval_dropped = 0  # interval shots skipped because encoding fell behind
+
+
+def _grab():
+    global _frames
+    with _cam_lock:
+        frame = _cam.capture_frame()  # a fresh array, safe to hand to another thread
+        _frames += 1
+    return frame
+
+
+def _encode(frame, name):
+    """JPEG-encode frame into the photo store; returns the saved path."""
+    global _encoding, _pictures
+    try:
+        path = _store.save(name, lambda f: save_jpeg(frame, f))
+        with _count_lock:
+            _pictures += 1
+        return path
+    finally:
+        with _encoded:
+            _encoding -= 1
+            _encoded.notify_all()
+
+
+def _submit(frame, name):
+    global _encoding
+    with _count_lock:
+        _encoding += 1
+    return _encoder.submit(_encode, frame, name)
+
+
+def _burst(request):
+    count     = int(request.get("count", 1))
+    interval  = float(request.get("interval") or 0.0)
+    if count < 1:
+        raise ValueError(f"burst count must be at least 1, got {count}")
+    count = min(count, BURST_MAX)
+    stamp = datetime.now().strftime("burst_%Y%m%d_%H%M%S_%f")
+    futures  = []
+    next_due = clock.monotonic()
+    for i in range(count):
+        if i:
+            next_due += interval
+            clock.sleep(max(0.0, next_due - clock.monotonic()))
+        with _encoded:
+            while _encoding >= _MAX_ENCODING:
+                _encoded.wait()  # the encoder is behind – don't hold more frames
+        futures.append(_submit(_grab(), f"{stamp}_{i:02d}.jpg"))
+    return json.dumps([f.result() for f in futures]).encode()
+
+
+def _interval_loop(seconds, stop):
+    global _interval_dropped
+    shot     = 0
+    next_due = clock.monotonic()
+    while not stop.is_set():
+        if _encoding >= _MAX_ENCODING:
+            _interval_dropped += 1  # skip a shot rather than queue frames without bound
+        else:
+            stamp = datetime.now().strftime("photo_%Y%m%d_%H%M%S")
+            _submit(_grab(), f"{stamp}_{shot:05d}.jpg")
+            shot += 1
+        next_due += seconds
+        delay = next_due - clock.monotonic()
+        if delay < 0:
+            next_due, delay = clock.monotonic(), 0.0  # fell behind – don't try to catch up
+        stop.wait(clock.real(delay))
+
+
+def _set_interval(request):
+    """Start, replace or (interval null) stop interval mode; returns the new state."""
+    global _interval, _interval_thread, _interval_stop
+    with _interval_lock:
+        if _interval_thread is not None:
+            _interval_stop.set()
+            _interval_thread.join()
+            _interval_thread, _interval = None, None
+        seconds = request.get("interval")
+        if seconds:
+            _interval_stop = threading.Event()
+            _interval = {"interval": float(seconds)}
+            _interval_thread = threading.Thread(
+                target=_interval_loop, args=(float(seconds), _interval_stop),
+                name="interval", daemon=True,
+            )
+            _interval_thread.start()
+        return json.dumps(_interval).encode()
+
+
+def _suspend():
+    """Stop the sensor streaming unless interval mode needs it; returns whether it stopped."""
+    with _interval_lock, _cam_lock:
+        if _interval is None:
+            _cam.suspend()
+        return json.dumps(_cam.suspended).encode()
+
+
+def _resume():
+    with _cam_lock:
+        _cam.resume()
+
+
+def _status():
+    return json.dumps({
+        "pid":      os.getpid(),
+        "uptime":   round(time.time() - _started, 1),
+        "frames":   _frames,
+        "pictures": _pictures,
+        "encoding": _encoding,
+        "interval": _interval,
+        "suspended": _cam.suspended,
+        "interval_dropped": _interval_dropped,
+        "store":    _store.stats(),
+    }).encode()
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    """One connection = one client; it may send any number of requests."""
+
+    def handle(self):
+        sock = self.request
+        while True:
+            try:
+                code, payload = proto.recv_msg(sock)
+            except ConnectionError:
+                return
+            try:
+                if code == proto.FRAME:
+                    shape, frame = _frame()
+                    proto.send_msg(sock, proto.OK, shape, frame)
+                elif code == proto.PICTURE:
+                    proto.send_msg(sock, proto.OK, _picture(payload.decode()))
+                elif code == proto.BURST:
+                    proto.send_msg(sock, proto.OK, _burst(json.loads(payload)))
+                elif code == proto.INTERVAL:
+                    proto.send_msg(sock, proto.OK, _set_interval(json.loads(payload)))
+                elif code == proto.LIST:
+                    proto.send_msg(sock, proto.OK, json.dumps(_store.photos()).encode())
+                elif code == proto.SUSPEND:
+                    proto.send_msg(sock, proto.OK, _suspend())
+                elif code == proto.RESUME:
+                    _resume()
+                    proto.send_msg(sock, proto.OK)
+                elif code == proto.STATUS:
+                    proto.send_msg(sock, proto.OK, _status())
+                else:
+                    proto.send_msg(sock, proto.ERR, f"unknown command {code!r}".encode())
+            except (BrokenPipeError, ConnectionError):
+                return
+            except Exception as e:
+                print(f"[CAMSRV] Error: {e}")
+                proto.send_msg(sock, proto.ERR, str(e).encode())
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def _already_serving(path):
+    """True if a live server answers on path – a socket file left by a crash doesn't."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+def _on_sigterm(signum, frame):
+    raise KeyboardInterrupt  # same clean shutdown as Ctrl+C
+
+
+def serve(path=CAMERA_SOCKET):
+    global _cam, _store
+    if _already_serving(path):
+        print(f"[CAMSRV] A camera server is already listening on {path} – exiting.")
+        return
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, _on_sigterm)
+    _cam = Camera()
+    _store = PhotoStore()
+    if os.path.exists(path):
+        os.unlink(path)  # nobody answers on it: left behind by a crashed run
+    server = _Server(path, _Handler)
+    print(f"[CAMSRV] Camera open, listening on {path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        _set_interval({})
+        _encoder.shutdown(wait=True)
+        _store.close()  # last fsync batch
+        if os.path.exists(path):
+            os.unlink(path)
+        _cam.stop()
+        print("[CAMSRV] Stopped.")
+
+
+if __name__ == "__main__":
+    serve()
@@ -1,11 +1,28 @@
 import subprocess
+import socket
+import json
 import time
 import threading
 import datetime
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 import os
+import sys
 
-_capture_thread = None  # track thread directly instead of a boolean flag
+import camera_protocol as proto
+import hal
+import metrics
+from config import (
+    CAMERA_SOCKET, CAMERA_SERVER_TIMEOUT,
+    BURST_COUNT, BURST_INTERVAL, PHOTO_INTERVAL,
+)
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+
+_photo_queue    = ThreadPoolExecutor(max_workers=1, thread_name_prefix="photo")  # stills wait their turn
+_server_proc    = None  # camera_server.py we spawned, if any
+_sock           = None  # one persistent connection per process
+_sock_lock      = threading.Lock()  # one request in flight at a time
 
 def _clean_env():
     env = {
@@ -16,110 +33,170 @@ def _clean_env():
     env["PATH"] = "/usr/bin:/bin"
     return env
 
-def capture_frame():
-    result = subprocess.run(
-        ["python3", "camera.py"], capture_output=True, env=_clean_env()
+def _start_server():
+    """
+    Spawn camera_server.py, once per process: under the system python
+    on the Pi (that's where Picamera2 is), under ours in simulation.
+    """
+    global _server_proc
+    if _server_proc is not None and _server_proc.poll() is None:
+        return
+    print("[CAM] Starting camera server...")
+    if hal.SIMULATED:
+        python, env = sys.executable, None  # the fakes need our numpy, not the system's
+    else:
+        python, env = "python3", _clean_env()
+    _server_proc = subprocess.Popen(
+        [python, os.path.join(_HERE, "camera_server.py")],
+        cwd=_HERE,
+        env=env,
     )
-    if result.returncode != 0:
-        print("Camera error:", result.stderr.decode())
+
+def _connect():
+    """Connect to the camera server, starting it if nobody is listening."""
+    deadline = time.time() + CAMERA_SERVER_TIMEOUT
+    spawned  = False
+    while True:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(CAMERA_SOCKET)
+            sock.settimeout(CAMERA_SERVER_TIMEOUT)
+            return sock
+        except (FileNotFoundError, ConnectionRefusedError):
+            sock.close()
+            if time.time() > deadline:
+                raise TimeoutError("camera server did not come up")
+            if not spawned:
+                _start_server()
+                spawned = True
+            time.sleep(0.1)
+
+def _request(code, payload=b"", timeout=CAMERA_SERVER_TIMEOUT):
+    """Send one request and return the reply payload. Reconnects once on failure."""
+    global _sock
+    with _sock_lock:
+        for attempt in range(2):
+            if _sock is None:
+                _sock = _connect()
+            try:
+                _sock.settimeout(timeout)
+                proto.send_msg(_sock, code, payload)
+                reply_code, reply = proto.recv_msg(_sock)
+                break
+            except OSError:  # hang-up or timeout – the stream is out of sync
+                _sock.close()
+                _sock = None
+                if attempt:
+                    raise
+    if reply_code != proto.OK:
+        raise RuntimeError(reply.decode())
+    return reply
+
+def capture_frame():
+    try:
+        with metrics.span("capture"):
+            reply = _request(proto.FRAME)
+    except Exception as e:
+        print("Camera error:", e)
         return None
-    shape = np.frombuffer(result.stdout[:12], dtype=np.int32)
-    frame = np.frombuffer(result.stdout[12:], dtype=np.uint8).reshape(shape)
+    with metrics.span("frame_decode"):
+        shape = proto.SHAPE.unpack_from(reply)
+        frame = np.frombuffer(reply, dtype=np.uint8, offset=proto.SHAPE.size).reshape(shape)
     return frame
 
-def _do_capture(output_path):
+def status():
+    """Return the camera server's status dict, or None if it can't be reached."""
     try:
-        subprocess.run(
-            ["python3", "camera.py", "--save", output_path],
-            env=_clean_env(),
-            capture_output=True,  # prevents stdout blocking the thread
-            timeout=30
-        )
-        print(f"[CAM] Saved {output_path}")
-    except subprocess.TimeoutExpired:
-        print("[CAM] Timed out.")
+        return json.loads(_request(proto.STATUS))
     except Exception as e:
-        print(f"[CAM] Error: {e}")
+        print("Camera error:", e)
+        return None
 
-def capture_picture():
-    global _capture_thread
-    if _capture_thread is not None and _capture_thread.is_alive():
-        print("[CAM] Already capturing, skipping.")
-        return
-    output_path = datetime.datetime.now().strftime("photo_%Y%m%d_%H%M%S.jpg")
-    print(f"[CAM] Capturing to {output_path}")
-    _capture_thread = threading.Thread(target=_do_capture, args=(output_path,), daemon=True)
-    _capture_thread.start()
+def capture_burst(count=BURST_COUNT, interval=BURST_INTERVAL):
+    """
+    Take count stills interval seconds apart on the server's open
+    camera. Blocks until all are written; returns their paths ([] on error).
+    """
+    request = json.dumps({"count": count, "interval": interval}).encode()
+    try:
+        with metrics.span("burst"):
+            reply = _request(proto.BURST, request, CAMERA_SERVER_TIMEOUT + count * interval)
+    except Exception as e:
+        print(f"[CAM] Burst error: {e}")
+        return []
+    paths = json.loads(reply)
+    print(f"[CAM] Saved {len(paths)} photo(s)")
+    return paths
 
-if __name__ == "__main__":
-    start_time = time.time()
-    result = capture_frame()
-    print(f"Frame capture took {time.time() - start_time:.2f}s")
-
-    start_time = time.time()
-    capture_picture()
-    time.sleep(5)  # wait for background thread in test
-    print(f"Picture capture took {time.time() - start_time:.2f}s")
-import subprocess
-import time
-import threading
-import datetime
-import numpy as np
-import os
+def start_interval(interval=PHOTO_INTERVAL):
+    """Have the server take a photo every interval seconds until stop_interval()."""
+    try:
+        state = json.loads(_request(proto.INTERVAL, json.dumps({"interval": interval}).encode()))
+    except Exception as e:
+        print(f"[CAM] Interval error: {e}")
+        return None
+    if state:
+        print(f"[CAM] Photo every {state['interval']:g}s")
+    return state
 
-_capture_thread = None  # track thread directly instead of a boolean flag
+def stop_interval():
+    return start_interval(None)
 
-def _clean_env():
-    env = {
-        k: v
-        for k, v in os.environ.items()
-        if k not in ("PYTHONPATH", "VIRTUAL_ENV", "PATH")
-    }
-    env["PATH"] = "/usr/bin:/bin"
-    return env
+def list_photos():
+    """The server's stored photos, oldest first ([] on error)."""
+    try:
+        return json.loads(_request(proto.LIST))
+    except Exception as e:
+        print(f"[CAM] List error: {e}")
+        return []
 
-def capture_frame():
-    result = subprocess.run(
-        ["python3", "camera.py"], capture_output=True, env=_clean_env()
-    )
-    if result.returncode != 0:
-        print("Camera error:", result.stderr.decode())
-        return None
-    shape = np.frombuffer(result.stdout[:12], dtype=np.int32)
-    frame = np.frombuffer(result.stdout[12:], dtype=np.uint8).reshape(shape)
-    return frame
+def suspend():
+    """
+    Stop the camera streaming to save power; the next capture (or
+    resume()) starts it again. Does nothing if this process hasn't
+    used the camera server – it is not started just to be stopped.
+    Returns whether the camera is suspended.
+    """
+    if _sock is None:
+        return False
+    try:
+        return json.loads(_request(proto.SUSPEND))
+    except Exception as e:
+        print(f"[CAM] Suspend error: {e}")
+        return False
+
+def resume():
+    """Start a suspended camera streaming again, ahead of the next capture."""
+    if _sock is None:
+        return
+    try:
+        _request(proto.RESUME)
+    except Exception as e:
+        print(f"[CAM] Resume error: {e}")
 
-def _do_capture(output_path):
+def _do_capture(name):
     try:
-        subprocess.run(
-            ["python3", "camera.py", "--save", output_path],
-            env=_clean_env(),
-            capture_output=True,  # prevents stdout blocking the thread
-            timeout=10
-        )
-        print(f"[CAM] Saved {output_path}")
-    except subprocess.TimeoutExpired:
+        with metrics.span("picture"):
+            saved = _request(proto.PICTURE, name.encode()).decode()
+        print(f"[CAM] Saved {saved}")
+    except TimeoutError:
         print("[CAM] Timed out.")
     except Exception as e:
         print(f"[CAM] Error: {e}")
 
 def capture_picture():
-    global _capture_thread
-    if _capture_thread is not None and _capture_thread.is_alive():
-        print("[CAM] Already capturing, skipping.")
-        return
-    output_path = datetime.datetime.now().strftime("photo_%Y%m%d_%H%M%S.jpg")
-    print(f"[CAM] Capturing to {output_path}")
-    _capture_thread = threading.Thread(target=_do_capture, args=(output_path,), daemon=True)
-    _capture_thread.start()
+    """Queue one timestamped still and return at once (a Future)."""
+    name = datetime.datetime.now().strftime("photo_%Y%m%d_%H%M%S_%f.jpg")
+    print(f"[CAM] Capturing {name}")
+    return _photo_queue.submit(_do_capture, name)
 
 if __name__ == "__main__":
-    start_time = time.time()
-    result = capture_frame()
-    print(f"Frame capture took {time.time() - start_time:.2f}s")
-
-    start_time = time.time()
-    capture_picture()
-    time.sleep(5)  # wait for background thread in test
-    print(f"Picture capture took {time.time() - start_time:.2f}s")
-
+    metrics.enable()
+    with metrics.span("first_frame"):  # includes starting the server
+        capture_frame()
+    for _ in range(10):
+        capture_frame()
+    capture_picture().result()
+    capture_burst()
+    print(metrics.report())
+    print(f"Server status: {status()}")
@@ -16,16 +16,75 @@ DOUBLE_TAP_WINDOW = 0.5
 # Minimum time (seconds) between IR toggles to prevent rapid re-triggering
 IR_COOLDOWN       = 1.0
 
+# Idle governor (idle.py): quiet seconds (no IR or touch edge) before
+# the device steps down to "idle" (OLED dimmed, refreshed less often)
+# and "sleep" (OLED off, camera stream stopped). Any edge wakes it.
+IDLE_AFTER        = 30.0
+SLEEP_AFTER       = 300.0
+# OLED refresh interval per state (None = no refreshes, screen off)
+IDLE_TICKS        = {"active": 1.5, "idle": 10.0, "sleep": None}
+
+# Per-pin debounce (seconds) for interrupt-driven edges in gpio_events.py
+IR_DEBOUNCE       = 0.05
+TOUCH_DEBOUNCE    = 0.02
+
 # Photos saved here – folder created automatically if missing
 PHOTO_SAVE_DIR    = "/home/pi/photos"
+# Oldest photos are deleted beyond either limit
+PHOTO_MAX_BYTES   = 512 * 1024 * 1024
+PHOTO_MAX_COUNT   = 2000
+# fsync new photos once this many are waiting or this many seconds passed
+PHOTO_FSYNC_BATCH    = 8
+PHOTO_FSYNC_INTERVAL = 2.0
+# Thumbnails (PHOTO_SAVE_DIR/thumbs) fit in this box
+THUMB_SIZE        = (80, 60)
+
+# Photos per double tap (1 = a single shot) and the gap between them
+BURST_COUNT       = 1
+BURST_INTERVAL    = 0.2
+BURST_MAX         = 10  # the camera server takes at most this many per burst
+# Also take a photo every N seconds while running (None = off)
+PHOTO_INTERVAL    = None
+# Threads encoding JPEGs in camera_server.py
+JPEG_WORKERS      = 2
+
+# Actions (actions.py / tap_map.py): worker threads, and the seconds
+# after one trigger before the same action can fire again
+ACTION_WORKERS    = 2
+IR_TOGGLE_GAP     = 0.5   # ignore IR entries closer together than this
+PHOTO_COOLDOWN    = 0.0   # a double tap during a burst is dropped anyway
 
 # Buzzer beep duration in seconds
 BUZZER_DURATION   = 0.3
+# buzzer.py: PWM duty (0–100) for tones, sounds allowed to wait, and
+# beats per minute for melodies
+BUZZER_DUTY       = 50
+BUZZER_QUEUE      = 4
+BUZZER_TEMPO      = 120
 
 LED_RED = 16
 LED_GREEN = 20
 LED_BLUE = 21
+# Effects in led.py step their tables this often (50 Hz)
+LED_TICK = 0.02
 
 CAMERA_WIDTH = 320
 CAMERA_HEIGHT = 240
 JPG_QUALITY = 50
+# Seconds auto-exposure gets to settle on a first-ever start. Later
+# starts begin from the exposure / white balance saved in
+# CAMERA_SETTINGS_FILE (next to camera.py) and skip the wait.
+CAMERA_SETTLE         = 0.5
+CAMERA_SETTINGS_FILE  = "camera_settings.json"
+CAMERA_LOCK_EXPOSURE  = False  # True = keep the saved values instead of adapting
+
+# Persistent camera server (camera_server.py) – clients talk to it here
+CAMERA_SOCKET         = "/tmp/bootleg_camera.sock"
+# Seconds to wait for a freshly spawned camera server to start listening
+CAMERA_SERVER_TIMEOUT = 10.0
+
+# Per-stage latency histograms (metrics.py), written next to main.py /
+# main.log every METRICS_INTERVAL seconds. Off = close to zero overhead.
+METRICS_ENABLED       = False
+METRICS_FILE          = "metrics.json"
+METRICS_INTERVAL      = 60.0
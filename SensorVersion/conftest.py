@@ -0,0 +1,21 @@
+# ══════════════════════════════════════════════════════════════
+#  conftest.py  –  pytest setup: the simulated HAL and shared fixtures
+#  Run from this folder: python -m pytest -q
+# ══════════════════════════════════════════════════════════════
+
+import os
+
+os.environ.setdefault("BOOTLEG_HAL", "sim")  # before anything imports hal
+
+import pytest
+
+import clock
+
+
+@pytest.fixture
+def vclock():
+    """A stepped VirtualClock for every module; time only moves on advance()."""
+    virtual = clock.VirtualClock(speed=None)
+    clock.install(virtual)
+    yield virtual
+    clock.install(clock.RealClock())
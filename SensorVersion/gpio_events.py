@@ -0,0 +1,139 @@
+# ══════════════════════════════════════════════════════════════
+#  gpio_events.py  –  interrupt-driven GPIO edges as typed events
+#  RPi.GPIO calls us back on every edge; we timestamp it, debounce
+#  it per pin and push an Event onto one thread-safe queue, so the
+#  main loop can block in get() instead of polling every 10 ms.
+# ══════════════════════════════════════════════════════════════
+
+import gpio_manager  # ensures GPIO.setmode is called first
+from hal import GPIO
+import clock
+import input_trace
+import queue
+from collections import namedtuple
+
+# ── Event kinds ───────────────────────────────────────────────
+IR_ENTER   = "IR_ENTER"    # something moved in front of the IR sensor
+IR_LEAVE   = "IR_LEAVE"    # ...and went away again
+TOUCH_DOWN = "TOUCH_DOWN"
+TOUCH_UP   = "TOUCH_UP"
+
+# kind  = one of the constants above
+# pin   = BCM pin number the edge came from
+# timestamp = clock.monotonic() when the edge was seen
+Event = namedtuple("Event", "kind pin timestamp")
+
+# ── Internal state ────────────────────────────────────────────
+class _Pin:
+    """Per-pin edge bookkeeping."""
+
+    def __init__(self, active_kind, inactive_kind, active_level, debounce, active):
+        self.active_kind   = active_kind
+        self.inactive_kind = inactive_kind
+        self.active_level  = active_level
+        self.debounce      = debounce
+        self.last_time     = 0.0
+        self.active        = active  # last level we reported
+        self.swallowed     = False   # an edge was debounced away since then
+
+
+_events   = queue.Queue(maxsize=256)
+_watched  = {}    # pin -> _Pin
+_listener = None  # if set, gets every event instead of the queue
+dropped   = 0     # events thrown away because nobody drained the queue
+
+
+def _push(kind, pin, timestamp):
+    global dropped
+    if _listener is not None:
+        _listener(Event(kind, pin, timestamp))
+        return
+    try:
+        _events.put_nowait(Event(kind, pin, timestamp))
+    except queue.Full:
+        dropped += 1
+
+
+def _on_edge(pin):
+    """RPi.GPIO callback – runs on the library's event thread, must not block."""
+    now = clock.monotonic()
+    state = _watched.get(pin)
+    if state is None:
+        return
+    level = GPIO.input(pin)
+    input_trace.edge(pin, level, now)  # raw, before debouncing – replay redoes that
+    if now - state.last_time < state.debounce:
+        state.swallowed = True
+        return
+    active = level == state.active_level
+    if active == state.active:
+        if not state.swallowed:
+            return  # spurious edge, level never changed
+        # A whole press (or release) fit inside the debounce window and
+        # we only saw its first edge – report the pair so taps aren't lost.
+        _push(state.active_kind if not active else state.inactive_kind, pin, state.last_time)
+    state.swallowed = False
+    state.last_time = now
+    state.active    = active
+    _push(state.active_kind if active else state.inactive_kind, pin, now)
+
+
+def watch(pin, active_kind, inactive_kind, active_level, debounce=0.0):
+    """
+    Start emitting events for pin. The pin must already be set up as
+    an input. Edges closer than debounce seconds to the last accepted
+    edge on the same pin are ignored.
+    """
+    level = GPIO.input(pin)
+    input_trace.edge(pin, level)  # starting level, so a replay starts from the same state
+    _watched[pin] = _Pin(active_kind, inactive_kind, active_level, debounce, level == active_level)
+    GPIO.add_event_detect(pin, GPIO.BOTH, callback=_on_edge)
+
+
+def unwatch(pin):
+    if _watched.pop(pin, None) is not None:
+        GPIO.remove_event_detect(pin)
+
+
+def subscribe(listener):
+    """
+    Hand every event to listener(event) instead of queueing it, e.g. to
+    forward into an asyncio loop with call_soon_threadsafe. It runs on
+    the GPIO callback thread, so it must be quick. Pass None to go back
+    to the queue.
+    """
+    global _listener
+    _listener = listener
+
+
+def get(timeout=None):
+    """Block until the next event, or return None after timeout seconds."""
+    try:
+        return _events.get(timeout=timeout)
+    except queue.Empty:
+        return None
+
+
+def clear():
+    """Throw away anything still queued."""
+    while True:
+        try:
+            _events.get_nowait()
+        except queue.Empty:
+            return
+
+
+# ── Standalone test ───────────────────────────────────────────
+if __name__ == "__main__":
+    import ir_sensor
+    import touch_sensor
+    print("GPIO event test – wave at the IR sensor or tap. Ctrl+C to stop.")
+    ir_sensor.start_events()
+    touch_sensor.start_events()
+    try:
+        while True:
+            event = get()
+            print(f"{event.timestamp:.3f}  {event.kind:<10} pin {event.pin}")
+    except KeyboardInterrupt:
+        print("\nDone.")
+        gpio_manager.cleanup()
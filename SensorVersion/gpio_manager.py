@@ -4,7 +4,7 @@
 #  which prevents conflicts from multiple setmode/cleanup calls.
 # ══════════════════════════════════════════════════════════════
 
-import RPi.GPIO as GPIO
+from hal import GPIO
 
 GPIO.setmode(GPIO.BCM)
 GPIO.setwarnings(False)
@@ -0,0 +1,110 @@
+# ══════════════════════════════════════════════════════════════
+#  idle.py  –  steps the device down to lower power when nobody is around
+#  main.py reports every input with activity(). After IDLE_AFTER
+#  quiet seconds the governor moves to "idle", after SLEEP_AFTER to
+#  "sleep"; the next activity() goes straight back to "active".
+#
+#  The governor only keeps time. What each state means is up to
+#  main.py, which subscribe()s to the changes: a slower loop tick
+#  (tick(), from IDLE_TICKS), a dimmed or blank OLED, the camera
+#  stream stopped. Time spent in each state is in stats().
+#
+#      governor = IdleGovernor()
+#      governor.subscribe(lambda old, new: ...)
+#      governor.activity()         # on every input edge
+#      governor.update()           # now and then – steps down if quiet
+# ══════════════════════════════════════════════════════════════
+
+import threading
+from collections import Counter
+
+import clock
+from config import IDLE_AFTER, SLEEP_AFTER, IDLE_TICKS
+
+ACTIVE, IDLE, SLEEP = "active", "idle", "sleep"
+STATES = (ACTIVE, IDLE, SLEEP)  # in order of falling power
+
+
+class IdleGovernor:
+    def __init__(self, idle_after=IDLE_AFTER, sleep_after=SLEEP_AFTER, ticks=IDLE_TICKS):
+        self._after = {IDLE: idle_after, SLEEP: sleep_after}
+        self._ticks = ticks
+        self._lock = threading.Lock()
+        self._listeners = []
+        now = clock.monotonic()
+        self.state = ACTIVE
+        self._last = now   # last activity
+        self._since = now  # when self.state began
+        self._time = dict.fromkeys(STATES, 0.0)
+        self._entered = Counter()
+
+    def subscribe(self, callback):
+        """callback(old, new) on every change, from whoever caused it."""
+        self._listeners.append(callback)
+
+    def _switch(self, new, now):
+        """Call with _lock held; returns the (old, new) change."""
+        old = self.state
+        self._time[old] += now - self._since
+        self.state, self._since = new, now
+        self._entered[new] += 1
+        print(f"[IDLE] {old} → {new}")
+        return old, new
+
+    def _notify(self, changes):
+        for old, new in changes:
+            for callback in self._listeners:
+                try:
+                    callback(old, new)
+                except Exception as e:
+                    print(f"[IDLE] {old} → {new} handler failed: {e}")
+
+    def activity(self, at=None):
+        """Something happened (at, default now): back to ACTIVE."""
+        now = clock.monotonic()
+        with self._lock:
+            self._last = max(self._last, now if at is None else at)
+            changes = [self._switch(ACTIVE, now)] if self.state != ACTIVE else []
+        self._notify(changes)
+
+    def update(self):
+        """Step down through the states the quiet time calls for; returns the state."""
+        now = clock.monotonic()
+        changes = []
+        with self._lock:
+            quiet = now - self._last
+            for state in STATES[STATES.index(self.state) + 1:]:
+                if quiet < self._after[state]:
+                    break
+                changes.append(self._switch(state, now))
+        self._notify(changes)
+        return self.state
+
+    def next_change(self):
+        """Seconds until update() would step down next, or None if asleep."""
+        with self._lock:
+            if self.state == SLEEP:
+                return None
+            following = STATES[STATES.index(self.state) + 1]
+            return max(0.0, self._last + self._after[following] - clock.monotonic())
+
+    def tick(self):
+        """The loop interval for the current state (IDLE_TICKS)."""
+        return self._ticks[self.state]
+
+    def stats(self):
+        """Seconds spent in each state so far, and how often each was entered."""
+        with self._lock:
+            seconds = dict(self._time)
+            seconds[self.state] += clock.monotonic() - self._since
+            return {
+                "seconds": {state: round(s, 1) for state, s in seconds.items()},
+                "entered": dict(self._entered),
+            }
+
+    def report(self):
+        """stats() as one log line."""
+        seconds = self.stats()["seconds"]
+        total = sum(seconds.values()) or 1.0
+        parts = [f"{state} {s:.0f} s ({100 * s / total:.0f}%)" for state, s in seconds.items()]
+        return f"[IDLE] {', '.join(parts)}, woke {self._entered[ACTIVE]} time(s)"
@@ -0,0 +1,190 @@
+# ══════════════════════════════════════════════════════════════
+#  input_trace.py  –  record a session's inputs for replay.py
+#  Set BOOTLEG_TRACE=/path/to/dir and run main.py as usual: every
+#  IR / touch pin transition and every camera frame is written to
+#  that directory until the program exits.
+#
+#  Trace layout (all little-endian, times are clock.monotonic()):
+#    meta.json         start time, frame shape / dtype, source
+#    edges.bin         packed (time f8, pin u1, level u1) records
+#    frames.bin        raw frames back to back – memory-mapped on load
+#    frame_times.bin   one f8 capture time per frame
+#  Counts come from the file sizes, so a trace cut short by a crash
+#  or a pulled plug still loads.
+#
+#  Recording edges needs only the standard library; numpy is imported
+#  when the first frame is recorded or a trace is loaded, so the
+#  input path doesn't pay for it at boot.
+# ══════════════════════════════════════════════════════════════
+
+import json
+import os
+import struct
+import threading
+
+import clock
+
+EDGE = struct.Struct("<dBB")
+EDGE_FIELDS = [("time", "<f8"), ("pin", "u1"), ("level", "u1")]  # same bytes, as a numpy dtype
+_TIME = struct.Struct("<d")
+
+
+class Recorder:
+    def __init__(self, path, source=""):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.meta = {
+            "version": 1,
+            "source": source,
+            "start": clock.monotonic(),
+            "wall": clock.time(),
+            "frame_shape": None,
+            "frame_dtype": None,
+        }
+        self.edges = 0
+        self.frames = 0
+        self.skipped_frames = 0  # frames whose shape didn't match the first one
+        self._lock = threading.Lock()
+        self._edge_file = open(os.path.join(path, "edges.bin"), "wb")
+        self._frame_file = open(os.path.join(path, "frames.bin"), "wb")
+        self._time_file = open(os.path.join(path, "frame_times.bin"), "wb")
+        self._write_meta()
+
+    def _write_meta(self):
+        with open(os.path.join(self.path, "meta.json"), "w") as f:
+            json.dump(self.meta, f, indent=2)
+
+    def edge(self, pin, level, timestamp=None):
+        if timestamp is None:
+            timestamp = clock.monotonic()
+        with self._lock:
+            self._edge_file.write(EDGE.pack(timestamp, pin, int(bool(level))))
+            self.edges += 1
+
+    def frame(self, frame, timestamp=None):
+        if timestamp is None:
+            timestamp = clock.monotonic()
+        import numpy as np
+        frame = np.ascontiguousarray(frame)
+        with self._lock:
+            if self.meta["frame_shape"] is None:
+                self.meta["frame_shape"] = list(frame.shape)
+                self.meta["frame_dtype"] = frame.dtype.str
+                self._write_meta()
+            elif list(frame.shape) != self.meta["frame_shape"]:
+                self.skipped_frames += 1
+                return
+            self._frame_file.write(memoryview(frame).cast("B"))
+            self._time_file.write(_TIME.pack(timestamp))
+            self.frames += 1
+
+    def close(self):
+        with self._lock:
+            for f in (self._edge_file, self._frame_file, self._time_file):
+                f.close()
+            self.meta["end"] = clock.monotonic()
+            self._write_meta()
+
+
+# ── Session recorder ──────────────────────────────────────────
+# edge() and frame() are no-ops unless start() found a trace path,
+# so the hooks can stay in the input paths for good.
+_recorder = None
+
+
+def start(path=None, source=""):
+    """Start recording to path (default: $BOOTLEG_TRACE). Returns the Recorder or None."""
+    global _recorder
+    path = path or os.environ.get("BOOTLEG_TRACE")
+    if not path or _recorder is not None:
+        return _recorder
+    _recorder = Recorder(path, source)
+    print(f"[TRACE] Recording to {path}")
+    return _recorder
+
+
+def recording():
+    return _recorder is not None
+
+
+def edge(pin, level, timestamp=None):
+    if _recorder is not None:
+        _recorder.edge(pin, level, timestamp)
+
+
+def frame(frame, timestamp=None):
+    if _recorder is not None:
+        _recorder.frame(frame, timestamp)
+
+
+def stop():
+    global _recorder
+    if _recorder is None:
+        return
+    recorder, _recorder = _recorder, None
+    recorder.close()
+    print(f"[TRACE] {recorder.edges} edges, {recorder.frames} frames → {recorder.path}")
+
+
+# ── Loading ───────────────────────────────────────────────────
+class Trace:
+    """
+    A recorded session. Times are relative to the start of the
+    recording: edges["time"], frame_times and duration are all seconds
+    since start(). frames is a read-only memmap, so opening a long
+    trace costs nothing until frames are actually touched.
+    """
+
+    def __init__(self, path):
+        import numpy as np
+        self.path = path
+        with open(os.path.join(path, "meta.json")) as f:
+            self.meta = json.load(f)
+        start = self.meta["start"]
+
+        self.edges = np.fromfile(os.path.join(path, "edges.bin"), dtype=np.dtype(EDGE_FIELDS))
+        self.edges["time"] -= start
+
+        times = np.fromfile(os.path.join(path, "frame_times.bin"), dtype="<f8")
+        shape = self.meta["frame_shape"]
+        frames_path = os.path.join(path, "frames.bin")
+        if shape and os.path.getsize(frames_path):
+            dtype = np.dtype(self.meta["frame_dtype"])
+            count = min(len(times), os.path.getsize(frames_path) // (dtype.itemsize * int(np.prod(shape))))
+            self.frames = np.memmap(frames_path, dtype=dtype, mode="r", shape=(count, *shape))
+        else:
+            count = 0
+            self.frames = np.empty((0, 0), dtype=np.uint8)
+        self.frame_times = times[:count] - start
+
+        ends = [self.meta.get("end", start) - start]
+        if len(self.edges):
+            ends.append(float(self.edges["time"][-1]))
+        if count:
+            ends.append(float(self.frame_times[-1]))
+        self.duration = max(ends)
+
+    def pin_edges(self, pin):
+        """(times, levels) for one pin."""
+        mine = self.edges[self.edges["pin"] == pin]
+        return mine["time"], mine["level"]
+
+
+def load(path):
+    return Trace(path)
+
+
+def summarize(latencies):
+    """count / p50 / p90 / p99 / max of a list of seconds, in milliseconds."""
+    if not len(latencies):
+        return {"count": 0}
+    import numpy as np
+    ms = np.asarray(latencies) * 1000.0
+    p50, p90, p99 = np.percentile(ms, [50, 90, 99])
+    return {
+        "count": len(ms),
+        "p50": round(float(p50), 1),
+        "p90": round(float(p90), 1),
+        "p99": round(float(p99), 1),
+        "max": round(float(ms.max()), 1),
+    }
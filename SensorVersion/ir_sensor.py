@@ -3,8 +3,9 @@
 #  To test standalone: python ir_sensor.py
 # ══════════════════════════════════════════════════════════════
 
-import RPi.GPIO as GPIO
-from config import IR_SENSOR_PIN
+from hal import GPIO
+import gpio_events
+from config import IR_SENSOR_PIN, IR_DEBOUNCE
 
 GPIO.setmode(GPIO.BCM)
 GPIO.setup(IR_SENSOR_PIN, GPIO.IN)
@@ -17,18 +18,23 @@ def detected():
     """
     return GPIO.input(IR_SENSOR_PIN) == GPIO.LOW
 
+def start_events():
+    """Emit IR_ENTER / IR_LEAVE on the gpio_events queue instead of polling."""
+    gpio_events.watch(IR_SENSOR_PIN, gpio_events.IR_ENTER, gpio_events.IR_LEAVE,
+                      active_level=GPIO.LOW, debounce=IR_DEBOUNCE)
+
 def cleanup():
     GPIO.cleanup()
 
 # ── Standalone test ───────────────────────────────────────────
 if __name__ == "__main__":
-    import time
+    import clock
     print("IR sensor test – wave your hand in front of it. Ctrl+C to stop.")
     try:
         while True:
             state = "DETECTED" if detected() else "clear"
             print(f"\r IR: {state}          ", end="", flush=True)
-            time.sleep(0.1)
+            clock.sleep(0.1)
     except KeyboardInterrupt:
         print("\nDone.")
         cleanup()
@@ -1,55 +1,222 @@
 # ══════════════════════════════════════════════════════════════
 #  main.py  –  entry point, ties all modules together
 #  Run with: python main.py
+#
+#  An asyncio task per input (IR, touch) turns edges into events
+#  and looks them up in tap_map.py; the mapped action goes to the
+#  action executor (actions.py), which runs it on its own workers.
+#  Handling an edge therefore never waits on a slow I2C flush, PIL
+#  render or photo. The OLED refresh is one more task.
+#
+#  Every edge also counts as activity for the idle governor (idle.py):
+#  after a quiet spell the OLED is dimmed and refreshed less often,
+#  later switched off along with the camera stream. The next edge
+#  turns them back on before its own action runs.
+#
+#  Boot order (see boot.py): the IR and touch modules load first and
+#  go live; the LED, OLED stack, buzzer and camera client are then
+#  imported on a background thread. An action that fires before its
+#  module is loaded waits for it on its worker, never on the loop.
 # ══════════════════════════════════════════════════════════════
 
-import time
-import gpio_manager   # must be imported first – sets up GPIO.setmode once
-import led 
-import ir_sensor
-import touch_sensor
-import oled
-import camera_workaround
-import bash_workaround
-def main():
-    print("=== Shoulder Companion – Sensor Mode ===")
-    oled.init()
-    led_on = False
-    last_toggle = 0
-    last_oled = 0
-    try:
-        while True:
-            
-            if (ir_sensor.detected()):
-            # IR sensor: new detection toggles the flashlight
-                now = time.time()
-                if now - last_toggle > 0.5:
-                    if (led_on):
-                        led.off()
-                    else:
-                        led.on()
-                    led_on = not led_on
-                    last_toggle = time.time()
-            # Touch sensor: single = photo, double = buzzer
+import boot  # first, so the startup profile covers every import
+import signal
+from concurrent.futures import ThreadPoolExecutor
+
+asyncio      = boot.load("asyncio")
+clock        = boot.load("clock")
+gpio_manager = boot.load("gpio_manager")  # must be imported first – sets up GPIO.setmode once
+gpio_events  = boot.load("gpio_events")
+input_trace  = boot.load("input_trace")
+metrics      = boot.load("metrics")
+ir_sensor    = boot.load("ir_sensor")
+touch_sensor = boot.load("touch_sensor")
+tap_map      = boot.load("tap_map")
+from actions import ActionExecutor
+from idle import IdleGovernor, ACTIVE, IDLE, SLEEP
+from state_machine import TAP, DOUBLE_TAP
+from config import PHOTO_INTERVAL
+
+# Outputs – imported in the background once the inputs are live
+led               = boot.lazy("led")
+oled              = boot.lazy("oled")
+buzzer            = boot.lazy("buzzer")
+camera_workaround = boot.lazy("camera_workaround")
+OUTPUTS = ("led", "buzzer", "oled", "camera_workaround")  # preload order
+
+# setup / cleanup calls that must not block the loop
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="hw")
+actions   = ActionExecutor()
+governor  = IdleGovernor()  # its tick() is the OLED refresh interval
+
+
+async def _blocking(fn, *args):
+    """Run a blocking hardware call on the pool without stalling the loop."""
+    return await asyncio.get_running_loop().run_in_executor(_executor, fn, *args)
+
+
+async def _loaded(name):
+    """Wait, off the loop, until module name is imported."""
+    await _blocking(boot.load, name)
+
+
+def _trigger(kind, at=None):
+    act = tap_map.TAP_MAP.get(kind)
+    if act is not None:
+        actions.run(act, at)
+
+
+# ── Input tasks ───────────────────────────────────────────────
+async def ir_task(ir_events):
+    """IR sensor: a new detection triggers TAP_MAP[IR_ENTER] (the flashlight)."""
+    while True:
+        event = await ir_events.get()
+        _trigger(event.kind, event.timestamp)  # cooldown counts from the edge itself
+
+
+async def touch_task(touch_events):
+    """Touch sensor: single = TAP_MAP[TAP], double = TAP_MAP[DOUBLE_TAP]."""
+    while True:
+        deadline = touch_sensor.next_deadline()
+        timeout  = None if deadline is None else max(0.0, deadline - clock.monotonic())
+        try:
+            event = await asyncio.wait_for(touch_events.get(), clock.real(timeout))
+        except asyncio.TimeoutError:
+            event = None  # pending single tap expired
+        with metrics.span("debounce"):
             touch_sensor.check(
-                on_single_tap = oled.switch_state,
-                on_double_tap = bash_workaround.capture_picture()
+                on_single_tap = lambda: _trigger(TAP),
+                on_double_tap = lambda: _trigger(DOUBLE_TAP),
+                event         = event,
             )
-            if (time.time() - last_oled) > 1.5:
-                oled.loop()
-                last_oled = time.time()
 
-            time.sleep(0.01)
 
-    except KeyboardInterrupt:
+# ── Power states ──────────────────────────────────────────────
+_OLED_POWER   = {ACTIVE: "on", IDLE: "dim", SLEEP: "off"}
+_power_change = None  # asyncio.Event, set and replaced on every state change
+
+
+def _on_power(old, new):
+    """Idle governor changed state – runs on the event loop, must not block."""
+    global _power_change
+    if boot.loaded("oled"):
+        oled.set_power(_OLED_POWER[new])  # only posts to the OLED worker
+    if boot.loaded("camera_workaround"):
+        if new == SLEEP:
+            _executor.submit(camera_workaround.suspend)
+        elif old == SLEEP:
+            _executor.submit(camera_workaround.resume)  # ready before the next photo
+    _power_change.set()
+    _power_change = asyncio.Event()
+
+
+async def _state_changed(timeout):
+    """Wait up to timeout seconds (None = forever) for the next power state change."""
+    try:
+        await asyncio.wait_for(_power_change.wait(), clock.real(timeout))
+    except asyncio.TimeoutError:
+        pass
+
+
+async def idle_task():
+    """Step the governor down as soon as the quiet time for the next state is up."""
+    while True:
+        governor.update()
+        await _state_changed(governor.next_change())  # None while asleep: until an edge
+
+
+# ── OLED refresh ──────────────────────────────────────────────
+async def oled_task():
+    """Redraw every governor.tick() seconds, counting from the last mode switch."""
+    await _loaded("oled")
+    with boot.step("oled.init"):
+        await _blocking(oled.init)
+    oled.set_power(_OLED_POWER[governor.state])
+    while True:
+        interval, wait = governor.tick(), None  # None = screen off, no refreshes
+        if interval is not None:
+            wait = interval - (clock.monotonic() - oled.last_switch)
+            if wait <= 0:
+                oled.loop()  # only posts to the OLED worker, never blocks
+                wait = interval
+        await _state_changed(wait)
+
+
+def _start_interval():
+    camera_workaround.start_interval()  # on the preload thread, once it's imported
+
+
+# ── Runtime ───────────────────────────────────────────────────
+async def run():
+    global _power_change
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    ir_events, touch_events = asyncio.Queue(), asyncio.Queue()
+
+    _power_change = asyncio.Event()
+    governor.subscribe(_on_power)
+
+    def route(event):
+        governor.activity(event.timestamp)  # wakes the OLED / camera first
+        if event.kind in (gpio_events.IR_ENTER, gpio_events.IR_LEAVE):
+            ir_events.put_nowait(event)
+        else:
+            touch_events.put_nowait(event)
+
+    input_trace.start(source="SensorVersion")  # only if BOOTLEG_TRACE is set
+    metrics.start()                              # only if METRICS_ENABLED
+    with boot.step("start inputs"):
+        gpio_events.subscribe(lambda event: loop.call_soon_threadsafe(route, event))
+        ir_sensor.start_events()
+        touch_sensor.start_events()
+    boot.ready()
+    boot.preload(*OUTPUTS, then=_start_interval if PHOTO_INTERVAL else None)
+
+    tasks = [
+        asyncio.create_task(ir_task(ir_events), name="ir"),
+        asyncio.create_task(touch_task(touch_events), name="touch"),
+        asyncio.create_task(oled_task(), name="oled"),
+        asyncio.create_task(idle_task(), name="idle"),
+    ]
+    try:
+        await stop.wait()
         print("\nStopped.")
     finally:
-        # Each module cleans up its own hardware
-        led.off()
-        # ONE call releases all GPIO pins
-        gpio_manager.cleanup()
-        oled.clear()
-        print("Cleaned up. Goodbye!")
+        await shutdown(tasks)
+
+
+async def shutdown(tasks):
+    """Stop taking input, then let running actions finish, then release hardware."""
+    gpio_events.subscribe(None)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await _blocking(actions.shutdown)  # waiting actions are dropped
+    if PHOTO_INTERVAL and boot.loaded("camera_workaround"):
+        await _blocking(camera_workaround.stop_interval)
+    # Each module cleans up its own hardware – if it got as far as loading
+    if boot.loaded("led"):
+        await _blocking(led.off)
+    if boot.loaded("buzzer"):
+        await _blocking(buzzer.cleanup)
+    if boot.loaded("oled"):
+        await _blocking(oled.cleanup)  # drains the OLED worker, then blanks
+    # ONE call releases all GPIO pins – last, after everyone is done with them
+    gpio_manager.cleanup()
+    input_trace.stop()
+    metrics.stop()
+    _executor.shutdown(wait=True)
+    print(f"[ACTION] {actions.stats()}")
+    print(governor.report())
+    print("Cleaned up. Goodbye!")
+
+
+def main():
+    print("=== Shoulder Companion – Sensor Mode ===")
+    asyncio.run(run())
 
 if __name__ == "__main__":
     main()
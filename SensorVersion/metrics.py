@@ -0,0 +1,205 @@
+# ══════════════════════════════════════════════════════════════
+#  metrics.py  –  per-stage latency histograms
+#  Wrap a stage in a span and its duration lands in a fixed-bucket
+#  histogram:
+#      with metrics.span("inference"):
+#          hands = detect(frame)
+#  or hand over a duration you measured yourself:
+#      metrics.record("i2c_flush", elapsed)
+#
+#  With METRICS_ENABLED = False (the default) span() hands back one
+#  shared do-nothing object and record() returns straight away, so
+#  the calls can stay in hot paths. When enabled, start() writes all
+#  histograms to METRICS_FILE every METRICS_INTERVAL seconds, and
+#  stop() writes them once more on the way out.
+#
+#  Durations use the real monotonic clock, not clock.py: they measure
+#  what work costs, which a sped-up virtual clock would distort.
+# ══════════════════════════════════════════════════════════════
+
+import bisect
+import json
+import os
+import threading
+import time
+
+from config import METRICS_ENABLED, METRICS_FILE, METRICS_INTERVAL
+
+# Upper bucket edges in milliseconds; one more bucket catches the rest
+BUCKETS_MS = (0.1, 0.2, 0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+enabled = METRICS_ENABLED
+
+
+class Histogram:
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def add(self, ms):
+        self.counts[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total += ms
+        if ms < self.min:
+            self.min = ms
+        if ms > self.max:
+            self.max = ms
+
+    def percentile(self, p):
+        """Upper edge of the bucket holding the p-th percentile (capped at max)."""
+        if not self.count:
+            return 0.0
+        rank, seen = p / 100 * self.count, 0
+        for edge, n in zip(BUCKETS_MS, self.counts):
+            seen += n
+            if seen >= rank:
+                return round(min(edge, self.max), 3)
+        return round(self.max, 3)
+
+    def to_dict(self):
+        labels = [f"<={edge:g}" for edge in BUCKETS_MS] + [f">{BUCKETS_MS[-1]:g}"]
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count, 3) if self.count else 0.0,
+            "min_ms": round(self.min, 3) if self.count else 0.0,
+            "max_ms": round(self.max, 3),
+            "p50_ms": self.percentile(50),
+            "p90_ms": self.percentile(90),
+            "p99_ms": self.percentile(99),
+            "buckets_ms": {label: n for label, n in zip(labels, self.counts) if n},
+        }
+
+
+_histograms = {}  # name -> Histogram
+_lock = threading.Lock()
+_started = time.monotonic()
+_dumper = None
+_stop = threading.Event()
+
+
+def record(name, seconds):
+    """Add one duration (seconds) to the histogram called name."""
+    if not enabled:
+        return
+    with _lock:
+        histogram = _histograms.get(name)
+        if histogram is None:
+            histogram = _histograms[name] = Histogram()
+        histogram.add(seconds * 1000.0)
+
+
+class _Span:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.monotonic()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, time.monotonic() - self.start)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name):
+    """Context manager timing its body into the histogram called name."""
+    return _Span(name) if enabled else _NULL_SPAN
+
+
+def enable(flag=True):
+    global enabled
+    enabled = flag
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+
+
+def snapshot():
+    with _lock:
+        spans = {name: h.to_dict() for name, h in sorted(_histograms.items())}
+    return {
+        "updated": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "uptime_s": round(time.monotonic() - _started, 1),
+        "spans": spans,
+    }
+
+
+def report():
+    """The histograms as a small text table."""
+    lines = [f"{'span':16} {'count':>7} {'mean':>8} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8}  (ms)"]
+    for name, s in snapshot()["spans"].items():
+        lines.append(
+            f"{name:16} {s['count']:>7} {s['mean_ms']:>8.2f} {s['p50_ms']:>8g} "
+            f"{s['p90_ms']:>8g} {s['p99_ms']:>8g} {s['max_ms']:>8.2f}"
+        )
+    return "\n".join(lines)
+
+
+# ── Export ────────────────────────────────────────────────────
+def _path():
+    # relative to this file, so it ends up next to main.py / main.log
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), METRICS_FILE)
+
+
+def dump(path=None):
+    """Write snapshot() as JSON, atomically so a reader never sees half a file."""
+    path = path or _path()
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(snapshot(), f, indent=2)
+    os.replace(tmp, path)
+
+
+def _dump_loop():
+    while not _stop.wait(METRICS_INTERVAL):
+        try:
+            dump()
+        except OSError as e:
+            print(f"[METRICS] Could not write {_path()}: {e}")
+
+
+def start():
+    """Dump every METRICS_INTERVAL seconds in the background (if enabled)."""
+    global _dumper
+    if not enabled or _dumper is not None:
+        return
+    _stop.clear()
+    _dumper = threading.Thread(target=_dump_loop, name="metrics", daemon=True)
+    _dumper.start()
+    print(f"[METRICS] Writing latency histograms to {_path()} every {METRICS_INTERVAL:g}s")
+
+
+def stop():
+    """Stop the background dumps and write a final one."""
+    global _dumper
+    if _dumper is None:
+        return
+    _stop.set()
+    _dumper.join()
+    _dumper = None
+    try:
+        dump()
+    except OSError as e:
+        print(f"[METRICS] Could not write {_path()}: {e}")
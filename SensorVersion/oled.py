@@ -7,23 +7,41 @@
 #    OLED GND  -> GND  (Pin 6)
 #    OLED SDA  -> SDA  (Pin 3, GPIO 2)
 #    OLED SCL  -> SCL  (Pin 5, GPIO 3)
+#
+#  After init() a worker thread owns the display. Drawing calls only
+#  post a render request to a one-slot mailbox and return at once; a
+#  newer request replaces one the worker hasn't picked up yet, so a
+#  slow I2C bus never blocks the caller and stale frames are skipped.
+#  set_power() dims the panel or switches it off (the idle governor
+#  in main.py does) the same way, ahead of any pending frame.
 # ══════════════════════════════════════════════════════════════
 
-import board
-import busio
-import adafruit_ssd1306
+from hal import board, busio, adafruit_ssd1306
+from oled_display import DiffDisplay
+import metrics
 from PIL import Image, ImageDraw, ImageFont
 import textwrap
 import random
-import time
+import threading
+import clock
+from functools import lru_cache
 
 # ── I2C config ────────────────────────────────────────────────
 I2C_ADDRESS = 0x3C
 
+# ── Contrast (0–255) at full power and dimmed ─────────────────
+CONTRAST     = 0xCF  # what adafruit_ssd1306 sets at init
+DIM_CONTRAST = 0x08
+
 # ── Screen dimensions ─────────────────────────────────────────
 WIDTH = 128
 HEIGHT = 64
 
+# ── Render cache ──────────────────────────────────────────────
+# Rendered framebuffers kept around; covers all MESSAGES + ARTWORKS
+# with room for a few custom messages.
+RENDER_CACHE_SIZE = 32
+
 # ── Inspirational messages ────────────────────────────────────
 MESSAGES = [
     "You are capable of amazing things.",
@@ -82,6 +100,17 @@ ARTWORKS = [
 _display = None
 _last_message = None
 oled_state = "OFF"
+last_switch = 0.0  # clock.monotonic() of the last switch_state()
+power = "on"       # "on", "dim" or "off" – see set_power()
+
+_BLANK = bytes(WIDTH * HEIGHT // 8)
+
+_mailbox = None  # pending render job: () -> framebuffer or None
+_power_request = None  # pending set_power() level
+_panel_power = "on"    # what the worker last set the panel to
+_mail_cv = threading.Condition()
+_worker = None
+_stopping = False
 
 
 def _get_font():
@@ -98,28 +127,157 @@ def _measure_line_height(font):
     return bbox[3] - bbox[1] + 2
 
 
+@lru_cache(maxsize=1)
+def _font_metrics():
+    """(font, line_height) – loaded once per process."""
+    font = _get_font()
+    return font, _measure_line_height(font)
+
+
+def _to_framebuffer(image):
+    """
+    Pack a 1-bit WIDTH x HEIGHT image into SSD1306 page order: one byte
+    per column per 8-row page, LSB = top row. Same result as
+    _display.image() without its per-pixel Python loop.
+    """
+    # Transposed + mirrored, each row of the image is one column of the
+    # screen with the bottom pixel first, so tobytes() yields one byte
+    # per page per column, pages running 7..0.
+    cols = image.transpose(Image.Transpose.TRANSPOSE).transpose(Image.Transpose.FLIP_LEFT_RIGHT)
+    raw = cols.tobytes()
+    pages = HEIGHT // 8
+    return b"".join(raw[pages - 1 - p :: pages] for p in range(pages))
+
+
+@lru_cache(maxsize=RENDER_CACHE_SIZE)
+def _render_art(art):
+    font, line_height = _font_metrics()
+    image = Image.new("1", (WIDTH, HEIGHT))
+    draw = ImageDraw.Draw(image)
+    for i, line in enumerate(art.splitlines()):
+        draw.text((0, i * line_height), line, font=font, fill=255)
+    return _to_framebuffer(image)
+
+
+@lru_cache(maxsize=RENDER_CACHE_SIZE)
+def _render_message(message):
+    """Framebuffer for a centred, word-wrapped message, or None if it has no text."""
+    font, line_height = _font_metrics()
+    lines = textwrap.wrap(message, width=21)
+    if not lines:
+        return None
+    image = Image.new("1", (WIDTH, HEIGHT))
+    draw = ImageDraw.Draw(image)
+    total_height = len(lines) * line_height
+    y = max(0, (HEIGHT - total_height) // 2)
+    for line in lines:
+        bbox = draw.textbbox((0, 0), line, font=font)
+        text_width = bbox[2] - bbox[0]
+        x = max(0, (WIDTH - text_width) // 2)
+        draw.text((x, y), line, font=font, fill=255)
+        y += line_height
+    return _to_framebuffer(image)
+
+
+def _blit(framebuffer):
+    """Copy a pre-rendered framebuffer into the display and push it."""
+    _display.buf[:] = framebuffer
+    _display.show()
+
+
+def prerender():
+    """Render every built-in message and artwork so later refreshes only blit."""
+    for message in MESSAGES:
+        _render_message(message)
+    for art in ARTWORKS:
+        _render_art(art)
+
+
+def _post(job):
+    """Hand a render job to the worker, replacing any it hasn't started yet."""
+    global _mailbox
+    with _mail_cv:
+        _mailbox = job
+        _mail_cv.notify()
+
+
+def _apply_power(level):
+    global _panel_power
+    if level == "off":
+        _display.poweroff()  # the panel keeps its RAM; poweron() shows it again
+    else:
+        if _panel_power == "off":
+            _display.poweron()
+        _display.contrast(DIM_CONTRAST if level == "dim" else CONTRAST)
+    _panel_power = level
+
+
+def _work():
+    """Worker thread: the only code that touches _display after init()."""
+    global _mailbox, _power_request
+    while True:
+        with _mail_cv:
+            while _mailbox is None and _power_request is None and not _stopping:
+                _mail_cv.wait()
+            job, _mailbox = _mailbox, None
+            level, _power_request = _power_request, None
+        if level is not None and level != _panel_power:
+            try:
+                _apply_power(level)
+            except Exception as e:
+                print(f"[OLED] Error: {e}")
+        if job is None:
+            if level is not None:
+                continue
+            return  # stopping and nothing left to draw
+        try:
+            with metrics.span("oled_render"):
+                framebuffer = job()
+            if framebuffer is not None:
+                _blit(framebuffer)
+        except Exception as e:
+            print(f"[OLED] Error: {e}")
+
+
 def init():
-    global _display
+    global _display, _worker, _stopping
     try:
         i2c = busio.I2C(board.SCL, board.SDA)
     except ValueError as e:
         print(f"[OLED] I2C init failed - is I2C enabled? Run: sudo raspi-config")
         print(f"[OLED] Error: {e}")
         return
-    _display = adafruit_ssd1306.SSD1306_I2C(WIDTH, HEIGHT, i2c, addr=I2C_ADDRESS)
-    clear()
+    _display = DiffDisplay(adafruit_ssd1306.SSD1306_I2C(WIDTH, HEIGHT, i2c, addr=I2C_ADDRESS))
+    _blit(_BLANK)
+    prerender()
+    _stopping = False
+    _worker = threading.Thread(target=_work, name="oled", daemon=True)
+    _worker.start()
     print(f"[OLED] Ready on I2C address {hex(I2C_ADDRESS)}.")
 
 
 def clear():
     if _display is None:
         return
-    _display.fill(0)
-    _display.show()
+    _post(lambda: _BLANK)
+
+
+def set_power(level):
+    """
+    "on", "dim" (low contrast) or "off" (panel off, nothing drawn
+    until it is back on). Posted to the worker like a frame.
+    """
+    global power, _power_request
+    power = level
+    if _display is None:
+        return
+    with _mail_cv:
+        _power_request = level
+        _mail_cv.notify()
 
 
 def loop():
-    if oled_state == "OFF":
+    if oled_state == "OFF" or power == "off":
         return
     elif oled_state == "MESSAGE":
         show_message()
@@ -128,7 +286,8 @@ def loop():
 
 
 def switch_state():
-    global oled_state
+    global oled_state, last_switch
+    last_switch = clock.monotonic()
     if oled_state == "OFF":
         oled_state = "MESSAGE"
     elif oled_state == "MESSAGE":
@@ -136,20 +295,14 @@ def switch_state():
     else:
         oled_state = "OFF"
     print(f"[OLED] State: {oled_state}")
+    loop()
 
 
 def draw_ascii(art):
     if _display is None:
         print("[OLED] Not initialised - call oled.init() first.")
         return
-    font = _get_font()
-    line_height = _measure_line_height(font)
-    image = Image.new("1", (WIDTH, HEIGHT))
-    draw = ImageDraw.Draw(image)
-    for i, line in enumerate(art.splitlines()):
-        draw.text((0, i * line_height), line, font=font, fill=255)
-    _display.image(image)
-    _display.show()
+    _post(lambda: _render_art(art))
 
 
 def show_art():
@@ -168,28 +321,29 @@ def show_message(message=None):
     _last_message = message
     if not message.strip():
         return
-    font = _get_font()
-    line_height = _measure_line_height(font)
-    lines = textwrap.wrap(message, width=21)
-    if not lines:
-        return
-    image = Image.new("1", (WIDTH, HEIGHT))
-    draw = ImageDraw.Draw(image)
-    total_height = len(lines) * line_height
-    y = max(0, (HEIGHT - total_height) // 2)
-    for line in lines:
-        bbox = draw.textbbox((0, 0), line, font=font)
-        text_width = bbox[2] - bbox[0]
-        x = max(0, (WIDTH - text_width) // 2)
-        draw.text((x, y), line, font=font, fill=255)
-        y += line_height
-    _display.image(image)
-    _display.show()
+    _post(lambda: _render_message(message))
     print(f'[OLED] Showing: "{message}"')
 
 
+def flush_stats():
+    """Bytes sent / time spent pushing frames over I2C (see oled_display.py)."""
+    if _display is None:
+        return None
+    return _display.stats()
+
+
 def cleanup():
-    clear()
+    """Let the worker finish what's queued, stop it, then blank the screen."""
+    global _stopping, _worker
+    if _display is None:
+        return
+    if _worker is not None:
+        with _mail_cv:
+            _stopping = True
+            _mail_cv.notify()
+        _worker.join()
+        _worker = None
+    _blit(_BLANK)
 
 
 # ── Standalone test ───────────────────────────────────────────
@@ -199,6 +353,6 @@ if __name__ == "__main__":
     for _ in range(6):
         switch_state()
         loop()
-        time.sleep(3)
+        clock.sleep(3)
     cleanup()
     print("Done.")
@@ -0,0 +1,124 @@
+# ══════════════════════════════════════════════════════════════
+#  oled_display.py  –  SSD1306 wrapper that only sends what changed
+#  Keeps a copy of the last frame pushed over I2C. show() diffs the
+#  new frame per 8-row page, sends only the dirty column windows as
+#  bulk writes, and skips the transfer when nothing changed.
+#
+#  Wraps an adafruit_ssd1306.SSD1306_I2C and otherwise behaves like
+#  it (fill, buf, image, ... are passed straight through).
+# ══════════════════════════════════════════════════════════════
+
+import time
+
+import metrics
+
+# SSD1306 commands (horizontal addressing mode, as set by adafruit's init)
+_SET_COL_ADDR  = 0x21
+_SET_PAGE_ADDR = 0x22
+_DATA          = 0x40  # I2C control byte: the rest of the transfer is GDDRAM data
+
+# Each window costs 6 single-byte command transfers. Adjacent dirty pages
+# are sent as one window when that wastes fewer bytes than this.
+_WINDOW_OVERHEAD = 18
+
+
+class DiffDisplay:
+    def __init__(self, display):
+        self._display = display
+        self.width = display.width
+        self.height = display.height
+        self.pages = display.height // 8
+        # 64-px-wide panels sit in the middle of the 128-column GDDRAM
+        self._col_offset = (128 - self.width) // 2 if self.width != 128 else 0
+        self._sent = None  # last frame that reached the panel, None = unknown
+
+        # counters
+        self.flushes = 0  # show() calls
+        self.skipped = 0  # ...that found nothing to send
+        self.bytes_sent = 0  # GDDRAM data bytes written
+        self.flush_time = 0.0  # seconds spent in show()
+        self.last_flush_time = 0.0
+
+    def __getattr__(self, name):
+        return getattr(self._display, name)
+
+    def invalidate(self):
+        """Forget what the panel shows, e.g. after power-cycling it."""
+        self._sent = None
+
+    def _dirty_pages(self, buf):
+        """Yield (page, first_col, last_col) for every page that differs."""
+        w = self.width
+        sent = self._sent
+        for page in range(self.pages):
+            start = page * w
+            end = start + w
+            if buf[start:end] == sent[start:end]:
+                continue
+            lo = start
+            while buf[lo] == sent[lo]:
+                lo += 1
+            hi = end - 1
+            while buf[hi] == sent[hi]:
+                hi -= 1
+            yield page, lo - start, hi - start
+
+    def _windows(self, buf):
+        """Dirty pages merged into (page0, page1, col0, col1) write windows."""
+        window = None
+        for page, c0, c1 in self._dirty_pages(buf):
+            if window is not None and window[1] == page - 1:
+                p0, p1, w0, w1 = window
+                m0, m1 = min(w0, c0), max(w1, c1)
+                merged = (page - p0 + 1) * (m1 - m0 + 1)
+                separate = (p1 - p0 + 1) * (w1 - w0 + 1) + (c1 - c0 + 1)
+                if merged - separate <= _WINDOW_OVERHEAD:
+                    window = (p0, page, m0, m1)
+                    continue
+            if window is not None:
+                yield window
+            window = (page, page, c0, c1)
+        if window is not None:
+            yield window
+
+    def _send_window(self, buf, p0, p1, c0, c1):
+        d = self._display
+        for cmd in (
+            _SET_COL_ADDR, c0 + self._col_offset, c1 + self._col_offset,
+            _SET_PAGE_ADDR, p0, p1,
+        ):
+            d.write_cmd(cmd)
+        data = bytearray([_DATA])
+        for page in range(p0, p1 + 1):
+            data += buf[page * self.width + c0 : page * self.width + c1 + 1]
+        with d.i2c_device:
+            d.i2c_device.write(data)
+        return len(data) - 1
+
+    def show(self):
+        start = time.monotonic()
+        buf = self._display.buf
+        sent = 0
+        if self._sent is None:
+            self._display.show()  # first frame: full refresh, also resets the address window
+            sent = len(buf)
+        else:
+            for window in self._windows(buf):
+                sent += self._send_window(buf, *window)
+        self._sent = bytes(buf)
+        elapsed = time.monotonic() - start
+        self.flushes += 1
+        self.skipped += sent == 0
+        self.bytes_sent += sent
+        self.flush_time += elapsed
+        self.last_flush_time = elapsed
+        metrics.record("i2c_flush", elapsed)
+
+    def stats(self):
+        return {
+            "flushes": self.flushes,
+            "skipped": self.skipped,
+            "bytes_sent": self.bytes_sent,
+            "flush_time": round(self.flush_time, 4),
+            "last_flush_time": round(self.last_flush_time, 4),
+        }
@@ -0,0 +1,162 @@
+# ══════════════════════════════════════════════════════════════
+#  replay.py  –  play a recorded trace back through main.py
+#  Run with: python replay.py TRACE_DIR [--speed 10]
+#
+#  The whole program runs on the simulated hardware (sim_hw.py) with
+#  a virtual clock, and the recorded pin edges are driven back in at
+#  their original times – 1x, or faster with --speed. Every action
+#  (LED toggle, OLED mode switch, photo) is timestamped and paired
+#  with the edge that caused it, giving event-to-action latencies.
+#
+#  The same trace is also run through a reference model of the tap
+#  and IR rules; fewer actions than it expects are reported as
+#  missed, and the exit status is 1 so this can gate a change.
+#
+#  At high speeds the program's own processing time is scaled up
+#  by the same factor, so compare latencies at one speed only.
+# ══════════════════════════════════════════════════════════════
+
+import argparse
+import os
+import signal
+import sys
+import threading
+
+os.environ.setdefault("BOOTLEG_HAL", "sim")  # before anything imports hal
+
+import clock
+import input_trace
+from state_machine import StateMachine, TAP, DOUBLE_TAP
+from config import IR_SENSOR_PIN, TOUCH_PIN, DOUBLE_TAP_WINDOW, IR_DEBOUNCE, TOUCH_DEBOUNCE, IR_TOGGLE_GAP
+
+SETTLE = 1.0  # seconds to keep running after the last edge
+
+# action -> (pin, level of the edge that triggers it)
+CAUSES = {
+    "led":   (IR_SENSOR_PIN, 0),  # IR sensors pull LOW on detection
+    "oled":  (TOUCH_PIN, 1),      # single tap
+    "photo": (TOUCH_PIN, 1),      # double tap
+}
+
+
+# ── Reference model ───────────────────────────────────────────
+def _debounced(times, levels, debounce):
+    """Drop edges closer than debounce to the last kept one."""
+    kept, last = [], None
+    for t, level in zip(times, levels):
+        if last is None or t - last >= debounce:
+            kept.append((t, level))
+            last = t
+    return kept
+
+
+def expected_actions(trace):
+    """How many of each action the trace should cause."""
+    expected = {"led": 0, "oled": 0, "photo": 0}
+
+    last_toggle = None
+    for t, level in _debounced(*trace.pin_edges(IR_SENSOR_PIN), IR_DEBOUNCE):
+        if level == 0 and (last_toggle is None or t - last_toggle >= IR_TOGGLE_GAP):
+            last_toggle = t
+            expected["led"] += 1
+
+    taps = StateMachine(double_tap=DOUBLE_TAP_WINDOW, idle=False)
+    events = []
+    for t, level in _debounced(*trace.pin_edges(TOUCH_PIN), TOUCH_DEBOUNCE):
+        events += taps.update(bool(level), t)
+    events += taps.poll(trace.duration + DOUBLE_TAP_WINDOW)
+    expected["oled"] = sum(e.kind == TAP for e in events)
+    expected["photo"] = sum(e.kind == DOUBLE_TAP for e in events)
+    return expected
+
+
+# ── Replay ────────────────────────────────────────────────────
+def replay(trace, speed):
+    # same monotonic times as the recording, so time-based rules see the same gaps
+    clock.install(clock.VirtualClock(speed=speed, start=trace.meta["start"]))
+
+    import hal
+    if not hal.SIMULATED:
+        sys.exit("replay.py needs the simulated hardware (BOOTLEG_HAL=sim)")
+    from hal import GPIO
+    import main
+    import led
+    import oled
+    import touch_sensor
+    import camera_workaround
+
+    actions = []  # (name, time)
+    started = threading.Event()
+    finished = threading.Event()  # shutdown's own led.off() is not an action
+
+    def probe(name, fn=None):
+        def wrapper(*args, **kwargs):
+            if not finished.is_set():
+                actions.append((name, clock.monotonic()))
+            if fn is not None:
+                return fn(*args, **kwargs)
+        return wrapper
+
+    led.on, led.off = probe("led", led.on), probe("led", led.off)
+    oled.switch_state = probe("oled", oled.switch_state)
+    camera_workaround.capture_burst = probe("photo")  # don't actually shoot
+
+    start_events = touch_sensor.start_events
+    def ready():
+        start_events()
+        started.set()
+    touch_sensor.start_events = ready  # main calls this once GPIO events are wired up
+
+    edges = []  # (pin, level, time fed in)
+
+    def feed():
+        started.wait()
+        t0 = clock.monotonic()
+        for t, pin, level in trace.edges:
+            clock.sleep(t0 + t - clock.monotonic())
+            edges.append((int(pin), int(level), clock.monotonic()))
+            GPIO.set_input(int(pin), int(level))
+        clock.sleep(SETTLE + DOUBLE_TAP_WINDOW)
+        finished.set()
+        os.kill(os.getpid(), signal.SIGINT)
+
+    threading.Thread(target=feed, name="replay", daemon=True).start()
+    main.main()
+    return actions, edges
+
+
+def latencies(actions, edges):
+    """Per action: seconds since the latest edge that could have caused it."""
+    out = {name: [] for name in CAUSES}
+    for name, at in actions:
+        pin, level = CAUSES[name]
+        causes = [t for p, l, t in edges if p == pin and l == level and t <= at]
+        if causes:
+            out[name].append(at - causes[-1])
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded trace through main.py")
+    parser.add_argument("trace", help="directory written with BOOTLEG_TRACE")
+    parser.add_argument("--speed", type=float, default=1.0, help="1 = real time, 10 = ten times faster")
+    args = parser.parse_args()
+
+    trace = input_trace.load(args.trace)
+    print(f"[REPLAY] {len(trace.edges)} edges over {trace.duration:.1f}s at {args.speed:g}x")
+    actions, edges = replay(trace, args.speed)
+
+    expected = expected_actions(trace)
+    missed = 0
+    print("\n[REPLAY] event → action latency (ms)")
+    for name, values in latencies(actions, edges).items():
+        seen = sum(1 for n, _ in actions if n == name)
+        short = max(0, expected[name] - seen)
+        missed += short
+        flag = f"  MISSED {short}" if short else ""
+        print(f"  {name:6} expected {expected[name]:3}  seen {seen:3}  {input_trace.summarize(values)}{flag}")
+    sys.exit(1 if missed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,410 @@
+# ══════════════════════════════════════════════════════════════
+#  sim_hw.py  –  fake hardware for off-device runs
+#  Selected by BOOTLEG_HAL=sim (see hal.py). Every fake records
+#  what it was told to do, timestamped with clock.monotonic(), so
+#  tests and benchmarks can check behaviour and latency.
+#
+#  Driving inputs from a test:
+#      from hal import GPIO
+#      GPIO.set_input(TOUCH_PIN, GPIO.HIGH)   # fires edge callbacks
+#  Camera frames come from BOOTLEG_SIM_FRAMES (a directory of
+#  .npy / .png / .jpg files, or one file), looping; without it the
+#  camera serves a plain grey frame.
+# ══════════════════════════════════════════════════════════════
+
+import glob
+import os
+import threading
+import types
+
+import clock
+from config import IR_SENSOR_PIN
+
+
+# ── GPIO (RPi.GPIO) ───────────────────────────────────────────
+class _PWM:
+    def __init__(self, gpio, pin, frequency):
+        self._gpio = gpio
+        self.pin = pin
+        self.frequency = frequency
+        self.duty_cycle = 0.0
+        self.running = False
+
+    def start(self, duty_cycle):
+        self.running = True
+        self.ChangeDutyCycle(duty_cycle)
+
+    def ChangeDutyCycle(self, duty_cycle):
+        self.duty_cycle = duty_cycle
+        self._gpio._record(self.pin, ("pwm", self.frequency, duty_cycle))
+
+    def ChangeFrequency(self, frequency):
+        self.frequency = frequency
+        self._gpio._record(self.pin, ("pwm", frequency, self.duty_cycle))
+
+    def stop(self):
+        self.running = False
+        self._gpio._record(self.pin, ("pwm", self.frequency, 0.0))
+
+
+class _GPIO:
+    BCM, BOARD = 11, 10
+    IN, OUT = 1, 0
+    LOW, HIGH = 0, 1
+    RISING, FALLING, BOTH = 31, 32, 33
+    PUD_OFF, PUD_DOWN, PUD_UP = 20, 21, 22
+
+    def __init__(self):
+        self.mode = None
+        # IR obstacle sensors idle HIGH ("clear"); everything else idles LOW
+        self._levels = {IR_SENSOR_PIN: self.HIGH}
+        self._callbacks = {}  # pin -> (edge, callback)
+        self._lock = threading.Lock()
+        self.history = []  # (time, pin, level or ("pwm", freq, duty))
+
+    def _record(self, pin, value):
+        self.history.append((clock.monotonic(), pin, value))
+
+    def setmode(self, mode):
+        self.mode = mode
+
+    def setwarnings(self, flag):
+        pass
+
+    def setup(self, pin, direction, pull_up_down=None, initial=None):
+        pins = pin if isinstance(pin, (list, tuple)) else [pin]
+        for p in pins:
+            if direction == self.OUT:
+                self._levels[p] = self.LOW if initial is None else initial
+            else:
+                self._levels.setdefault(p, self.HIGH if pull_up_down == self.PUD_UP else self.LOW)
+
+    def output(self, pin, value):
+        self._levels[pin] = int(bool(value))
+        self._record(pin, int(bool(value)))
+
+    def input(self, pin):
+        return self._levels.get(pin, self.LOW)
+
+    def add_event_detect(self, pin, edge, callback=None, bouncetime=None):
+        self._callbacks[pin] = (edge, callback)
+
+    def remove_event_detect(self, pin):
+        self._callbacks.pop(pin, None)
+
+    def PWM(self, pin, frequency):
+        return _PWM(self, pin, frequency)
+
+    def cleanup(self, pin=None):
+        if pin is None:
+            self._callbacks.clear()
+        else:
+            self._callbacks.pop(pin, None)
+
+    # ── Simulation API ────────────────────────────────────────
+    def set_input(self, pin, level):
+        """Drive an input pin like the outside world would; fires edge callbacks."""
+        with self._lock:
+            old = self._levels.get(pin, self.LOW)
+            self._levels[pin] = int(bool(level))
+            if old == self._levels[pin]:
+                return
+            edge, callback = self._callbacks.get(pin, (None, None))
+        rising = self._levels[pin] == self.HIGH
+        if callback is not None and (
+            edge == self.BOTH or (edge == self.RISING) == rising
+        ):
+            callback(pin)
+
+
+GPIO = _GPIO()
+
+
+# ── RGB LED (gpiozero.RGBLED) ─────────────────────────────────
+# 40-pin header: physical pin -> BCM number (power and ground left out)
+_BOARD_TO_BCM = {
+    3: 2, 5: 3, 7: 4, 8: 14, 10: 15, 11: 17, 12: 18, 13: 27, 15: 22,
+    16: 23, 18: 24, 19: 10, 21: 9, 22: 25, 23: 11, 24: 8, 26: 7, 27: 0,
+    28: 1, 29: 5, 31: 6, 32: 12, 33: 13, 35: 19, 36: 16, 37: 26, 38: 20, 40: 21,
+}
+
+
+def _bcm(pin):
+    """The BCM number gpiozero makes of pin (17, "GPIO17", "BCM17", "BOARD11"), or ValueError."""
+    number = pin
+    if isinstance(pin, str):
+        spec = pin.upper()
+        for prefix in ("BOARD", "GPIO", "BCM"):
+            if spec.startswith(prefix) and spec[len(prefix):].isdigit():
+                number = int(spec[len(prefix):])
+                if prefix == "BOARD":
+                    number = _BOARD_TO_BCM.get(number, -1)
+                break
+    if isinstance(number, int) and 0 <= number <= 27:
+        return number
+    raise ValueError(f"no GPIO pin {pin!r} on a Pi – gpiozero takes BCM numbers (0–27) or 'BOARDn'")
+
+
+class RGBLED:
+    def __init__(self, red=None, green=None, blue=None, active_high=True,
+                 initial_value=(0, 0, 0), pwm=True, pin_factory=None):
+        self.pins = tuple(_bcm(pin) for pin in (red, green, blue))
+        self.history = []  # (time, (r, g, b))
+        self._color = (0.0, 0.0, 0.0)
+        self.color = initial_value
+
+    @property
+    def color(self):
+        return self._color
+
+    @color.setter
+    def color(self, value):
+        value = tuple(float(v) for v in value)
+        if len(value) != 3 or not all(0.0 <= v <= 1.0 for v in value):
+            raise ValueError(f"RGBLED colour components must be 0..1, got {value}")
+        self._color = value
+        self.history.append((clock.monotonic(), value))
+
+    @property
+    def value(self):
+        return self._color
+
+    @value.setter
+    def value(self, value):
+        self.color = value
+
+    @property
+    def is_lit(self):
+        return any(self._color)
+
+    def on(self):
+        self.color = (1, 1, 1)
+
+    def off(self):
+        self.color = (0, 0, 0)
+
+    def close(self):
+        pass
+
+
+# ── SSD1306 over I2C (board / busio / adafruit_ssd1306) ───────
+board = types.SimpleNamespace(SCL=3, SDA=2)
+
+
+class _I2C:
+    def __init__(self, scl, sda, frequency=400000):
+        self.scl, self.sda = scl, sda
+
+
+busio = types.SimpleNamespace(I2C=_I2C)
+
+
+class _I2CDevice:
+    """Receives GDDRAM data writes: 0x40 control byte + pixel bytes."""
+
+    def __init__(self, panel):
+        self._panel = panel
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def write(self, data):
+        self._panel._write_data(bytes(data[1:]))
+
+
+class SSD1306_I2C:
+    """
+    Fake panel with a real GDDRAM model: it honours the column/page
+    address window commands, so partial updates from oled_display.py
+    land exactly where the real chip would put them.
+    """
+
+    def __init__(self, width, height, i2c, addr=0x3C, external_vcc=False, reset=None):
+        self.width = width
+        self.height = height
+        self.pages = height // 8
+        self.addr = addr
+        self.buffer = bytearray(self.pages * width + 1)
+        self.buffer[0] = 0x40
+        self.buf = memoryview(self.buffer)[1:]
+        self.i2c_device = _I2CDevice(self)
+        self.gddram = bytearray(8 * 128)  # what the panel would actually show
+        self.frames = []  # (time, bytes) after every transfer
+        self.bytes_written = 0
+        self.power = True
+        self.contrast_level = 0xCF
+        self._cmds = []
+        self._window = (0, 127, 0, self.pages - 1)
+        self._col_offset = (128 - width) // 2 if width != 128 else 0
+
+    def write_cmd(self, cmd):
+        self._cmds.append(cmd)
+        if self._cmds[0] in (0x21, 0x22) and len(self._cmds) == 3:
+            c0, c1, p0, p1 = self._window
+            if self._cmds[0] == 0x21:
+                c0, c1 = self._cmds[1], self._cmds[2]
+            else:
+                p0, p1 = self._cmds[1], self._cmds[2]
+            self._window = (c0, c1, p0, p1)
+            self._cmds = []
+        elif self._cmds[0] not in (0x21, 0x22):
+            if self._cmds[0] == 0x81 and len(self._cmds) < 2:
+                return  # contrast takes one argument
+            if self._cmds[0] == 0x81:
+                self.contrast_level = self._cmds[1]
+            elif self._cmds[0] in (0xAE, 0xAF):
+                self.power = self._cmds[0] == 0xAF
+            self._cmds = []
+
+    def _write_data(self, data):
+        c0, c1, p0, p1 = self._window
+        i = 0
+        for page in range(p0, p1 + 1):
+            for col in range(c0, c1 + 1):
+                if i == len(data):
+                    break
+                self.gddram[page * 128 + col] = data[i]
+                i += 1
+        self.bytes_written += len(data)
+        self.frames.append((clock.monotonic(), self.screen()))
+
+    def screen(self):
+        """The panel contents in the same layout as buf."""
+        out = bytearray()
+        for page in range(self.pages):
+            start = page * 128 + self._col_offset
+            out += self.gddram[start:start + self.width]
+        return bytes(out)
+
+    def fill(self, color):
+        self.buf[:] = (b"\xff" if color else b"\x00") * len(self.buf)
+
+    def pixel(self, x, y, color=None):
+        index = x + (y // 8) * self.width
+        bit = 1 << (y & 7)
+        if color is None:
+            return bool(self.buf[index] & bit)
+        self.buf[index] = self.buf[index] | bit if color else self.buf[index] & ~bit
+
+    def image(self, img):
+        img = img.convert("1")
+        pixels = img.load()
+        self.fill(0)
+        for y in range(self.height):
+            for x in range(self.width):
+                if pixels[x, y]:
+                    self.pixel(x, y, 1)
+
+    def show(self):
+        for cmd in (0x21, self._col_offset, self._col_offset + self.width - 1,
+                    0x22, 0, self.pages - 1):
+            self.write_cmd(cmd)
+        self._write_data(bytes(self.buf))
+
+    def contrast(self, value):
+        self.write_cmd(0x81)
+        self.write_cmd(value)
+
+    def poweroff(self):
+        self.write_cmd(0xAE)
+
+    def poweron(self):
+        self.write_cmd(0xAF)
+
+
+adafruit_ssd1306 = types.SimpleNamespace(SSD1306_I2C=SSD1306_I2C)
+
+
+# ── Camera (picamera2.Picamera2) ──────────────────────────────
+SIM_CAMERA_FPS = float(os.environ.get("BOOTLEG_SIM_FPS", "30"))
+
+
+def _load_frames(size):
+    """Frames from BOOTLEG_SIM_FRAMES resized to size, or one grey frame."""
+    import numpy as np
+    source = os.environ.get("BOOTLEG_SIM_FRAMES")
+    paths = []
+    if source:
+        paths = sorted(glob.glob(os.path.join(source, "*"))) if os.path.isdir(source) else [source]
+    frames = []
+    for path in paths:
+        if path.endswith(".npy"):
+            frames.append(np.load(path).astype(np.uint8))
+            continue
+        try:
+            from PIL import Image
+            with Image.open(path) as im:
+                # Picamera2's "RGB888" arrays are B, G, R in memory
+                frames.append(np.asarray(im.convert("RGB").resize(size))[..., ::-1].copy())
+        except (OSError, ValueError):
+            continue  # not an image
+    if not frames:
+        frames = [np.full((size[1], size[0], 3), 96, dtype=np.uint8)]
+    return frames
+
+
+class Picamera2:
+    def __init__(self, camera_num=0):
+        self.options = {}
+        self.controls = {}
+        self.started = False
+        self._size = (640, 480)
+        self._frames = None
+        self._index = 0
+        self.frames_served = 0
+
+    def create_preview_configuration(self, main=None, controls=None, **kwargs):
+        return {"main": dict(main or {}), "controls": dict(controls or {})}
+
+    create_still_configuration = create_preview_configuration
+    create_video_configuration = create_preview_configuration
+
+    def configure(self, config):
+        self._size = tuple(config.get("main", {}).get("size", self._size))
+        self.controls.update(config.get("controls", {}))
+        self._frames = None
+
+    def start(self, config=None, show_preview=False):
+        if config is not None:
+            self.configure(config)
+        self.started = True
+
+    def stop(self):
+        self.started = False
+
+    def close(self):
+        self.stop()
+
+    def set_controls(self, controls):
+        self.controls.update(controls)
+
+    def capture_metadata(self):
+        return {
+            "ExposureTime": self.controls.get("ExposureTime", 10000),
+            "AnalogueGain": self.controls.get("AnalogueGain", 1.0),
+            "ColourGains": self.controls.get("ColourGains", (1.5, 1.5)),
+            "SensorTimestamp": int(clock.monotonic() * 1e9),
+        }
+
+    def capture_array(self, name="main"):
+        if not self.started:
+            raise RuntimeError("Camera is not running")
+        if self._frames is None:
+            self._frames = _load_frames(self._size)
+        clock.sleep(1.0 / SIM_CAMERA_FPS)  # a real capture waits for the next frame
+        frame = self._frames[self._index % len(self._frames)]
+        self._index += 1
+        self.frames_served += 1
+        return frame.copy()
+
+    def capture_image(self, name="main"):
+        from PIL import Image
+        return Image.fromarray(self.capture_array(name)[..., ::-1].copy())
+
+    def capture_file(self, path, name="main", format=None):
+        self.capture_image(name).save(path, format=format or "JPEG",
+                                      quality=self.options.get("quality", 90))
+        return path
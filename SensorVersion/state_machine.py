@@ -0,0 +1,168 @@
+# ══════════════════════════════════════════════════════════════
+#  state_machine.py  –  time-aware press/hold/release engine
+#  Shared by the touch tap logic and the vision gesture debouncer.
+#
+#  Feed it a stream of samples (a finger count, True/False for a
+#  touch pad, ...) with timestamps; it answers with events:
+#    PRESS       a value has been dominant for `hold` seconds
+#    REPEAT      ...and is still held, every `repeat` seconds
+#    RELEASE     the held value lost dominance (duration = time held)
+#    TAP         one press with no second press within `double_tap`
+#    DOUBLE_TAP  a second press within `double_tap` of the first
+#
+#  "Dominant" uses a sliding time window with hysteresis: a value
+#  takes over at on_ratio of the recent samples and lets go below
+#  off_ratio, so a single dropped frame doesn't release a gesture.
+#  Per-value counts are kept next to the window, so every update is
+#  O(1) however long the window is.
+# ══════════════════════════════════════════════════════════════
+
+import clock as _clock
+from collections import deque, namedtuple
+
+PRESS      = "PRESS"
+REPEAT     = "REPEAT"
+RELEASE    = "RELEASE"
+TAP        = "TAP"
+DOUBLE_TAP = "DOUBLE_TAP"
+
+# time     = when it happened (same clock as the samples)
+# duration = how long the value had been held (RELEASE / REPEAT), else 0
+Event = namedtuple("Event", "kind value time duration")
+
+_NOTHING = object()  # "no candidate" – distinct from any sample value, even None
+
+
+class StateMachine:
+    def __init__(
+        self,
+        hold=0.0,
+        window=0.0,
+        on_ratio=1.0,
+        off_ratio=None,
+        repeat=None,
+        double_tap=None,
+        idle=None,
+        max_samples=64,
+        clock=_clock.monotonic,
+    ):
+        """
+        hold        seconds a value must stay dominant before PRESS
+        window      seconds of samples the dominance ratio looks at
+                    (0 = only the latest sample)
+        on_ratio    share of the window a value needs to take over
+        off_ratio   share below which a held value is released
+                    (defaults to on_ratio, i.e. no hysteresis)
+        repeat      seconds between REPEAT events while held, None = off
+        double_tap  seconds for a second PRESS to count as DOUBLE_TAP;
+                    None = no TAP / DOUBLE_TAP events
+        idle        sample value meaning "nothing" – never pressed
+        max_samples cap on the window so memory stays bounded
+        clock       where `now` comes from when a call doesn't pass it
+        """
+        self.hold = hold
+        self.window = window
+        self.on_ratio = on_ratio
+        self.off_ratio = on_ratio if off_ratio is None else off_ratio
+        self.repeat = repeat
+        self.double_tap = double_tap
+        self.idle = idle
+        self.clock = clock
+        self._samples = deque(maxlen=max_samples)
+        self._counts = {}
+        self.reset()
+
+    def reset(self):
+        """Forget everything, without emitting a RELEASE."""
+        self._samples.clear()
+        self._counts.clear()
+        self._candidate = _NOTHING
+        self._since = 0.0  # when the candidate became dominant
+        self._pressed = False
+        self._pressed_at = 0.0
+        self._next_repeat = None
+        self._first_tap = None  # time of a press waiting for its double
+
+    # ── Sliding window ────────────────────────────────────────
+    def _push(self, value, now):
+        samples, counts = self._samples, self._counts
+        if len(samples) == samples.maxlen:
+            self._forget(samples[0][1])  # deque drops it on append
+        samples.append((now, value))
+        counts[value] = counts.get(value, 0) + 1
+        horizon = now - self.window
+        while len(samples) > 1 and samples[0][0] < horizon:
+            self._forget(samples.popleft()[1])
+
+    def _forget(self, value):
+        left = self._counts[value] - 1
+        if left:
+            self._counts[value] = left
+        else:
+            del self._counts[value]
+
+    def _ratio(self, value):
+        return self._counts.get(value, 0) / len(self._samples)
+
+    # ── Public API ────────────────────────────────────────────
+    def update(self, value, now=None):
+        """Add one sample and return the events it (or elapsed time) caused."""
+        if now is None:
+            now = self.clock()
+        events = []
+        self._push(value, now)
+        if self._candidate is not _NOTHING:
+            keep = self.off_ratio if self._pressed else self.on_ratio
+            if self._ratio(self._candidate) < keep:
+                if self._pressed:
+                    events.append(Event(RELEASE, self._candidate, now, now - self._pressed_at))
+                self._candidate = _NOTHING
+                self._pressed = False
+        if self._candidate is _NOTHING and self._ratio(value) >= self.on_ratio:
+            self._candidate = value
+            self._since = now
+        events += self.poll(now)
+        return events
+
+    def poll(self, now=None):
+        """Events that are due from time passing alone (hold, repeat, single tap)."""
+        if now is None:
+            now = self.clock()
+        events = []
+        # an expired single tap goes first – a new press may be about to take its slot
+        if self._first_tap is not None and now - self._first_tap[0] >= self.double_tap:
+            events.append(Event(TAP, self._first_tap[1], self._first_tap[0] + self.double_tap, 0.0))
+            self._first_tap = None
+        active = self._candidate is not _NOTHING and self._candidate != self.idle
+        if active and not self._pressed and now - self._since >= self.hold:
+            self._pressed = True
+            self._pressed_at = now
+            events.append(Event(PRESS, self._candidate, now, 0.0))
+            if self.repeat:
+                self._next_repeat = now + self.repeat
+            if self.double_tap is not None:
+                if self._first_tap is not None and now - self._first_tap[0] < self.double_tap:
+                    events.append(Event(DOUBLE_TAP, self._candidate, now, 0.0))
+                    self._first_tap = None
+                else:
+                    self._first_tap = (now, self._candidate)
+        elif self._pressed and self.repeat and now >= self._next_repeat:
+            events.append(Event(REPEAT, self._candidate, now, now - self._pressed_at))
+            self._next_repeat += self.repeat
+        return events
+
+    def next_deadline(self):
+        """Earliest time poll() could return something, or None if only a new sample can."""
+        deadlines = []
+        if self._candidate is not _NOTHING and self._candidate != self.idle and not self._pressed:
+            deadlines.append(self._since + self.hold)
+        if self._pressed and self.repeat:
+            deadlines.append(self._next_repeat)
+        if self._first_tap is not None:
+            deadlines.append(self._first_tap[0] + self.double_tap)
+        return min(deadlines) if deadlines else None
+
+    @property
+    def held(self):
+        """The value currently pressed, or None."""
+        return self._candidate if self._pressed else None
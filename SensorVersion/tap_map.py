@@ -0,0 +1,46 @@
+# ══════════════════════════════════════════════════════════════
+#  tap_map.py  –  links touch taps and IR entries to actions
+#  The SensorVersion counterpart of CV's gesture_map.py: main.py
+#  hands every event kind listed here to actions.py.
+#  To add a new feature: write a function for it and add a line here.
+#
+#  The output modules are placeholders until an action first runs
+#  (on an action worker), so loading this map costs nothing at boot.
+# ══════════════════════════════════════════════════════════════
+
+import boot
+from actions import action
+from gpio_events import IR_ENTER
+from state_machine import TAP, DOUBLE_TAP
+from config import IR_TOGGLE_GAP, PHOTO_COOLDOWN
+
+led               = boot.lazy("led")
+oled              = boot.lazy("oled")
+camera_workaround = boot.lazy("camera_workaround")
+
+_flashlight_on = False
+
+
+def toggle_flashlight():
+    global _flashlight_on
+    _flashlight_on = not _flashlight_on
+    if _flashlight_on:
+        led.on()
+    else:
+        led.off()
+
+
+def next_screen():
+    oled.switch_state()  # only posts to the OLED worker
+
+
+def take_photo():
+    camera_workaround.capture_burst()  # BURST_COUNT shots, one open camera
+
+
+# ── Map event kind → action ──────────────────────────────────
+TAP_MAP = {
+    IR_ENTER:   action(toggle_flashlight, name="led", cooldown=IR_TOGGLE_GAP),
+    TAP:        action(next_screen, name="oled"),
+    DOUBLE_TAP: action(take_photo, name="photo", cooldown=PHOTO_COOLDOWN),
+}
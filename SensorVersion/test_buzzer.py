@@ -0,0 +1,103 @@
+# ══════════════════════════════════════════════════════════════
+#  test_buzzer.py  –  tests for buzzer.py's sequencer
+#  A stepped VirtualClock holds each sound until the test advances
+#  time, so what plays when is fully under the test's control.
+# ══════════════════════════════════════════════════════════════
+
+import time
+
+import pytest
+
+import buzzer
+import clock
+from hal import GPIO
+from config import BUZZER_PIN, BUZZER_QUEUE
+
+
+@pytest.fixture(autouse=True)
+def silence(vclock):
+    buzzer.stop()
+    yield
+    buzzer.stop()
+
+
+def _until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "buzzer thread did not get there"
+        time.sleep(0.001)
+
+
+def _playing():
+    sound = buzzer._playing
+    return sound and sound.name
+
+
+def _delta(before):
+    after = buzzer.stats()
+    return {key: after.get(key, 0) - before.get(key, 0) for key in ("played", "cut", "dropped")}
+
+
+def test_note_names():
+    assert buzzer.note("A4") == 440.0
+    assert buzzer.note("A5") == 880.0
+    assert buzzer.note("C5") == 523.3
+    assert buzzer.note("C#5") == buzzer.note("Db5")
+    assert buzzer.note("R") == 0
+
+
+def test_highest_priority_plays_first(vclock):
+    buzzer.play([(None, 1.0)], buzzer.ALERT, "hold")
+    _until(lambda: _playing() == "hold")
+    buzzer.play([(None, 0.1)], buzzer.LOW, "low")
+    buzzer.play([(None, 0.1)], buzzer.NORMAL, "first")
+    buzzer.play([(None, 0.1)], buzzer.NORMAL, "second")
+    order = []
+    while len(order) < 3:
+        vclock.advance(0.1 if order else 1.0)
+        _until(lambda: _playing() not in (None, "hold", *order))
+        order.append(_playing())
+    assert order == ["first", "second", "low"]
+
+
+def test_full_queue_drops_lowest(vclock):
+    buzzer.play([(None, 1.0)], buzzer.ALERT, "hold")
+    _until(lambda: _playing() == "hold")
+    before = buzzer.stats()
+    for _ in range(BUZZER_QUEUE):
+        assert buzzer.play([(None, 0.1)], buzzer.LOW, "low")
+    assert not buzzer.play([(None, 0.1)], buzzer.LOW, "one too many")
+    assert buzzer.play([(None, 0.1)], buzzer.NORMAL, "outranks")  # drops a waiting LOW instead
+    assert buzzer.stats()["queued"] == BUZZER_QUEUE
+    assert _delta(before)["dropped"] == 2
+
+
+def test_higher_priority_cuts_in(vclock):
+    buzzer.melody("startup", priority=buzzer.LOW)
+    _until(lambda: _playing() == "startup")
+    before = buzzer.stats()
+    buzzer.beep(0.2, priority=buzzer.ALERT)
+    _until(lambda: _playing() == "beep")
+    vclock.advance(0.2)
+    _until(lambda: _playing() is None)
+    assert _delta(before) == {"played": 1, "cut": 1, "dropped": 0}
+
+
+def test_notes_end_on_their_deadlines(vclock):
+    start = clock.monotonic()
+    GPIO.history.clear()
+    buzzer.play([(440.0, 0.5), (0, 0.25), (880.0, 0.25)], name="tune")
+    _until(lambda: _playing() == "tune")
+    for step, tone in ((0.5, 0), (0.25, 880.0)):
+        vclock.advance(step)
+        _until(lambda: buzzer._tone == tone)
+    vclock.advance(0.25)
+    _until(lambda: _playing() is None)
+    tones = []  # (time, what the pin plays) each time that changes
+    for t, pin, value in GPIO.history:
+        if pin != BUZZER_PIN:
+            continue
+        freq = value[1] if isinstance(value, tuple) and value[2] else 0
+        if not tones or tones[-1][1] != freq:
+            tones.append((round(t - start, 3), freq))
+    assert tones == [(0.0, 440.0), (0.5, 0), (0.75, 880.0), (1.0, 0)]
@@ -0,0 +1,53 @@
+# ══════════════════════════════════════════════════════════════
+#  test_camera_server.py  –  tests for camera_server.py's bursts
+#  Runs the request handlers in-process on the sim camera.
+# ══════════════════════════════════════════════════════════════
+
+import json
+import time
+
+import pytest
+
+import camera
+import camera_server
+from camera import Camera
+from config import BURST_MAX
+from photo_store import PhotoStore
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    monkeypatch.setattr(camera, "_SETTINGS_PATH", str(tmp_path / "camera_settings.json"))
+    monkeypatch.setattr(camera_server, "_cam", Camera())
+    monkeypatch.setattr(camera_server, "_store", PhotoStore(directory=str(tmp_path)))
+    yield camera_server
+    camera_server._store.close()
+    camera_server._cam.stop()
+
+
+def test_burst_is_capped(server):
+    paths = json.loads(server._burst({"count": BURST_MAX + 5, "interval": 0}))
+    assert len(paths) == BURST_MAX
+
+
+@pytest.mark.parametrize("count", [0, -3])
+def test_burst_rejects_nothing_to_take(server, count):
+    with pytest.raises(ValueError):
+        server._burst({"count": count})
+
+
+def test_burst_waits_for_the_encoder(server, monkeypatch):
+    encode, grab, waiting = server.save_jpeg, server._grab, []
+
+    def slow_encode(frame, f):
+        time.sleep(0.02)
+        encode(frame, f)
+
+    def counting_grab():
+        waiting.append(server._encoding)
+        return grab()
+
+    monkeypatch.setattr(server, "save_jpeg", slow_encode)
+    monkeypatch.setattr(server, "_grab", counting_grab)
+    server._burst({"count": BURST_MAX, "interval": 0})
+    assert max(waiting) < server._MAX_ENCODING
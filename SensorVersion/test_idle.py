@@ -0,0 +1,56 @@
+# ══════════════════════════════════════════════════════════════
+#  test_idle.py  –  tests for idle.py on a stepped virtual clock
+# ══════════════════════════════════════════════════════════════
+
+from idle import IdleGovernor, ACTIVE, IDLE, SLEEP
+
+
+def _governor():
+    governor = IdleGovernor(idle_after=10.0, sleep_after=60.0, ticks={ACTIVE: 1, IDLE: 2, SLEEP: 3})
+    changes = []
+    governor.subscribe(lambda old, new: changes.append((old, new)))
+    return governor, changes
+
+
+def test_steps_down_then_wakes(vclock):
+    governor, changes = _governor()
+    vclock.advance(9.9)
+    assert governor.update() == ACTIVE
+    vclock.advance(0.1)
+    assert governor.update() == IDLE
+    assert governor.tick() == 2
+    vclock.advance(50.0)
+    assert governor.update() == SLEEP
+    governor.activity()
+    assert governor.state == ACTIVE
+    assert changes == [(ACTIVE, IDLE), (IDLE, SLEEP), (SLEEP, ACTIVE)]
+
+
+def test_long_gap_steps_through_every_state(vclock):
+    governor, changes = _governor()
+    vclock.advance(100.0)
+    assert governor.update() == SLEEP
+    assert changes == [(ACTIVE, IDLE), (IDLE, SLEEP)]
+
+
+def test_activity_restarts_the_countdown(vclock):
+    governor, _ = _governor()
+    vclock.advance(8.0)
+    governor.activity()
+    assert governor.next_change() == 10.0
+    vclock.advance(8.0)
+    assert governor.update() == ACTIVE
+    assert governor.next_change() == 2.0
+
+
+def test_stats_and_failing_listener(vclock):
+    governor, _ = _governor()
+    governor.subscribe(lambda old, new: 1 / 0)  # logged, doesn't stop the others
+    vclock.advance(15.0)
+    governor.update()
+    vclock.advance(5.0)
+    governor.activity()
+    assert governor.stats() == {
+        "seconds": {ACTIVE: 15.0, IDLE: 5.0, SLEEP: 0.0},
+        "entered": {IDLE: 1, ACTIVE: 1},
+    }
@@ -0,0 +1,60 @@
+# ══════════════════════════════════════════════════════════════
+#  test_oled_display.py  –  tests for oled_display.py on the sim panel
+# ══════════════════════════════════════════════════════════════
+
+import random
+
+import pytest
+
+import hal
+from oled_display import DiffDisplay
+
+
+def _panel(width=128, height=64):
+    return DiffDisplay(hal.adafruit_ssd1306.SSD1306_I2C(width, height, None))
+
+
+def test_first_show_is_a_full_refresh():
+    display = _panel()
+    display.fill(1)
+    display.show()
+    assert display.bytes_sent == len(display.buf)
+    assert display.screen() == bytes(display.buf)
+
+
+def test_unchanged_frame_sends_nothing():
+    display = _panel()
+    display.show()
+    display.show()
+    assert display.stats()["skipped"] == 1
+    assert display.bytes_sent == len(display.buf)
+
+
+def test_one_pixel_sends_one_byte():
+    display = _panel()
+    display.show()
+    display.pixel(70, 20, 1)
+    display.show()
+    assert display.bytes_sent == len(display.buf) + 1
+    assert display.screen() == bytes(display.buf)
+
+
+def test_invalidate_forces_full_refresh():
+    display = _panel()
+    display.show()
+    display.invalidate()
+    display.show()
+    assert display.bytes_sent == 2 * len(display.buf)
+
+
+@pytest.mark.parametrize("size", [(128, 64), (128, 32), (64, 48)])
+def test_panel_matches_buffer_after_random_edits(size):
+    display = _panel(*size)
+    rng = random.Random(size[0] * size[1])
+    display.show()
+    for _ in range(200):
+        for _ in range(rng.randrange(1, 40)):
+            display.pixel(rng.randrange(display.width), rng.randrange(display.height), rng.random() < 0.5)
+        display.show()
+        assert display.screen() == bytes(display.buf)
+    assert display.bytes_sent < 200 * len(display.buf)
@@ -0,0 +1,81 @@
+# ══════════════════════════════════════════════════════════════
+#  test_photo_store.py  –  tests for photo_store.py
+# ══════════════════════════════════════════════════════════════
+
+import os
+
+import pytest
+from PIL import Image
+
+from photo_store import PhotoStore
+
+
+def _jpeg(size=(64, 48)):
+    return lambda f: Image.new("RGB", size, (200, 120, 40)).save(f, format="JPEG")
+
+
+@pytest.fixture
+def make_store(tmp_path):
+    stores = []
+
+    def make(**limits):
+        store = PhotoStore(directory=str(tmp_path), **limits)
+        stores.append(store)
+        return store
+
+    yield make
+    for store in stores:
+        store.close()
+
+
+def _names(store):
+    return [p["name"] for p in store.photos()]
+
+
+def test_oldest_evicted_beyond_count(make_store):
+    store = make_store(max_count=2)
+    for i in range(4):
+        store.save(f"{i}.jpg", _jpeg())
+    assert _names(store) == ["2.jpg", "3.jpg"]
+    assert sorted(n for n in os.listdir(store.directory) if n.endswith(".jpg")) == ["2.jpg", "3.jpg"]
+    assert store.stats()["evicted"] == 2
+
+
+@pytest.mark.parametrize("limits", [{"max_count": 0}, {"max_bytes": 10}])
+def test_newest_photo_is_kept(make_store, limits):
+    store = make_store(**limits)
+    store.save("a.jpg", _jpeg())
+    path = store.save("b.jpg", _jpeg())
+    assert _names(store) == ["b.jpg"]
+    assert os.path.exists(path)
+
+
+def test_no_thumbnail_for_photo_evicted_while_drawing(make_store, monkeypatch):
+    store = make_store()
+    store.close()  # we drive _thumbnail() ourselves
+    store.save("a.jpg", _jpeg())
+    original = Image.Image.save
+
+    def save_then_evict(im, *args, **kwargs):
+        original(im, *args, **kwargs)
+        with store._lock:
+            store._index.pop("a.jpg")
+
+    monkeypatch.setattr(Image.Image, "save", save_then_evict)
+    store._thumbnail("a.jpg")
+    assert os.listdir(store.thumbs) == []
+
+
+def test_load_tidies_up(make_store, tmp_path):
+    store = make_store()
+    store.save("a.jpg", _jpeg())
+    store._thumbnail("a.jpg")
+    store.close()
+    (tmp_path / ".tmp-1-b.jpg").write_bytes(b"half a photo")
+    (tmp_path / "empty.jpg").write_bytes(b"")
+    (tmp_path / "thumbs" / ".tmp-c.jpg").write_bytes(b"half a thumbnail")
+    (tmp_path / "thumbs" / "gone.jpg").write_bytes(b"thumbnail of a deleted photo")
+    store = make_store()
+    assert _names(store) == ["a.jpg"]
+    assert sorted(os.listdir(tmp_path)) == ["a.jpg", "thumbs"]
+    assert os.listdir(store.thumbs) == ["a.jpg"]
@@ -0,0 +1,55 @@
+# ══════════════════════════════════════════════════════════════
+#  test_state_machine.py  –  tests for state_machine.py
+# ══════════════════════════════════════════════════════════════
+
+from state_machine import StateMachine, PRESS, REPEAT, RELEASE, TAP, DOUBLE_TAP
+
+
+def _feed(machine, samples, start=0.0, step=0.1):
+    """Feed samples step seconds apart; returns [(kind, value, time)] of every event."""
+    events = []
+    for i, value in enumerate(samples):
+        events += machine.update(value, start + i * step)
+    return [(e.kind, e.value, round(e.time, 3)) for e in events]
+
+
+def test_press_after_hold_then_release():
+    machine = StateMachine(hold=0.3, idle=False)
+    events = _feed(machine, [True] * 5 + [False])
+    assert events == [(PRESS, True, 0.3), (RELEASE, True, 0.5)]
+
+
+def test_idle_value_never_presses():
+    machine = StateMachine(hold=0.0, idle=None)
+    assert _feed(machine, [None] * 5) == []
+
+
+def test_repeat_while_held():
+    machine = StateMachine(hold=0.0, repeat=0.25)
+    kinds = [kind for kind, _, _ in _feed(machine, [3] * 8)]
+    assert kinds == [PRESS, REPEAT, REPEAT]
+
+
+def test_hysteresis_rides_out_a_dropped_sample():
+    machine = StateMachine(hold=0.0, window=0.4, on_ratio=0.75, off_ratio=0.4)
+    events = _feed(machine, [2, 2, 2, 2, None, 2, 2])
+    assert events == [(PRESS, 2, 0.0)]
+    assert machine.held == 2
+
+
+def test_single_and_double_tap():
+    machine = StateMachine(double_tap=0.5, idle=False)
+    single = _feed(machine, [True, False, False, False, False, False, False])
+    assert (TAP, True, 0.5) in single
+    machine.reset()
+    double = _feed(machine, [True, False, True, False, False, False, False, False])
+    assert [kind for kind, _, _ in double if kind in (TAP, DOUBLE_TAP)] == [DOUBLE_TAP]
+
+
+def test_poll_and_next_deadline():
+    machine = StateMachine(hold=0.5, idle=False)
+    assert machine.update(True, 0.0) == []
+    assert machine.next_deadline() == 0.5
+    assert machine.poll(0.4) == []
+    assert [e.kind for e in machine.poll(0.5)] == [PRESS]
+    assert machine.next_deadline() is None
@@ -4,15 +4,16 @@
 # ══════════════════════════════════════════════════════════════
 
 import gpio_manager  # ensures GPIO.setmode is called first
-import RPi.GPIO as GPIO
-import time
-from config import TOUCH_PIN, DOUBLE_TAP_WINDOW
+from hal import GPIO
+import clock
+import gpio_events
+from state_machine import StateMachine, TAP, DOUBLE_TAP
+from config import TOUCH_PIN, DOUBLE_TAP_WINDOW, TOUCH_DEBOUNCE
 
 GPIO.setup(TOUCH_PIN, GPIO.IN)
 
-_last_tap_time   = 0.0
-_was_touched     = False
-_pending_single  = False  # True when we have one tap and are waiting for a possible second
+# Touch pad as True/False samples; a press is a tap, two within the window a double
+_taps = StateMachine(double_tap=DOUBLE_TAP_WINDOW, idle=False)
 
 def is_touched():
     """
@@ -22,57 +23,58 @@ def is_touched():
     """
     return GPIO.input(TOUCH_PIN) == GPIO.HIGH
 
-def check(on_single_tap, on_double_tap):
+def start_events():
+    """Emit TOUCH_DOWN / TOUCH_UP on the gpio_events queue instead of polling."""
+    gpio_events.watch(TOUCH_PIN, gpio_events.TOUCH_DOWN, gpio_events.TOUCH_UP,
+                      active_level=GPIO.HIGH, debounce=TOUCH_DEBOUNCE)
+
+def next_deadline():
+    """clock.monotonic() at which a pending single tap will fire, or None."""
+    return _taps.next_deadline()
+
+def check(on_single_tap, on_double_tap, event=None):
     """
-    Call this in a loop. Detects single and double taps cleanly.
+    Feed this every event from gpio_events.get(), and call it with
+    event=None when the wait times out (see next_deadline()).
+    Detects single and double taps cleanly.
 
-    Logic:
-    - On the first tap (rising edge), record the time and mark a pending single tap.
-    - If a second tap (rising edge) arrives within DOUBLE_TAP_WINDOW, fire double tap
+    Logic (see state_machine.py):
+    - On the first tap (TOUCH_DOWN), record the time and mark a pending single tap.
+    - If a second tap arrives within DOUBLE_TAP_WINDOW, fire double tap
       and clear the pending single.
     - If DOUBLE_TAP_WINDOW expires with no second tap, fire single tap.
 
     This means single tap always waits DOUBLE_TAP_WINDOW before firing,
     but double tap fires immediately on the second touch.
     """
-    global _last_tap_time, _was_touched, _pending_single
-
-    now           = time.time()
-    currently     = is_touched()
-    rising_edge   = currently and not _was_touched
+    if event is None:
+        events = _taps.poll()
+    else:
+        # timestamp = when the finger landed, not when we got round to it
+        events = _taps.update(event.kind == gpio_events.TOUCH_DOWN, event.timestamp)
 
-    if rising_edge:
-        if _pending_single and (now - _last_tap_time) < DOUBLE_TAP_WINDOW:
-            # Second tap within window → double tap
+    for tap in events:
+        if tap.kind == DOUBLE_TAP:
             print("[TOUCH] Double tap!")
             if (on_double_tap is not None):
                 on_double_tap()
-            _pending_single = False
-            _last_tap_time  = 0.0
-        else:
-            # First tap – start the window
-            _last_tap_time  = now
-            _pending_single = True
-
-    # If a single tap is pending and the window has expired with no second tap
-    if _pending_single and (now - _last_tap_time) > DOUBLE_TAP_WINDOW:
-        print("[TOUCH] Single tap!")
-        on_single_tap()
-        _pending_single = False
-        _last_tap_time  = 0.0
-
-    _was_touched = currently
+        elif tap.kind == TAP:
+            print("[TOUCH] Single tap!")
+            on_single_tap()
 
 # ── Standalone test ───────────────────────────────────────────
 if __name__ == "__main__":
     print("Touch sensor test – tap for single, double tap for double. Ctrl+C to stop.")
+    start_events()
     try:
         while True:
+            deadline = next_deadline()
+            timeout  = None if deadline is None else max(0.0, deadline - clock.monotonic())
             check(
                 on_single_tap = lambda: print("→ Single tap fired"),
                 on_double_tap = lambda: print("→ Double tap fired"),
+                event         = gpio_events.get(clock.real(timeout)),
             )
-            time.sleep(0.01)
     except KeyboardInterrupt:
         print("\nDone.")
         gpio_manager.cleanup()